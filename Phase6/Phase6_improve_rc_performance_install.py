@@ -97,19 +97,49 @@ files["core/generator.py"] = r'''
 import sys
 import re
 import random
-from collections import defaultdict
+import itertools
+import numpy as np
 from .tech_lef import TechLEF
+from .geom_store import GeometryStore, ViaArray, ViaPoints, ViaArrayView
+from .intervals import IntervalTree, clip_tracks, sweep_cross_points
+from .geom_index import GeometryIndex
+from .instance_store import InstanceStore
+from .net_cache import geometry_key, placement_key
+from .artifact import save_artifact
+from .parallel import parallel_net_geometry
 
 class Generator: 
-    def __init__(self, tech_lef: TechLEF): 
+    def __init__(self, tech_lef: TechLEF, backend="dict", cache=None, artifact_dir=None, jobs=1): 
         self.tech = tech_lef
+        self.backend = backend
+        # [Parallel] worker processes for per-net stripe / via generation
+        self.jobs = max(1, int(jobs or 1))
+        # [Artifact] if set, run() persists its result there (see core/artifact.py)
+        self.artifact_dir = artifact_dir
+        # [Incremental] optional NetCache; net_keys[net] = {'geom': key}
+        self.cache = cache
+        self.net_keys = {} 
+        self.placement_key = None
         self.die_area = {} 
-        self.wires = [] 
-        self.vias = [] 
-        self.pins = [] 
+        # [Columnar Backend] wires/pins become read-only views over self.store
+        self.store = GeometryStore() if backend == "columnar" else None
+        if self.store is not None:
+            self.wires = self.store.wire_view()
+            self.pins = self.store.pin_view()
+        else:
+            self.wires = [] 
+            self.pins = [] 
+        # [Optimization] Vias are grid descriptors; self.vias is a lazy flat view
+        self.via_arrays = [] 
+        self.vias = ViaArrayView(self.via_arrays)
+        # [Optimization] (net, layer, orient) index shared by extractor / writers
+        self.index = GeometryIndex()
         self.instances = [] 
+        self.inst_store = None  # [Bulk Placement] set by the columnar backend
         self.net_conn_map = {} 
         self.net_type_map = {} 
+        # [3D] (name, net, layer, x, y) TSV landing ports added by StackManager
+        self.tsv_ports = [] 
         self.layers_used = set() 
         self.vias_used = set() 
         self.nets_used = set() 
@@ -118,14 +148,51 @@ class Generator:
     def _to_dbu(self, val_microns): 
         return int(round(val_microns * self.tech.units)) 
 
+    def wires_for(self, net=None, layer=None, orient=None, lo=None, hi=None):
+        # Index lookup -> wire records of one slice, O(result)
+        ids = self.index.wire_ids(net, layer, orient, lo, hi)
+        if self.store is not None: return self.wires.take(ids)
+        wires = self.wires
+        return [wires[i] for i in ids.tolist()]
+
+    def wire_arrays(self, net=None, layer=None, orient=None, ids=None):
+        # Index lookup (or explicit wire ids) -> (rects (n, 4), centers, is_horiz) as int64 / bool arrays
+        if ids is None: ids = self.index.wire_ids(net, layer, orient)
+        if self.store is not None: 
+            d = self.store.wires.data[ids]
+            rects = np.stack([d['x1'], d['y1'], d['x2'], d['y2']], axis=1).astype(np.int64)
+            return rects, d['center'].astype(np.int64), d['orient'] == 0
+        wires = [self.wires[i] for i in ids.tolist()]
+        rects = np.array([w['rect'] for w in wires], dtype=np.int64).reshape(-1, 4)
+        centers = np.array([w['center'] for w in wires], dtype=np.int64)
+        return rects, centers, np.array([w['orient'] == 'H' for w in wires], dtype=bool)
+
+    def net_connections(self, net):
+        conns = self.net_conn_map.get(net, [])
+        if self.inst_store is None: return iter(conns)
+        return itertools.chain(conns, self.inst_store.iter_connections(net))
+
+    def iter_placements(self):
+        # -> (name, master, x, y) per instance
+        if self.inst_store is not None:
+            yield from self.inst_store.iter_placements()
+            return
+        for inst in self.instances:
+            yield inst['name'], inst['master'], int(inst['pos'][0]), int(inst['pos'][1])
+
     def run(self, config_data): 
-        self.wires.clear(); self.vias.clear(); self.pins.clear(); self.instances.clear() 
+        if self.store is not None: self.store.clear()
+        else: self.wires.clear(); self.pins.clear()
+        self.via_arrays.clear(); self.index.clear()
+        self.instances = []; self.inst_store = None
         self.layers_used.clear(); self.nets_used.clear(); self.vias_used.clear() 
         self.net_conn_map.clear(); self.net_type_map.clear() 
+        self.tsv_ports = []
         
         self.tech_params = config_data.get('tech_properties', {}) 
         self.die_area = config_data.get('die_area', {}) 
         if not self.die_area: return
+        self._compute_net_keys(config_data)
 
         self._analyze_net_types(config_data) 
         self._generate_stripes_and_vias(config_data.get('nets', [])) 
@@ -133,6 +200,18 @@ class Generator:
         self._generate_pins_area(config_data.get('nets', [])) 
         
         print(f"[SUCCESS] Core Gen: {len(self.wires)} Wires, {len(self.vias)} Vias, {len(self.instances)} Insts") 
+        if self.artifact_dir: 
+            save_artifact(self, self.artifact_dir) 
+
+    def _compute_net_keys(self, config_data):
+        self.net_keys = {}; self.placement_key = None
+        if self.cache is None: return
+        layer_order = self._sorted_layers()
+        for net_cfg in config_data.get('nets', []):
+            self.net_keys[net_cfg['name']] = {
+                'geom': geometry_key(net_cfg, self.die_area, layer_order, self.tech.units)
+            }
+        self.placement_key = placement_key(config_data, self.tech.units)
 
     def _analyze_net_types(self, config_data): 
         inst_cfg = config_data.get('instance_placement', {}) 
@@ -146,97 +225,206 @@ class Generator:
             else: self.net_type_map[n] = "POWER" 
 
     def _generate_stripes_and_vias(self, nets_cfg): 
-        die_llx = self._to_dbu(self.die_area['llx']) 
-        die_lly = self._to_dbu(self.die_area['lly']) 
-        die_urx = self._to_dbu(self.die_area['urx']) 
-        die_ury = self._to_dbu(self.die_area['ury']) 
-        
-        # [Optimization] Spatial Index: layer -> net -> orient('H'/'V') -> set(coords)
-        spatial_index = defaultdict(lambda: defaultdict(lambda: {'H': set(), 'V': set()}))
+        sorted_layers = self._sorted_layers()
 
-        # Generate Wires
+        # Nets are generated independently: stripes first, then the vias that
+        # only ever connect a net to itself.
+        # [Incremental] reuse a net's geometry if its inputs are unchanged
+        geoms = []
         for net in nets_cfg: 
+            key = self.net_keys.get(net['name'], {}).get('geom')
+            geoms.append(self.cache.load('geom', key) if key else None)
+
+        # [Parallel] fan the remaining nets out per (net, layer) / (net, layer pair)
+        todo = [i for i, geom in enumerate(geoms) if geom is None]
+        if self.jobs > 1 and todo: 
+            results = parallel_net_geometry(self, [nets_cfg[i] for i in todo], sorted_layers, self.jobs)
+            for i, geom in zip(todo, results): 
+                geoms[i] = geom
+                key = self.net_keys.get(nets_cfg[i]['name'], {}).get('geom')
+                if key: self.cache.save('geom', key, geom)
+
+        for net, geom in zip(nets_cfg, geoms): 
             net_name = net['name'] 
             self.nets_used.add(net_name) 
             if net_name not in self.net_conn_map: self.net_conn_map[net_name] = [] 
-            
             for layer_rule in net['layers']: 
-                l_name = layer_rule['name'] 
-                self.layers_used.add(l_name) 
+                self.layers_used.add(layer_rule['name']) 
+
+            if geom is None: 
+                stripes = self._net_stripes(net)
+                geom = (stripes, self._net_vias(net_name, stripes, sorted_layers))
+                key = self.net_keys.get(net_name, {}).get('geom')
+                if key: self.cache.save('geom', key, geom)
+            stripes, net_vias = geom
+
+            for l_name, orient, centers, lo, hi, width, _ in stripes:
+                self._emit_stripes(net_name, l_name, orient, centers, lo, hi, width)
+            for va in net_vias:
+                self.via_arrays.append(va)
+                self.index.add_via_array(va)
+                self.vias_used.add(va.name)
+
+    @staticmethod
+    def _layer_sort_key(lname): 
+        match = re.search(r'(\d+)', lname) 
+        return int(match.group(1)) if match else 999
+
+    def _sorted_layers(self):
+        if 'layers' in self.tech_params: 
+            return sorted(list(self.tech_params['layers'].keys()), key=self._layer_sort_key) 
+        return sorted(list(self.tech.layers.keys()), key=self._layer_sort_key) 
+
+    def _net_stripes(self, net):
+        # -> [(layer, orient, centers, lo, hi, width, full_die)]; lo/hi bound each
+        #    stripe along its axis (scalars for full-die rules)
+        stripes = []
+        for layer_rule in net['layers']: 
+            stripes.extend(self._rule_stripes(layer_rule))
+        return stripes
+
+    def _rule_stripes(self, layer_rule):
+        die_llx = self._to_dbu(self.die_area['llx']) 
+        die_lly = self._to_dbu(self.die_area['lly']) 
+        die_urx = self._to_dbu(self.die_area['urx']) 
+        die_ury = self._to_dbu(self.die_area['ury']) 
 
-                dir_setting = layer_rule.get('direction') 
-                is_horiz = True
-                if dir_setting: 
-                    if dir_setting.upper().startswith('V'): is_horiz = False
-                
-                offset = self._to_dbu(layer_rule.get('offset', 0)) 
-                pitch = self._to_dbu(layer_rule.get('pitch', 1.0)) 
-                width = self._to_dbu(layer_rule.get('width', 0.1)) 
-                half_w = width // 2
-                
-                if is_horiz: 
-                    curr_y = die_lly + offset
-                    while curr_y < die_ury: 
-                        rect = (die_llx, curr_y - half_w, die_urx, curr_y + half_w) 
-                        self.wires.append({ 
-                            'rect': rect, 'layer': l_name, 'net': net_name, 
-                            'orient': 'H', 'center': curr_y, 'width': width
-                        }) 
-                        spatial_index[l_name][net_name]['H'].add(curr_y)
-                        curr_y += pitch
-                else: 
-                    curr_x = die_llx + offset
-                    while curr_x < die_urx: 
-                        rect = (curr_x - half_w, die_lly, curr_x + half_w, die_ury) 
-                        self.wires.append({ 
-                            'rect': rect, 'layer': l_name, 'net': net_name, 
-                            'orient': 'V', 'center': curr_x, 'width': width
-                        }) 
-                        spatial_index[l_name][net_name]['V'].add(curr_x)
-                        curr_x += pitch
-
-        # Generate Vias (Optimized)
-        def sort_key(lname): 
-            match = re.search(r'(\d+)', lname) 
-            return int(match.group(1)) if match else 999
+        l_name = layer_rule['name'] 
+
+        dir_setting = layer_rule.get('direction') 
+        is_horiz = True
+        if dir_setting: 
+            if dir_setting.upper().startswith('V'): is_horiz = False
         
-        if 'layers' in self.tech_params: 
-            sorted_layers = sorted(list(self.tech_params['layers'].keys()), key=sort_key) 
-        else: 
-            sorted_layers = sorted(list(self.tech.layers.keys()), key=sort_key) 
+        offset = self._to_dbu(layer_rule.get('offset', 0)) 
+        pitch = self._to_dbu(layer_rule.get('pitch', 1.0)) 
+        width = self._to_dbu(layer_rule.get('width', 0.1)) 
         
-        for i in range(len(sorted_layers)-1): 
-            bot, top = sorted_layers[i], sorted_layers[i+1] 
-            if bot not in spatial_index or top not in spatial_index: continue
-            
-            b_idx = sort_key(bot) 
-            t_idx = sort_key(top) 
-            via_name = f"VIA{b_idx}{t_idx}" 
-
-            common_nets = set(spatial_index[bot].keys()) & set(spatial_index[top].keys()) 
-            
-            for net in common_nets: 
-                bot_sets = spatial_index[bot][net]
-                top_sets = spatial_index[top][net]
-                
-                if bot_sets['H'] and top_sets['V']:
-                    for y in bot_sets['H']:
-                        for x in top_sets['V']:
-                            self.vias.append({'pos': (x, y), 'name': via_name, 'net': net, 'bot_layer': bot}) 
-                            self.vias_used.add(via_name)
-                            
-                if bot_sets['V'] and top_sets['H']:
-                    for x in bot_sets['V']:
-                        for y in top_sets['H']:
-                            self.vias.append({'pos': (x, y), 'name': via_name, 'net': net, 'bot_layer': bot}) 
-                            self.vias_used.add(via_name)
+        if layer_rule.get('regions') or layer_rule.get('blockages'): 
+            return self._region_stripes(l_name, is_horiz, layer_rule) 
+        
+        # [Vectorized] All tracks of one rule come from a single arange
+        if is_horiz: 
+            centers = np.arange(die_lly + offset, die_ury, pitch, dtype=np.int64)
+            return [(l_name, 'H', centers, die_llx, die_urx, width, True)]
+        centers = np.arange(die_llx + offset, die_urx, pitch, dtype=np.int64)
+        return [(l_name, 'V', centers, die_lly, die_ury, width, True)]
+
+    @staticmethod
+    def _net_tracks(stripes):
+        # [Optimization] Track index of one net: layer -> orient -> [(centers, lo, hi, full_die)]
+        tracks = {}
+        for l_name, orient, centers, lo, hi, _, full in stripes:
+            tracks.setdefault(l_name, {'H': [], 'V': []})[orient].append((centers, lo, hi, full))
+        return tracks
+
+    @staticmethod
+    def _layer_pairs(tracks, sorted_layers):
+        # Adjacent (bottom, top) layers that both carry stripes of the net
+        return [(bot, top) for bot, top in zip(sorted_layers, sorted_layers[1:])
+                if bot in tracks and top in tracks]
+
+    def _net_vias(self, net_name, stripes, sorted_layers):
+        tracks = self._net_tracks(stripes)
+        net_vias = []
+        for bot, top in self._layer_pairs(tracks, sorted_layers): 
+            net_vias.extend(self._pair_vias(net_name, bot, top, tracks[bot], tracks[top]))
+        return net_vias
+
+    @classmethod
+    def _pair_vias(cls, net_name, bot, top, bot_sets, top_sets):
+        b_idx = cls._layer_sort_key(bot) 
+        t_idx = cls._layer_sort_key(top) 
+        via_name = f"VIA{b_idx}{t_idx}" 
+
+        pair_vias = []
+        for h_tracks, v_tracks in ((bot_sets['H'], top_sets['V']), (top_sets['H'], bot_sets['V'])):
+            if not h_tracks or not v_tracks: continue
+            if all(t[3] for t in h_tracks) and all(t[3] for t in v_tracks): 
+                # Full-die stripes on both sides: the crossings are a grid
+                ys = np.unique(np.concatenate([t[0] for t in h_tracks]))
+                xs = np.unique(np.concatenate([t[0] for t in v_tracks]))
+                if len(xs) and len(ys): 
+                    pair_vias.append(ViaArray(net_name, via_name, bot, xs, ys))
+            else: 
+                # Region-clipped stripes: sweep the actual stripe intervals
+                hy, hlo, hhi = cls._track_segments(h_tracks)
+                vx, vlo, vhi = cls._track_segments(v_tracks)
+                xs, ys = sweep_cross_points(hy, hlo, hhi, vx, vlo, vhi)
+                if len(xs): 
+                    pair_vias.append(ViaPoints(net_name, via_name, bot, xs, ys))
+        return pair_vias
+
+    @staticmethod
+    def _track_segments(tracks):
+        centers = np.concatenate([t[0] for t in tracks])
+        lo = np.concatenate([np.broadcast_to(np.asarray(t[1], dtype=np.int64), t[0].shape) for t in tracks])
+        hi = np.concatenate([np.broadcast_to(np.asarray(t[2], dtype=np.int64), t[0].shape) for t in tracks])
+        return centers, lo, hi
+
+    def _rect_dbu(self, rect):
+        # {"llx", "lly", "urx", "ury"} or [llx, lly, urx, ury] in microns -> DBU tuple
+        if isinstance(rect, dict): 
+            rect = (rect['llx'], rect['lly'], rect['urx'], rect['ury'])
+        return tuple(self._to_dbu(v) for v in rect)
+
+    def _region_stripes(self, l_name, is_horiz, layer_rule): 
+        # Stripes restricted to regions (power domains) with optional per-region
+        # pitch / offset / width, minus blockage rectangles. Tracks stay aligned
+        # to the die origin so neighbouring regions share the same grid.
+        die = self._rect_dbu(self.die_area)
+        orient = 'H' if is_horiz else 'V'
+        # H stripes: cross axis = y, along axis = x (swapped for V)
+        c_ax, a_ax = (1, 0) if is_horiz else (0, 1)
+
+        tree, cut_lo, cut_hi = None, None, None
+        blockages = layer_rule.get('blockages') or []
+        if blockages: 
+            rects = np.array([self._rect_dbu(b) for b in blockages], dtype=np.int64)
+            tree = IntervalTree(rects[:, c_ax], rects[:, c_ax + 2])
+            cut_lo, cut_hi = rects[:, a_ax], rects[:, a_ax + 2]
+
+        stripes = []
+        for region in (layer_rule.get('regions') or [self.die_area]): 
+            r = self._rect_dbu(region)
+            cross_lo, cross_hi = max(r[c_ax], die[c_ax]), min(r[c_ax + 2], die[c_ax + 2])
+            along_lo, along_hi = max(r[a_ax], die[a_ax]), min(r[a_ax + 2], die[a_ax + 2])
+            if cross_hi <= cross_lo or along_hi <= along_lo: continue
+
+            get = region.get if isinstance(region, dict) else {}.get
+            offset = self._to_dbu(get('offset', layer_rule.get('offset', 0)))
+            pitch = self._to_dbu(get('pitch', layer_rule.get('pitch', 1.0)))
+            width = self._to_dbu(get('width', layer_rule.get('width', 0.1)))
+
+            base = die[c_ax] + offset
+            first = base + (-(-(cross_lo - base) // pitch)) * pitch
+            centers = np.arange(first, cross_hi, pitch, dtype=np.int64)
+            seg_c, seg_lo, seg_hi = clip_tracks(centers, width // 2, along_lo, along_hi, tree, cut_lo, cut_hi)
+            if len(seg_c): 
+                stripes.append((l_name, orient, seg_c, seg_lo, seg_hi, width, False))
+        return stripes
+
+    def _emit_stripes(self, net_name, l_name, orient, centers, lo, hi, width):
+        self.index.add_wires(net_name, l_name, orient, centers, len(self.wires))
+        if self.store is not None:
+            self.store.add_stripes(net_name, l_name, orient, centers, lo, hi, width)
+            return
+        half_w = width // 2
+        los = np.broadcast_to(lo, centers.shape).tolist()
+        his = np.broadcast_to(hi, centers.shape).tolist()
+        for c, lo, hi in zip(centers.tolist(), los, his):
+            rect = (lo, c - half_w, hi, c + half_w) if orient == 'H' else (c - half_w, lo, c + half_w, hi)
+            self.wires.append({ 
+                'rect': rect, 'layer': l_name, 'net': net_name, 
+                'orient': orient, 'center': c, 'width': width
+            }) 
 
     def _generate_instances_snapped(self, inst_cfg): 
         if not inst_cfg: return
         rail_layer = inst_cfg.get('rail_layer', 'M1') 
         master_name = inst_cfg.get('master', 'std_cell') 
         
-        rails = [w for w in self.wires if w['layer'] == rail_layer and w['orient'] == 'H'] 
+        rails = self.wires_for(layer=rail_layer, orient='H') 
         if not rails: return
         rails.sort(key=lambda w: w['center']) 
         
@@ -246,6 +434,14 @@ class Generator:
         die_llx = self._to_dbu(self.die_area['llx']) 
         die_urx = self._to_dbu(self.die_area['urx']) 
         
+        if self.store is not None:
+            # [Bulk Placement] rows and x positions for all cells at once
+            self.inst_store = InstanceStore(rail_layer, inst_width, self.store.nets)
+            self.inst_store.place_rows(rails, master_name, inst_count, 
+                                       die_llx + 1000, die_urx - inst_width, inst_width + 2000)
+            self.instances = self.inst_store.view()
+            return
+        
         cnt = 0
         random.seed(42) 
         
@@ -307,7 +503,7 @@ class Generator:
             net_name = net_cfg['name'] 
             target_layer = pin_cfg.get('layer', 'M9') 
             interval = self._to_dbu(pin_cfg.get('interval', 50.0)) 
-            wires = [w for w in self.wires if w['net'] == net_name and w['layer'] == target_layer] 
+            wires = self.wires_for(net_name, target_layer) 
             
             for w in wires: 
                 r = w['rect'] 
@@ -332,68 +528,246 @@ class Generator:
         half_thick = (wire_rect['rect'][3] - wire_rect['rect'][1]) // 2 if is_horiz else (wire_rect['rect'][2] - wire_rect['rect'][0]) // 2
         pin_half_size = half_thick 
         rect = (cx - pin_half_size, cy - pin_half_size, cx + pin_half_size, cy + pin_half_size) 
+        if self.store is not None:
+            self.store.add_pins(net, layer, [cx], [cy], pin_half_size)
+            return
         p_name = f"{net}_PIN_{layer}_{cx}_{cy}" 
         self.pins.append({'name': p_name, 'net': net, 'layer': layer, 'pos': (cx, cy), 'orient': orient, 'rect': rect}) 
 '''
 
 files["core/extractor.py"] = r''' 
-import math
 import re
 import sys
 from collections import defaultdict, deque
+import numpy as np
+from .net_cache import rc_key, stable_hash
+from .node_table import NetRC, pack_xy, unpack_xy, sorted_unique
+from .pin_table import PinTable
+from .parallel import parallel_fracture
+
+# [Parallel] Bands smaller than this are not worth a task
+TILE_MIN_WIRES = 16
+
+
+def _track_bands(centers, cut_keys, band): 
+    # -> (wire lo, wire hi, cut lo, cut hi) per band of `band` wires (centers
+    # sorted); a band gets every cut on its track range
+    for lo in range(0, len(centers), band): 
+        hi = min(lo + band, len(centers))
+        k_lo = int(np.searchsorted(cut_keys, pack_xy(centers[lo], -(1 << 31))))
+        k_hi = int(np.searchsorted(cut_keys, pack_xy(centers[hi - 1] + 1, -(1 << 31))))
+        yield lo, hi, k_lo, k_hi
+
+
+def fracture_wires(orient, rects, centers, cut_keys, max_seg_len, r_sheet, c_area, origin=False): 
+    # [Vectorized] Wire fracturing for every stripe of one (layer, orient):
+    # per wire the points are its two ends plus the cuts on its track inside
+    # [start, end] (searchsorted on the sorted packed cut keys); segments
+    # longer than max_seg_len are split evenly.
+    # -> (start keys, end keys, R, C) with packed (x, y) node keys
+    # origin=True: + (wire index, unsplit segment start / end position) per piece
+    if len(centers) == 0: return None
+    if orient == 'H': 
+        start, end, thick = rects[:, 0], rects[:, 2], rects[:, 3] - rects[:, 1]
+    else: 
+        start, end, thick = rects[:, 1], rects[:, 3], rects[:, 2] - rects[:, 0]
+
+    first = np.searchsorted(cut_keys, pack_xy(centers, start), 'left')
+    last = np.searchsorted(cut_keys, pack_xy(centers, end), 'right')
+    n_cut = last - first
+    n_pt = n_cut + 2
+    total = int(n_pt.sum())
+    wire = np.repeat(np.arange(len(centers)), n_pt)
+    offs = np.cumsum(n_pt) - n_pt
+    slot = np.arange(total) - offs[wire]
+    pts = np.empty(total, dtype=np.int64)
+    inner = (slot > 0) & (slot <= n_cut[wire])
+    _, cut_pos = unpack_xy(cut_keys[first[wire[inner]] + slot[inner] - 1])
+    pts[inner] = cut_pos
+    pts[offs] = start
+    pts[offs + n_pt - 1] = end
+    # Ends may coincide with a cut
+    keep = np.ones(total, dtype=bool)
+    keep[1:] = (wire[1:] != wire[:-1]) | (pts[1:] != pts[:-1])
+    wire, pts = wire[keep], pts[keep]
+
+    seg = np.nonzero(wire[1:] == wire[:-1])[0]
+    if len(seg) == 0: return None
+    a, b, w = pts[seg], pts[seg + 1], wire[seg]
+    oa, ob = a, b
+
+    # Split long segments into ceil(dist / max_len) equal pieces
+    dist = b - a
+    num = np.where(dist > max_seg_len, np.ceil(dist / max_seg_len), 1).astype(np.int64)
+    if (num > 1).any(): 
+        rep = np.repeat(np.arange(len(a)), num)
+        k = np.arange(int(num.sum())) - np.repeat(np.cumsum(num) - num, num)
+        step = dist[rep] / num[rep]
+        sa = np.where(k == 0, a[rep], (a[rep] + k * step).astype(np.int64))
+        sb = np.where(k == num[rep] - 1, b[rep], (a[rep] + (k + 1) * step).astype(np.int64))
+        a, b, w = sa, sb, w[rep]
+        oa, ob = oa[rep], ob[rep]
+
+    width_um = thick[w] / 1000.0
+    width_um = np.where(width_um <= 0, 0.1, width_um)
+    len_um = (b - a) / 1000.0
+    res = np.maximum(0.001, (r_sheet / width_um) * len_um)
+    cap = (width_um * c_area) * len_um
+
+    track = centers[w]
+    if orient == 'H': 
+        out = pack_xy(a, track), pack_xy(b, track), res, cap
+    else: 
+        out = pack_xy(track, a), pack_xy(track, b), res, cap
+    return out + (w, oa, ob) if origin else out
+
 
 class RCExtractor: 
-    def __init__(self, generator, config): 
+    def __init__(self, generator, config, jobs=1, reducer=None): 
         self.gen = generator
         self.config = config
+        self.jobs = jobs
+        # [Reduction] optional RCReducer applied to each net before it is yielded
+        self.reducer = reducer
         self.tech_props = config.get("tech_properties", {}) 
         self.max_seg_len = 20.0 * 1000 
         
-        # [Turbo Optimization]
-        # Data structure organized by NET to avoid passing net_name around
-        # self.net_data[net] = {
-        #    'node_map': {(layer, x, y): id},    # Spatial -> ID
-        #    'id_coords': {id: (layer, x, y)},   # ID -> Spatial (for writing)
-        #    'resistors': [(id1, id2, val), ...],
-        #    'capacitors': [(id, val), ...],
-        #    'renamed': {id: "inst:pin"}         # Overrides default naming
-        # }
-        self.net_data = defaultdict(lambda: {
-            'node_map': {}, 
-            'id_coords': {}, 
-            'resistors': [], 
-            'capacitors': [],
-            'renamed': {},
-            'next_id': 1
-        })
+        # [Node Table] Data structure organized by NET
+        # self.net_data[net] = NetRC: dense node ids over packed (layer, x, y)
+        # keys, R / C as typed arrays (core/node_table.py)
+        self.net_data = {}
         
-        self.inst_conns = [] # List of (inst, pin, net, node_id, x, y)
-        self.ports = []      # List of (name, net, node_id, x, y)
+        # [Pin Table] Instance pins / ports by net with their node ids (core/pin_table.py)
+        self.inst_pins = None
+        self.port_pins = None
         self.layer_map_cache = {} 
+        self._layer_rc_cache = {} 
+        # [EffRes] per-net ResistanceSolver, built on the first query (core/eff_res.py)
+        self._res_solvers = {} 
+        # [Coupling] {owner net: [(other net, node ids, other node ids, C fF)]} and
+        # coupling total per net [fF], filled by run() (core/coupling.py)
+        self.coupling = {} 
+        self.coupling_total = {} 
         self._internal_ports = [] 
+        # [Incremental] per-net RC cache (shared with the generator)
+        self.cache = getattr(generator, 'cache', None)
+        self.rc_keys = {} 
+        # [Checkpoint] optional RCJournal: finished nets are journaled and skipped on resume
+        self.journal = None
 
     def run(self): 
+        # Whole design: every net's NetRC is kept in net_data
+        # ([Checkpoint] a journal needs nets finished a few at a time, one per worker)
+        chunk = max(1, self.jobs) if self.journal is not None else None
+        for net, net_rc in self.iter_nets(chunk=chunk): 
+            self.net_data[net] = net_rc
+        self._extract_coupling()
+
+    def has_coupling(self): 
+        layers = self.tech_props.get('layers', {})
+        return any(self._get_layer_param(l, 'c_coupling_ff_per_um', 0.0) > 0 for l in layers)
+
+    def _extract_coupling(self): 
+        # [Coupling] Needs every net's RC, so only after a whole-design run
+        if not self.has_coupling(): return
+        from .coupling import CouplingExtractor
+        self.coupling, self.coupling_total = CouplingExtractor(self).run()
+
+    def iter_nets(self, chunk=1): 
+        # [Streaming] -> (net, NetRC) in sorted net order, extracted `chunk`
+        # nets at a time (None: all at once). Nothing is retained here, so a
+        # consumer that drops each NetRC (DSPFWriter.write(stream=True)) holds
+        # one chunk of RC at a time; pin / port node ids go to the pin tables.
         print("[RC] Starting RC Extraction (Turbo - Integer Based)...") 
+        self._prepare_pins()
+
+        # Deterministic net order (set iteration depends on the hash seed)
+        nets = sorted(self.gen.nets_used)
+        chunk = chunk or max(1, len(nets))
+        total_nodes = total_res = total_cap = total_bytes = 0
+        journal = self.journal
+        for c0 in range(0, len(nets), chunk): 
+            part = nets[c0:c0 + chunk]
+            resumed = {net: journal.load(net) for net in part if journal is not None and journal.done(net)}
+            resumed = {net: entry for net, entry in resumed.items() if entry is not None}
+            results = self._extract_nets([n for n in part if n not in resumed], c0, len(nets))
+            for net in part: 
+                if net in resumed: 
+                    net_rc, inst_nodes, port_nodes = resumed.pop(net)
+                else: 
+                    net_rc, inst_nodes, port_nodes = results.pop(net)
+                    if self.reducer is not None: 
+                        net_rc, inst_nodes, port_nodes = self.reducer.reduce(net_rc, inst_nodes, port_nodes)
+                    if journal is not None: journal.record(net, (net_rc, inst_nodes, port_nodes))
+                lo, hi = self.inst_pins.net_slice(net)
+                self.inst_pins.node[lo:hi] = inst_nodes
+                lo, hi = self.port_pins.net_slice(net)
+                self.port_pins.node[lo:hi] = port_nodes
+                total_nodes += net_rc.n_nodes; total_res += net_rc.n_res
+                total_cap += net_rc.n_cap; total_bytes += net_rc.nbytes()
+                yield net, net_rc
+        print("") 
+        if self.cache is not None: self.cache.report()
+        if self.reducer is not None: self.reducer.report()
+        if journal is not None:
+            journal.flush()
+            journal.close()
+            
+        self._finalize_ports_connectivity()
         
+        # Stats
+        total_mb = total_bytes / (1024 * 1024)
+        print(f"[RC] Done. Nodes: {total_nodes}, R: {total_res}, C: {total_cap} ({total_mb:.1f} MB)") 
+
+    def _prepare_pins(self): 
         # Pre-process ports to have coordinates ready
+        self._internal_ports = []
         for p in self.gen.pins: 
             cx, cy = (p['rect'][0] + p['rect'][2])//2, (p['rect'][1] + p['rect'][3])//2
             self._internal_ports.append((p['name'], p['net'], p['layer'], cx, cy)) 
-
-        total_nets = len(self.gen.nets_used)
-        for i, net in enumerate(self.gen.nets_used): 
+        # [3D] TSV landings are ports of this die
+        self._internal_ports.extend(self.gen.tsv_ports) 
+        self.inst_pins = PinTable.from_instances(self.gen)
+        self.port_pins = PinTable.from_ports(self._internal_ports)
+        self._res_solvers = {}
+
+    def _extract_nets(self, nets, first, total_nets): 
+        # -> {net: (NetRC, inst pin node ids, port node ids)}
+        results, pending = {}, []
+        for i, net in enumerate(nets, first): 
             if i % 1 == 0: 
                 print(f"  > Extracting Net {i+1}/{total_nets}: {net}...", end='\r')
-            self._process_net(net) 
-        print("") 
-            
-        self._finalize_ports_connectivity()
-        
-        # Stats
-        total_nodes = sum(len(d['node_map']) for d in self.net_data.values())
-        total_res = sum(len(d['resistors']) for d in self.net_data.values())
-        total_cap = sum(len(d['capacitors']) for d in self.net_data.values())
-        print(f"[RC] Done. Nodes: {total_nodes}, R: {total_res}, C: {total_cap}") 
+            entry = self._load_cached(net) if self.cache is not None else None
+            if entry is None and self.jobs > 1: 
+                pending.append(net)
+                continue
+            if entry is None: 
+                entry = self._process_net(net)
+                self._save_cached(net, entry)
+            results[net] = entry
+        if pending: 
+            for net, entry in zip(pending, self._process_nets_parallel(pending)): 
+                self._save_cached(net, entry)
+                results[net] = entry
+        return results
+
+    def _net_rc_key(self, net_name): 
+        geom = self.gen.net_keys.get(net_name, {}).get('geom')
+        if geom is None: return None
+        layers = {k[1] for k in self.gen.index.keys(net_name)}
+        via_names = {va.name for va in self.gen.index.via_arrays(net_name)}
+        tsvs = [p for p in self.gen.tsv_ports if p[1] == net_name]
+        if tsvs: geom = stable_hash(geom, tsvs)
+        return rc_key(geom, self.gen.placement_key, self.tech_props, layers, via_names, self.max_seg_len)
+
+    def _load_cached(self, net_name): 
+        key = self.rc_keys[net_name] = self._net_rc_key(net_name)
+        return self.cache.load('rc', key) if key else None
+
+    def _save_cached(self, net_name, entry): 
+        key = self.rc_keys.get(net_name)
+        if self.cache is not None and key: 
+            self.cache.save('rc', key, entry)
 
     def _get_layer_param(self, layer, key, default): 
         if 'layers' in self.tech_props and layer in self.tech_props['layers']: 
@@ -415,158 +789,155 @@ class RCExtractor:
             return res
         return f"{layer}_TOP" 
 
-    def _get_node_id(self, net_store, layer, x, y): 
-        # Integer based lookup - Extremely fast
-        key = (layer, x, y)
-        if key in net_store['node_map']:
-            return net_store['node_map'][key]
-        
-        uid = net_store['next_id']
-        net_store['next_id'] += 1
-        net_store['node_map'][key] = uid
-        net_store['id_coords'][uid] = key
-        return uid
+    def _layer_rc(self, layer):
+        # Per-layer sheet R / area C, looked up once per extractor
+        rc = self._layer_rc_cache.get(layer)
+        if rc is None: 
+            rc = self._layer_rc_cache[layer] = (self._get_layer_param(layer, "r_sheet_ohm_per_sq", 0.1), 
+                                                self._get_layer_param(layer, "c_area_ff_per_um2", 0.0))
+        return rc
 
     def _process_net(self, net_name): 
-        wires = [w for w in self.gen.wires if w['net'] == net_name] 
-        vias = [v for v in self.gen.vias if v['net'] == net_name] 
-        net_store = self.net_data[net_name]
+        # -> (NetRC, node id per instance pin, node id per port) of one net
+        r_parts, cuts = self._net_cuts(net_name)
+        c_parts = []
+        for layer, orient, rects, centers, cut_keys in self._net_groups(net_name, cuts): 
+            out = self._fracture_group(layer, orient, rects, centers, cut_keys)
+            if out is not None: self._add_group(r_parts, c_parts, layer, out)
+        return self._finish_net(net_name, r_parts, c_parts)
+
+    def _process_nets_parallel(self, nets): 
+        # [Parallel] Every (net, layer, orient) group is cut into bands of whole
+        # tracks; bands of all nets are fractured in one pool. A wire never spans
+        # two bands, so band results concatenated in order equal the serial
+        # group, and nodes shared between bands / layers (via landings) are
+        # stitched by packed coordinate in NetRC.build.
+        prepared, groups = [], []
+        for net in nets: 
+            r_parts, cuts = self._net_cuts(net)
+            net_groups = self._net_groups(net, cuts)
+            prepared.append((net, r_parts, len(net_groups)))
+            groups.extend(net_groups)
+        total_wires = sum(len(g[3]) for g in groups)
+        band = max(TILE_MIN_WIRES, -(-total_wires // (self.jobs * 8)))
+
+        tasks, owners = [], []
+        for gi, (layer, orient, rects, centers, cut_keys) in enumerate(groups): 
+            r_sheet, c_area = self._layer_rc(layer)
+            for lo, hi, k_lo, k_hi in _track_bands(centers, cut_keys, band): 
+                tasks.append((orient, rects[lo:hi], centers[lo:hi], cut_keys[k_lo:k_hi], 
+                              self.max_seg_len, r_sheet, c_area))
+                owners.append(gi)
+        outs = parallel_fracture(tasks, self.jobs)
+
+        group_outs = [[] for _ in groups]
+        for gi, out in zip(owners, outs): 
+            if out is not None: group_outs[gi].append(out)
+
+        results, gi = [], 0
+        for net, r_parts, n_groups in prepared: 
+            c_parts = []
+            for g in range(gi, gi + n_groups): 
+                layer = groups[g][0]
+                for out in group_outs[g]: 
+                    self._add_group(r_parts, c_parts, layer, out)
+            gi += n_groups
+            results.append(self._finish_net(net, r_parts, c_parts))
+        return results
+
+    def _net_cuts(self, net_name): 
+        # -> (via R parts, {(layer, orient): ([track arrays], [position arrays])})
+        via_arrays = self.gen.index.via_arrays(net_name) 
+        # [Vectorized] R / C as arrays of packed node keys until numbering
+        r_parts = []
         
-        # 1. Spatial Index for Cuts (Integers)
-        cuts_h = defaultdict(lambda: defaultdict(list))
-        cuts_v = defaultdict(lambda: defaultdict(list))
+        # 1. Cuts per (layer, orient): track center + position along the track
+        cuts = defaultdict(lambda: ([], []))
         
-        def add_cut(layer, x, y):
-            cuts_h[layer][y].append(x)
-            cuts_v[layer][x].append(y)
-
-        # Vias
-        for v in vias: 
-            l_bot = v['bot_layer'] 
+        def add_cuts(layer, xs, ys):
+            h_track, h_pos = cuts[(layer, 'H')]
+            h_track.append(ys); h_pos.append(xs)
+            v_track, v_pos = cuts[(layer, 'V')]
+            v_track.append(xs); v_pos.append(ys)
+
+        # Vias: cut both layers, plus one cut resistor per via
+        for va in via_arrays: 
+            l_bot = va.bot_layer
             l_top = self._get_next_layer(l_bot) 
-            vx, vy = v['pos'] 
-            add_cut(l_bot, vx, vy)
-            add_cut(l_top, vx, vy)
-            
-            # Add Via Resistor immediately
-            n1 = self._get_node_id(net_store, l_bot, vx, vy)
-            n2 = self._get_node_id(net_store, l_top, vx, vy)
-            r_cut = self._get_via_param(v['name'], "r_cut_ohm", 1.0)
-            net_store['resistors'].append((n1, n2, r_cut))
-
-        # Instances
-        for inst in self.gen.instances: 
-            for pin in inst.get('physical_pins', []): 
-                if pin['net'] == net_name: 
-                    px, py = pin['center']
-                    add_cut(pin['layer'], px, py)
-
-        # Ports
-        for pname, pnet, player, px, py in self._internal_ports:
-            if pnet == net_name:
-                add_cut(player, px, py)
-
-        # 2. Fracture Wires
-        for wire in wires: 
-            self._fracture_wire(wire, cuts_h, cuts_v, net_store) 
-
-        # 3. Rename Nodes (Map ID to String)
-        # Instance Pins
-        for inst in self.gen.instances: 
-            for pin in inst.get('physical_pins', []): 
-                if pin['net'] == net_name: 
-                    px, py = pin['center'] 
-                    layer = pin['layer'] 
-                    key = (layer, px, py)
-                    if key in net_store['node_map']:
-                        nid = net_store['node_map'][key]
-                        new_name = f"{inst['name']}:{pin['name']}"
-                        net_store['renamed'][nid] = new_name
-                        self.inst_conns.append((inst['name'], pin['name'], net_name, nid, px, py))
-
-        # Ports
-        for pname, pnet, player, px, py in self._internal_ports:
-            if pnet == net_name:
-                key = (player, px, py)
-                if key in net_store['node_map']:
-                    nid = net_store['node_map'][key]
-                    net_store['renamed'][nid] = pname
-                    self.ports.append((pname, net_name, nid, px, py))
-
-    def _fracture_wire(self, wire, cuts_h, cuts_v, net_store): 
-        layer = wire['layer'] 
-        rect = wire['rect'] 
-        orient = wire['orient'] 
-        center = wire['center'] 
-        
-        # Fast Set for cuts
-        relevant_cuts = set()
-        
-        if orient == 'H': 
-            start, end = rect[0], rect[2]
-            if center in cuts_h[layer]:
-                for cx in cuts_h[layer][center]:
-                    if start <= cx <= end: relevant_cuts.add(cx)
-            relevant_cuts.add(start); relevant_cuts.add(end)
-        else: 
-            start, end = rect[1], rect[3]
-            if center in cuts_v[layer]:
-                for cy in cuts_v[layer][center]:
-                    if start <= cy <= end: relevant_cuts.add(cy)
-            relevant_cuts.add(start); relevant_cuts.add(end)
-                    
-        sorted_cuts = sorted(list(relevant_cuts)) 
-        
-        r_sheet = self._get_layer_param(layer, "r_sheet_ohm_per_sq", 0.1) 
-        c_area = self._get_layer_param(layer, "c_area_ff_per_um2", 0.0) 
-        width_um = (rect[3]-rect[1] if orient=='H' else rect[2]-rect[0]) / 1000.0
-        if width_um <= 0: width_um = 0.1
-        
-        r_per_um = r_sheet / width_um
-        c_per_um = width_um * c_area
-
-        prev = sorted_cuts[0]
-        max_len = self.max_seg_len
-        get_id = self._get_node_id
-        
-        for i in range(1, len(sorted_cuts)): 
-            curr = sorted_cuts[i] 
-            dist = curr - prev
-            
-            if dist > max_len: 
-                num = math.ceil(dist / max_len) 
-                step = dist/num
-                for k in range(1, num): 
-                    mid = int(prev + k*step)
-                    
-                    if orient == 'H': 
-                        n1 = get_id(net_store, layer, prev, center)
-                        n2 = get_id(net_store, layer, mid, center)
-                    else: 
-                        n1 = get_id(net_store, layer, center, prev)
-                        n2 = get_id(net_store, layer, center, mid)
-                    
-                    len_um = (mid - prev) / 1000.0
-                    net_store['resistors'].append((n1, n2, max(0.001, r_per_um * len_um)))
-                    net_store['capacitors'].append((n2, c_per_um * len_um))
-                    prev = mid
-
-            if orient == 'H': 
-                n1 = get_id(net_store, layer, prev, center)
-                n2 = get_id(net_store, layer, curr, center)
-            else: 
-                n1 = get_id(net_store, layer, center, prev)
-                n2 = get_id(net_store, layer, center, curr)
-
-            len_um = (curr - prev) / 1000.0
-            net_store['resistors'].append((n1, n2, max(0.001, r_per_um * len_um)))
-            net_store['capacitors'].append((n2, c_per_um * len_um))
-            prev = curr
+            r_cut = self._get_via_param(va.name, "r_cut_ohm", 1.0)
+            for vx, vy in va.iter_blocks():
+                vx = np.asarray(vx, dtype=np.int64); vy = np.asarray(vy, dtype=np.int64)
+                add_cuts(l_bot, vx, vy)
+                add_cuts(l_top, vx, vy)
+                k = pack_xy(vx, vy)
+                r_parts.append((l_bot, k, l_top, k, np.full(len(k), r_cut)))
+
+        # Instances and ports (pre-bucketed slices)
+        for table in (self.inst_pins, self.port_pins): 
+            for layer, lo, hi in table.layer_runs(net_name): 
+                add_cuts(layer, table.xs[lo:hi], table.ys[lo:hi])
+        return r_parts, cuts
+
+    def _net_groups(self, net_name, cuts): 
+        # 2. -> [(layer, orient, rects, centers, sorted packed cut keys)] in index order
+        groups = []
+        for _, layer, orient in self.gen.index.keys(net_name): 
+            rects, centers, _ = self.gen.wire_arrays(net_name, layer, orient)
+            track, pos = cuts.get((layer, orient), ([], []))
+            cut_keys = sorted_unique(pack_xy(np.concatenate(track), np.concatenate(pos))) if track else np.empty(0, dtype=np.int64)
+            groups.append((layer, orient, rects, centers, cut_keys))
+        return groups
+
+    @staticmethod
+    def _add_group(r_parts, c_parts, layer, out): 
+        k1, k2, res, cap = out
+        r_parts.append((layer, k1, layer, k2, res))
+        c_parts.append((layer, k2, cap))
+
+    def _finish_net(self, net_name, r_parts, c_parts): 
+        return self._with_pins(net_name, NetRC.build(r_parts, c_parts))
+
+    def _with_pins(self, net_name, net_rc): 
+        # 3. Node id of every instance pin / port (names are formatted by the writer)
+        return (net_rc,) + tuple(self._lookup_ids(net_rc, table, net_name) 
+                                 for table in (self.inst_pins, self.port_pins))
+
+    @staticmethod
+    def _lookup_ids(net_rc, table, net_name): 
+        lo, hi = table.net_slice(net_name)
+        ids = np.full(hi - lo, -1, dtype=np.int32)
+        for layer, a, b in table.layer_runs(net_name): 
+            ids[a - lo:b - lo] = net_rc.node_ids(layer, table.xs[a:b], table.ys[a:b])
+        return ids
+
+    def _fracture_group(self, layer, orient, rects, centers, cut_keys): 
+        r_sheet, c_area = self._layer_rc(layer)
+        return fracture_wires(orient, rects, centers, cut_keys, self.max_seg_len, r_sheet, c_area)
 
     def _finalize_ports_connectivity(self):
         print("[RC] Skipping BFS Connectivity Check for Turbo Performance.")
-        print(f"[RC] Registered {len(self.inst_conns)} Instance Connections.")
-        print(f"[RC] Registered {len(self.ports)} Top Ports.")
+        print(f"[RC] Registered {int((self.inst_pins.node >= 0).sum())} Instance Connections.")
+        print(f"[RC] Registered {int((self.port_pins.node >= 0).sum())} Top Ports.")
+
+    def resistance_solver(self, net): 
+        # [EffRes] Factorized (or preconditioned) once per net and kept for later queries
+        solver = self._res_solvers.get(net)
+        if solver is None: 
+            from .eff_res import ResistanceSolver   # scipy only when queried
+            opts = self.config.get('eff_res', {})
+            solver = ResistanceSolver(self.net_data[net], int(opts.get('direct_max_nodes', 1000000)), 
+                                      float(opts.get('tol', 1e-10)), int(opts.get('max_iter', 20000)), 
+                                      int(opts.get('agg_nodes', 16)))
+            print(f"[RES] {net}: {solver.kind} solver on {solver.matrix.shape[0]} nodes ({solver.setup_seconds:.2f}s)")
+            self._res_solvers[net] = solver
+        return solver
+
+    def effective_resistance(self, net, nodes_a, nodes_b): 
+        # -> R [ohm] between node nodes_a[i] and nodes_b[i] of `net` (a scalar side is broadcast;
+        # inf when the two are not connected)
+        opts = self.config.get('eff_res', {})
+        return self.resistance_solver(net).query(nodes_a, nodes_b, int(opts.get('block', 256)), 
+                                                 float(opts.get('mem_mb', 256)))
 '''
 
 files["core/dspf_checker.py"] = r''' 
@@ -752,13 +1123,40 @@ class DSPFChecker:
 '''
 
 files["core/stack_manager.py"] = r'''
+import os
+import atexit
+import shutil
+import tempfile
+import itertools
+import copy
+import numpy as np
 from .generator import Generator
+from .artifact import load_artifact
+from .parallel import parallel_die_generation
+from .intervals import rect_overlap_join
+from .net_cache import stable_hash
+
+# [Dedup] Die config fields that only affect naming, not geometry or RC
+DISPLAY_FIELDS = ('display_name', 'description', 'comment')
+
+
+def canonical_die_key(die_cfg):
+    return stable_hash('die', {k: v for k, v in die_cfg.items() if k not in DISPLAY_FIELDS})
 
 class StackManager:
-    def __init__(self, tech_lef):
+    def __init__(self, tech_lef, backend="dict", cache=None, artifact_dir=None, jobs=1, die_mem_cap_mb=None):
         self.tech = tech_lef
+        self.backend = backend
+        self.cache = cache
+        self.artifact_dir = artifact_dir
+        self.jobs = jobs
+        # [Parallel] estimated memory budget for dies generated concurrently
+        self.die_mem_cap_mb = die_mem_cap_mb
         self.generators = {} 
         self.tsv_pairs = []
+        # [Dedup] die -> representative die with the same canonical config
+        self.die_aliases = {}
+        self.die_keys = {}
         self.is_3d = False
         self.full_config = {}
 
@@ -766,37 +1164,3544 @@ class StackManager:
         self.full_config = config_data
         if 'dies' in config_data:
             self.is_3d = True
-            for die_name, die_cfg in config_data['dies'].items():
+            dies_cfg = config_data['dies']
+            reps = self._group_dies(dies_cfg)
+            if self.jobs > 1 and len(reps) > 1:
+                self._run_dies_parallel(reps)
+            for die_name, die_cfg in reps.items():
+                if die_name in self.generators: continue
                 print(f"[INFO] Generating Die: {die_name}")
-                gen = Generator(self.tech)
+                gen = Generator(self.tech, backend=self.backend, cache=self.cache, 
+                                artifact_dir=self._artifact_path(die_name), jobs=self.jobs)
                 gen.run(die_cfg)
                 self.generators[die_name] = gen
+            self._resolve_aliases(dies_cfg)
             
             self._generate_tsvs(config_data.get('stack_connections', []))
         else:
             self.is_3d = False
-            gen = Generator(self.tech)
+            gen = Generator(self.tech, backend=self.backend, cache=self.cache, 
+                            artifact_dir=self._artifact_path(None), jobs=self.jobs)
             gen.run(config_data)
             self.generators['single_die'] = gen
 
+    def _group_dies(self, dies_cfg):
+        # -> {representative die: cfg}; every other die with the same canonical
+        #    config is generated / loaded once and shared
+        self.die_aliases, self.die_keys, first = {}, {}, {}
+        for die_name, die_cfg in dies_cfg.items():
+            key = self.die_keys[die_name] = canonical_die_key(die_cfg)
+            self.die_aliases[die_name] = first.setdefault(key, die_name)
+        reps = {n: c for n, c in dies_cfg.items() if self.die_aliases[n] == n}
+        if len(reps) < len(dies_cfg):
+            print(f"[INFO] Dedup: {len(dies_cfg)} dies -> {len(reps)} unique floorplans")
+        return reps
+
+    def _resolve_aliases(self, dies_cfg):
+        # Config order; an alias shares every array of its representative and
+        # only owns its TSV landing ports.
+        generators = {}
+        for die_name in dies_cfg:
+            rep = self.die_aliases[die_name]
+            if rep == die_name:
+                generators[die_name] = self.generators[die_name]
+            else:
+                alias = copy.copy(self.generators[rep])
+                alias.tsv_ports = []
+                generators[die_name] = alias
+        self.generators = generators
+
+    def extraction_key(self, die_name):
+        # Dies with equal keys have identical RC networks (same floorplan, same TSVs)
+        gen = self.generators[die_name]
+        return stable_hash('rc-die', self.die_keys.get(die_name, die_name), gen.tsv_ports)
+
+    def _run_dies_parallel(self, dies_cfg):
+        # [Parallel] one worker process per die; results come back as mapped artifacts
+        root = self.artifact_dir
+        if not root:
+            root = tempfile.mkdtemp(prefix="pg_dies_")
+            atexit.register(shutil.rmtree, root, True)
+        dies = [(name, cfg, os.path.join(root, name)) for name, cfg in dies_cfg.items()]
+        cap = self.die_mem_cap_mb * 1024 * 1024 if self.die_mem_cap_mb else None
+        cache_root = self.cache.root if self.cache is not None else None
+        try:
+            parallel_die_generation(self.tech, self.backend, cache_root, dies, self.jobs, cap)
+        except Exception as e:
+            print(f"[WARN] Parallel die generation failed ({e}), falling back to serial.")
+            return
+        for name, _, path in dies:
+            gen = load_artifact(path, self.tech)
+            gen.cache = self.cache
+            self.generators[name] = gen
+
+    def _artifact_path(self, die_name):
+        if not self.artifact_dir: return None
+        return os.path.join(self.artifact_dir, die_name) if die_name else self.artifact_dir
+
+    def load_artifacts(self, path, config_data):
+        # [Artifact] Skip generation: map previously saved Generator results
+        self.full_config = config_data
+        self.is_3d = 'dies' in config_data
+        if self.is_3d:
+            for die_name in self._group_dies(config_data['dies']):
+                self.generators[die_name] = load_artifact(os.path.join(path, die_name), self.tech)
+                self.generators[die_name].cache = self.cache
+            self._resolve_aliases(config_data['dies'])
+            self._generate_tsvs(config_data.get('stack_connections', []))
+        else:
+            self.generators['single_die'] = load_artifact(path, self.tech)
+            self.generators['single_die'].cache = self.cache
+
     def _generate_tsvs(self, connections):
-        for conn in connections:
+        # [3D] TSV / hybrid-bond sites where the same net's stripes of the two
+        # dies overlap (die1 top layer, die2 bottom layer by default). Sites sit
+        # on a pitch grid along each overlap; each end lands on its die's wire
+        # centerline and is registered there as a port for the extractor.
+        self.tsv_pairs = []
+        for gen in self.generators.values(): gen.tsv_ports = []
+        units = self.tech.units
+        for ci, conn in enumerate(connections):
             die1 = conn['die1']
             die2 = conn['die2']
             net = conn['net']
-            pitch = conn.get('pitch', 50.0) * 1000 
-            
             if die1 not in self.generators or die2 not in self.generators: continue
             
             g1 = self.generators[die1]
             g2 = self.generators[die2]
+            layer1 = conn.get('layer1', 'M9')
+            layer2 = conn.get('layer2', 'M1')
+            pitch = max(int(round(conn.get('pitch', 50.0) * units)), 1)
+            offset = int(round(conn.get('offset', conn.get('pitch', 50.0) / 2) * units))
+            r_tsv = float(conn.get('resistance', 0.05))
+            
+            r1, c1, h1 = g1.wire_arrays(net, layer1)
+            r2, c2, h2 = g2.wire_arrays(net, layer2)
+            ia, ib = rect_overlap_join(r1, r2)
+            if len(ia) == 0: 
+                print(f"[WARN] TSV {die1}-{die2} {net}: no overlapping {layer1}/{layer2} stripes")
+                continue
             
-            g1_wires = [w for w in g1.wires if w['net'] == net and w['layer'] == 'M9']
-            g2_wires = [w for w in g2.wires if w['net'] == net and w['layer'] == 'M1']
+            # Overlap rectangles; sites run along the longer side of each
+            ox1 = np.maximum(r1[ia, 0], r2[ib, 0]); oy1 = np.maximum(r1[ia, 1], r2[ib, 1])
+            ox2 = np.minimum(r1[ia, 2], r2[ib, 2]); oy2 = np.minimum(r1[ia, 3], r2[ib, 3])
+            along_x = (ox2 - ox1) >= (oy2 - oy1)
+            lo = np.where(along_x, ox1, oy1); hi = np.where(along_x, ox2, oy2)
+            base = np.where(along_x, self._die_origin(g1, 0), self._die_origin(g1, 1)) + offset
+            k_first = -((base - lo) // pitch)
+            k_last = (hi - base) // pitch
+            counts = np.maximum(k_last - k_first + 1, 0)
+            if counts.sum() == 0: continue
             
-            # Simple TSV generation logic (overlap)
-            # In a real tool, this would be more complex
-            pass
+            pair = np.repeat(np.arange(len(ia)), counts)
+            k = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts) + k_first[pair]
+            site = base[pair] + k * pitch
+            cross = np.where(along_x, (oy1 + oy2) // 2, (ox1 + ox2) // 2)[pair]
+            xs = np.where(along_x[pair], site, cross)
+            ys = np.where(along_x[pair], cross, site)
+            
+            # One TSV per site; ends snap to the owning wire's centerline
+            order = np.lexsort((xs, ys))
+            keep = np.ones(len(order), dtype=bool)
+            keep[1:] = (xs[order][1:] != xs[order][:-1]) | (ys[order][1:] != ys[order][:-1])
+            sel = order[keep]
+            xs, ys, w1, w2 = xs[sel], ys[sel], ia[pair[sel]], ib[pair[sel]]
+            p1 = (np.where(h1[w1], xs, c1[w1]), np.where(h1[w1], c1[w1], ys))
+            p2 = (np.where(h2[w2], xs, c2[w2]), np.where(h2[w2], c2[w2], ys))
+            
+            names = [f"TSV{ci}_{net}_{i}" for i in range(len(xs))]
+            for gen, layer, (px, py) in ((g1, layer1, p1), (g2, layer2, p2)):
+                gen.tsv_ports.extend(zip(names, itertools.repeat(net), itertools.repeat(layer), 
+                                         px.tolist(), py.tolist()))
+            self.tsv_pairs.append({
+                'net': net, 'die1': die1, 'die2': die2, 'layer1': layer1, 'layer2': layer2, 
+                'r_ohm': r_tsv, 'names': names, 'xs': xs, 'ys': ys
+            })
+            print(f"[INFO] TSV {die1}/{layer1} -> {die2}/{layer2} {net}: {len(xs)} sites "
+                  f"({len(ia)} overlapping stripe pairs)")
+
+    def _die_origin(self, gen, axis):
+        key = 'llx' if axis == 0 else 'lly'
+        return int(round(gen.die_area.get(key, 0) * self.tech.units))
+'''
+
+files["core/geom_store.py"] = r'''
+import numpy as np
+
+# [Columnar Backend]
+# Geometry is kept in structured NumPy arrays instead of one dict per shape.
+# Layer / net names are interned to small ints; the dict shaped records that
+# DEFWriter / RCExtractor / Viewer2D expect are produced on demand by the
+# read-only views at the bottom of this file.
+# Vias are never stored per cut: a via grid is a ViaArray descriptor
+# (net, via name, sorted x tracks, sorted y tracks). Region-clipped grids that
+# are no longer a full product use ViaPoints with the same interface.
+
+ORIENTS = ('H', 'V')
+ORIENT_H = 0
+ORIENT_V = 1
+
+WIRE_DTYPE = np.dtype([
+    ('x1', 'i8'), ('y1', 'i8'), ('x2', 'i8'), ('y2', 'i8'),
+    ('center', 'i8'), ('width', 'i8'),
+    ('layer', 'i2'), ('net', 'i4'), ('orient', 'u1'),
+])
+
+PIN_DTYPE = np.dtype([
+    ('x1', 'i8'), ('y1', 'i8'), ('x2', 'i8'), ('y2', 'i8'),
+    ('x', 'i8'), ('y', 'i8'),
+    ('net', 'i4'), ('layer', 'i2'),
+])
+
+
+class NameTable:
+    def __init__(self, names=()):
+        self.names = []
+        self.ids = {}
+        for n in names: self.intern(n)
+
+    def intern(self, name):
+        idx = self.ids.get(name)
+        if idx is None:
+            idx = len(self.names)
+            self.names.append(name)
+            self.ids[name] = idx
+        return idx
+
+    def get(self, name, default=-1):
+        return self.ids.get(name, default)
+
+    def __getitem__(self, idx):
+        return self.names[idx]
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.ids
+
+
+class ColumnTable:
+    # Append-only structured array. Blocks are collected and concatenated once
+    # on first read, so vectorized emitters never pay for repeated resizes.
+    def __init__(self, dtype):
+        self.dtype = np.dtype(dtype)
+        self._chunks = []
+        self._data = None
+        self._size = 0
+
+    def append(self, **cols):
+        n = max(np.size(v) for v in cols.values())
+        if n == 0: return
+        block = np.empty(n, dtype=self.dtype)
+        for name, val in cols.items():
+            block[name] = val
+        self._chunks.append(block)
+        self._size += n
+        self._data = None
+
+    @classmethod
+    def from_array(cls, arr):
+        # Wrap an existing (possibly memory-mapped) array without copying
+        table = cls(arr.dtype)
+        if len(arr): table._chunks = [arr]
+        table._data = arr
+        table._size = len(arr)
+        return table
+
+    def extend(self, block):
+        if len(block) == 0: return
+        self._chunks.append(np.asarray(block, dtype=self.dtype))
+        self._size += len(block)
+        self._data = None
+
+    @property
+    def data(self):
+        if self._data is None:
+            if not self._chunks:
+                self._data = np.empty(0, dtype=self.dtype)
+            elif len(self._chunks) == 1:
+                self._data = self._chunks[0]
+            else:
+                self._data = np.concatenate(self._chunks)
+                self._chunks = [self._data]
+        return self._data
+
+    def clear(self):
+        self._chunks = []
+        self._data = None
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+
+class GeometryStore:
+    def __init__(self):
+        self.nets = NameTable()
+        self.layers = NameTable()
+        self.wires = ColumnTable(WIRE_DTYPE)
+        self.pins = ColumnTable(PIN_DTYPE)
+
+    def clear(self):
+        self.wires.clear(); self.pins.clear()
+
+    def add_stripes(self, net, layer, orient, centers, lo, hi, width):
+        # One call per (net, layer) rule: all tracks are written as one block.
+        centers = np.asarray(centers, dtype=np.int64)
+        half_w = width // 2
+        if orient == 'H':
+            x1, y1, x2, y2 = lo, centers - half_w, hi, centers + half_w
+        else:
+            x1, y1, x2, y2 = centers - half_w, lo, centers + half_w, hi
+        self.wires.append(
+            x1=x1, y1=y1, x2=x2, y2=y2, center=centers, width=width,
+            layer=self.layers.intern(layer), net=self.nets.intern(net),
+            orient=ORIENTS.index(orient),
+        )
+
+    def add_pins(self, net, layer, xs, ys, half_size):
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        self.pins.append(
+            x1=xs - half_size, y1=ys - half_size, x2=xs + half_size, y2=ys + half_size,
+            x=xs, y=ys, net=self.nets.intern(net), layer=self.layers.intern(layer),
+        )
+
+    # --- Compatibility views -------------------------------------------------
+
+    def wire_view(self):
+        return RecordView(self.wires, self._wire_record)
+
+    def pin_view(self):
+        return RecordView(self.pins, self._pin_record)
+
+    def _wire_record(self, row):
+        x1, y1, x2, y2, center, width, layer, net, orient = row
+        return {
+            'rect': (x1, y1, x2, y2), 'layer': self.layers[layer], 'net': self.nets[net],
+            'orient': ORIENTS[orient], 'center': center, 'width': width
+        }
+
+    def _pin_record(self, row):
+        x1, y1, x2, y2, x, y, net, layer = row
+        net_name = self.nets[net]
+        layer_name = self.layers[layer]
+        return {'name': f"{net_name}_PIN_{layer_name}_{x}_{y}", 'net': net_name, 'layer': layer_name,
+                'pos': (x, y), 'orient': 'N', 'rect': (x1, y1, x2, y2)}
+
+
+class RecordView:
+    # Read-only sequence of dict records over a ColumnTable. Records are built
+    # per access; nothing is cached, so memory stays at the array footprint.
+    def __init__(self, table, to_record):
+        self._table = table
+        self._to_record = to_record
+
+    def __len__(self):
+        return len(self._table)
+
+    def __bool__(self):
+        return len(self._table) > 0
+
+    def __getitem__(self, idx):
+        data = self._table.data
+        if isinstance(idx, slice):
+            return [self._to_record(row) for row in data[idx].tolist()]
+        return self._to_record(data[idx].tolist())
+
+    def take(self, ids):
+        return [self._to_record(row) for row in self._table.data[ids].tolist()]
+
+    def __iter__(self):
+        data = self._table.data
+        to_record = self._to_record
+        step = 65536
+        for start in range(0, len(data), step):
+            for row in data[start:start + step].tolist():
+                yield to_record(row)
+
+
+class ViaArray:
+    # Via grid between an H track set and a V track set of one net.
+    # Cut (i, j) sits at (xs[j], ys[i]); positions are expanded row-major.
+    __slots__ = ('net', 'name', 'bot_layer', 'xs', 'ys')
+
+    def __init__(self, net, name, bot_layer, xs, ys):
+        self.net = net
+        self.name = name
+        self.bot_layer = bot_layer
+        self.xs = np.asarray(xs, dtype=np.int64)
+        self.ys = np.asarray(ys, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.xs) * len(self.ys)
+
+    def expand(self):
+        # Bulk expansion -> (x array, y array)
+        return np.tile(self.xs, len(self.ys)), np.repeat(self.ys, len(self.xs))
+
+    def iter_blocks(self, max_points=1 << 20):
+        # Bounded-memory expansion: whole rows of the grid per block
+        rows = max(1, max_points // max(1, len(self.xs)))
+        for start in range(0, len(self.ys), rows):
+            ys = self.ys[start:start + rows]
+            yield np.tile(self.xs, len(ys)), np.repeat(ys, len(self.xs))
+
+    def window(self, x0, x1, y0, y1):
+        # -> (x array, y array) of the cuts inside [x0, x1] x [y0, y1] (xs / ys are sorted)
+        xs = self.xs[np.searchsorted(self.xs, x0, 'left'):np.searchsorted(self.xs, x1, 'right')]
+        ys = self.ys[np.searchsorted(self.ys, y0, 'left'):np.searchsorted(self.ys, y1, 'right')]
+        return np.tile(xs, len(ys)), np.repeat(ys, len(xs))
+
+    def iter_positions(self):
+        xs = self.xs.tolist()
+        for y in self.ys.tolist():
+            for x in xs:
+                yield x, y
+
+    def position(self, idx):
+        row, col = divmod(idx, len(self.xs))
+        return int(self.xs[col]), int(self.ys[row])
+
+    def rows(self):
+        # -> (y, [x, ...]) per y track
+        xs = self.xs.tolist()
+        for y in self.ys.tolist():
+            yield y, xs
+
+    def cols(self):
+        # -> (x, [y, ...]) per x track
+        ys = self.ys.tolist()
+        for x in self.xs.tolist():
+            yield x, ys
+
+    def records(self):
+        for x, y in self.iter_positions():
+            yield {'pos': (x, y), 'name': self.name, 'net': self.net, 'bot_layer': self.bot_layer}
+
+
+class ViaPoints(ViaArray):
+    # Explicit via positions (paired xs[i], ys[i], sorted by y then x)
+    __slots__ = ()
+
+    def __len__(self):
+        return len(self.xs)
+
+    def expand(self):
+        return self.xs, self.ys
+
+    def iter_blocks(self, max_points=1 << 20):
+        for start in range(0, len(self.xs), max_points):
+            yield self.xs[start:start + max_points], self.ys[start:start + max_points]
+
+    def window(self, x0, x1, y0, y1):
+        # Rows y0..y1 are one slice of the (y, x)-sorted points
+        a, b = np.searchsorted(self.ys, y0, 'left'), np.searchsorted(self.ys, y1, 'right')
+        xs, ys = self.xs[a:b], self.ys[a:b]
+        m = (xs >= x0) & (xs <= x1)
+        return xs[m], ys[m]
+
+    def iter_positions(self):
+        return zip(self.xs.tolist(), self.ys.tolist())
+
+    def position(self, idx):
+        return int(self.xs[idx]), int(self.ys[idx])
+
+    def _groups(self, keys, vals):
+        order = np.lexsort((vals, keys))
+        keys, vals = keys[order], vals[order]
+        uniq, start = np.unique(keys, return_index=True)
+        for k, v in zip(uniq.tolist(), np.split(vals, start[1:])):
+            yield k, v.tolist()
+
+    def rows(self):
+        return self._groups(self.ys, self.xs)
+
+    def cols(self):
+        return self._groups(self.xs, self.ys)
+
+
+class ViaArrayView:
+    # Read-only flat view of a list of via descriptors (legacy gen.vias access)
+    def __init__(self, via_arrays):
+        self._arrays = via_arrays
+
+    def __len__(self):
+        return sum(len(va) for va in self._arrays)
+
+    def __bool__(self):
+        return any(len(va) for va in self._arrays)
+
+    def __getitem__(self, idx):
+        if idx < 0: idx += len(self)
+        for va in self._arrays:
+            n = len(va)
+            if idx < n:
+                return {'pos': va.position(idx), 'name': va.name,
+                        'net': va.net, 'bot_layer': va.bot_layer}
+            idx -= n
+        raise IndexError("via index out of range")
+
+    def __iter__(self):
+        for va in self._arrays:
+            yield from va.records()
+'''
+
+files["core/geom_index.py"] = r'''
+from collections import defaultdict
+import numpy as np
+
+# [Optimization] Shared geometry index.
+# Wires are grouped by (net, layer, orient); each group keeps its track centers
+# sorted together with the wire ids (positions in gen.wires), so a consumer gets
+# "all VDD M1 rails" or "VSS M4 tracks between x0 and x1" in O(log n + result)
+# instead of scanning every wire of the design once per net.
+
+
+class GeometryIndex:
+    def __init__(self):
+        self._groups = {}      # (net, layer, orient) -> ([center arrays], [id arrays])
+        self._sorted = {}      # (net, layer, orient) -> (sorted centers, ids)
+        self._by_net = defaultdict(list)
+        self._by_layer = defaultdict(list)
+        self._vias = defaultdict(list)   # net -> [ViaArray]
+
+    def clear(self):
+        self._groups.clear(); self._sorted.clear()
+        self._by_net.clear(); self._by_layer.clear(); self._vias.clear()
+
+    def add_wires(self, net, layer, orient, centers, first_id, ids=None):
+        # ids default to the contiguous range first_id .. first_id + len(centers)
+        key = (net, layer, orient)
+        if key not in self._groups:
+            self._groups[key] = ([], [])
+            self._by_net[net].append(key)
+            self._by_layer[layer].append(key)
+        centers = np.asarray(centers, dtype=np.int64)
+        c_list, id_list = self._groups[key]
+        c_list.append(centers)
+        if ids is None: ids = np.arange(first_id, first_id + len(centers), dtype=np.int64)
+        id_list.append(np.asarray(ids, dtype=np.int64))
+        self._sorted.pop(key, None)
+
+    def add_via_array(self, via_array):
+        self._vias[via_array.net].append(via_array)
+
+    def _track(self, key):
+        track = self._sorted.get(key)
+        if track is None:
+            c_list, id_list = self._groups[key]
+            centers = np.concatenate(c_list)
+            ids = np.concatenate(id_list)
+            order = np.argsort(centers, kind='stable')
+            track = self._sorted[key] = (centers[order], ids[order])
+        return track
+
+    def keys(self, net=None, layer=None, orient=None):
+        if net is not None: cand = self._by_net.get(net, [])
+        elif layer is not None: cand = self._by_layer.get(layer, [])
+        else: cand = list(self._groups)
+        return [k for k in cand
+                if (layer is None or k[1] == layer) and (orient is None or k[2] == orient)]
+
+    def centers(self, net, layer, orient):
+        key = (net, layer, orient)
+        if key not in self._groups: return np.empty(0, dtype=np.int64)
+        return self._track(key)[0]
+
+    def wire_ids(self, net=None, layer=None, orient=None, lo=None, hi=None):
+        # Wire ids of every matching group; lo/hi restrict the track center range (inclusive)
+        parts = []
+        for key in self.keys(net, layer, orient):
+            centers, ids = self._track(key)
+            a = 0 if lo is None else int(np.searchsorted(centers, lo, 'left'))
+            b = len(centers) if hi is None else int(np.searchsorted(centers, hi, 'right'))
+            if b > a: parts.append(ids[a:b])
+        if not parts: return np.empty(0, dtype=np.int64)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def via_arrays(self, net):
+        return self._vias.get(net, [])
+'''
+
+files["core/instance_store.py"] = r'''
+import numpy as np
+from .geom_store import NameTable
+
+# [Bulk Placement]
+# Standard cells are held as integer arrays (row, x, master id, pin net ids).
+# Rows carry the rail geometry, so a cell's pins are derived from its row.
+# Cell names ("cell_N") and "inst pin" connection strings are formatted only
+# when a writer asks for them.
+
+
+class InstanceStore:
+    ARRAYS = ('row_y', 'row_top', 'row_bot_w', 'row_top_w', 'row', 'x', 'master', 'pin_net')
+
+    def __init__(self, rail_layer, inst_width, nets=None):
+        self.rail_layer = rail_layer
+        self.inst_width = inst_width
+        self.masters = NameTable()
+        self.nets = nets if nets is not None else NameTable()
+        # Per row
+        self.row_y = np.empty(0, dtype=np.int64)       # bottom rail center
+        self.row_top = np.empty(0, dtype=np.int64)     # top rail center
+        self.row_bot_w = np.empty(0, dtype=np.int64)
+        self.row_top_w = np.empty(0, dtype=np.int64)
+        # Per instance
+        self.row = np.empty(0, dtype=np.int32)
+        self.x = np.empty(0, dtype=np.int64)
+        self.master = np.empty(0, dtype=np.int16)
+        self.pin_net = np.empty((0, 2), dtype=np.int32)  # [bottom pin, top pin]
+
+    def place_rows(self, rails, master_name, count, x_start, x_stop, pitch):
+        # rails: records sorted by center. A row exists between two adjacent
+        # rails of different nets; every row holds the same x sequence.
+        xs_row = np.arange(x_start, x_stop, pitch, dtype=np.int64)
+        if len(rails) < 2 or len(xs_row) == 0 or count <= 0: return
+        centers = np.array([r['center'] for r in rails], dtype=np.int64)
+        widths = np.array([r['width'] for r in rails], dtype=np.int64)
+        net_ids = np.array([self.nets.intern(r['net']) for r in rails], dtype=np.int32)
+
+        valid = np.nonzero(net_ids[:-1] != net_ids[1:])[0]
+        per_row = len(xs_row)
+        n_rows = min(len(valid), -(-count // per_row))
+        valid = valid[:n_rows]
+        total = min(count, n_rows * per_row)
+
+        self.row_y = centers[valid]
+        self.row_top = centers[valid + 1]
+        self.row_bot_w = widths[valid]
+        self.row_top_w = widths[valid + 1]
+
+        k = np.arange(total, dtype=np.int64)
+        self.row = (k // per_row).astype(np.int32)
+        self.x = xs_row[k % per_row]
+        self.master = np.full(total, self.masters.intern(master_name), dtype=np.int16)
+        self.pin_net = np.stack([net_ids[valid][self.row], net_ids[valid + 1][self.row]], axis=1)
+
+    @classmethod
+    def from_records(cls, records, rail_layer, nets):
+        # Rebuild compact arrays from legacy instance dicts (two rail pins each)
+        records = list(records)
+        inst_width = records[0]['rect'][2] - records[0]['rect'][0] if records else 0
+        st = cls(rail_layer, inst_width, nets)
+        rows = {}
+        row_idx, xs, masters, pin_nets = [], [], [], []
+        for inst in records:
+            bot, top = inst['physical_pins'][:2]
+            key = (bot['center'][1], top['center'][1],
+                   bot['rect'][3] - bot['rect'][1], top['rect'][3] - top['rect'][1])
+            row_idx.append(rows.setdefault(key, len(rows)))
+            xs.append(inst['pos'][0])
+            masters.append(st.masters.intern(inst['master']))
+            pin_nets.append((nets.intern(bot['net']), nets.intern(top['net'])))
+        row_keys = np.array(list(rows), dtype=np.int64).reshape(-1, 4)
+        st.row_y, st.row_top, st.row_bot_w, st.row_top_w = (row_keys[:, k].copy() for k in range(4))
+        st.row = np.array(row_idx, dtype=np.int32)
+        st.x = np.array(xs, dtype=np.int64)
+        st.master = np.array(masters, dtype=np.int16)
+        st.pin_net = np.array(pin_nets, dtype=np.int32).reshape(-1, 2)
+        return st
+
+    def __len__(self):
+        return len(self.x)
+
+    @staticmethod
+    def name(idx):
+        return f"cell_{idx}"
+
+    def iter_connections(self, net):
+        # Lazy "cell_N PIN" strings for DEF NETS sections
+        net_id = self.nets.get(net)
+        if net_id < 0: return
+        net_name = self.nets[net_id]
+        inst = np.nonzero((self.pin_net == net_id).any(axis=1))[0]
+        for i in inst.tolist():
+            yield f"cell_{i} {net_name}"
+
+    def iter_placements(self):
+        # -> (name, master, x, y) for DEF COMPONENTS
+        masters = self.masters.names
+        ys = self.row_y[self.row]
+        for i, (m, x, y) in enumerate(zip(self.master.tolist(), self.x.tolist(), ys.tolist())):
+            yield f"cell_{i}", masters[m], x, y
+
+    def record(self, idx):
+        r = int(self.row[idx]); x = int(self.x[idx]); w = self.inst_width
+        y_bot, y_top = int(self.row_y[r]), int(self.row_top[r])
+        pins = []
+        for slot, (yc, wc) in enumerate(((y_bot, int(self.row_bot_w[r])), (y_top, int(self.row_top_w[r])))):
+            net = self.nets[int(self.pin_net[idx, slot])]
+            pins.append({
+                'name': net, 'net': net, 'layer': self.rail_layer,
+                'center': (x + w // 2, yc),
+                'rect': [x, yc - wc // 2, x + w, yc + wc // 2]
+            })
+        return {
+            'name': self.name(idx), 'master': self.masters[int(self.master[idx])],
+            'pos': (x, y_bot), 'orient': 'N',
+            'rect': [x, y_bot, x + w, y_top], 'physical_pins': pins
+        }
+
+    def view(self):
+        return InstanceView(self)
+
+
+class InstanceView:
+    # Read-only legacy access (gen.instances) to an InstanceStore
+    def __init__(self, store):
+        self._store = store
+
+    def __len__(self):
+        return len(self._store)
+
+    def __bool__(self):
+        return len(self._store) > 0
+
+    def __getitem__(self, idx):
+        if idx < 0: idx += len(self._store)
+        if not 0 <= idx < len(self._store): raise IndexError("instance index out of range")
+        return self._store.record(idx)
+
+    def __iter__(self):
+        for i in range(len(self._store)):
+            yield self._store.record(i)
+'''
+
+files["core/intervals.py"] = r'''
+import numpy as np
+
+# [Optimization] Interval helpers for region / blockage aware generation.
+# All coordinates are integer DBU; intervals are closed [start, end] and
+# "overlap" means a strictly positive common length.
+
+
+def merge_intervals(starts, ends):
+    # -> sorted, disjoint (starts, ends) covering the union of the input
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    if len(starts) == 0: return starts, ends
+    order = np.argsort(starts, kind='stable')
+    starts, ends = starts[order], np.maximum.accumulate(ends[order])
+    # A new run starts where the interval begins at/after everything before it
+    new_run = np.ones(len(starts), dtype=bool)
+    new_run[1:] = starts[1:] >= ends[:-1]
+    run_id = np.cumsum(new_run) - 1
+    m_starts = starts[new_run]
+    m_ends = np.zeros(len(m_starts), dtype=np.int64)
+    np.maximum.at(m_ends, run_id, ends)
+    return m_starts, m_ends
+
+
+def subtract_intervals(lo, hi, cut_starts, cut_ends):
+    # [lo, hi] minus the union of the cut intervals -> list of (a, b), a < b
+    pieces = []
+    curr = lo
+    for a, b in sorted(zip(cut_starts, cut_ends)):
+        if b <= curr: continue
+        if a >= hi: break
+        if a > curr: pieces.append((curr, a))
+        curr = max(curr, b)
+        if curr >= hi: break
+    if curr < hi: pieces.append((curr, hi))
+    return pieces
+
+
+class IntervalTree:
+    # Static augmented interval tree: intervals sorted by start in the leaves
+    # of a segment tree that stores the max end of each subtree. A query visits
+    # only subtrees that can still contain an overlapping interval, so it costs
+    # O(log n + k) for k hits.
+    def __init__(self, starts, ends):
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        order = np.argsort(starts, kind='stable')
+        self.ids = order
+        self.starts = starts[order]
+        self.ends = ends[order]
+        n = len(starts)
+        size = 1
+        while size < max(n, 1): size <<= 1
+        self._size = size
+        max_end = np.full(2 * size, np.iinfo(np.int64).min, dtype=np.int64)
+        max_end[size:size + n] = self.ends
+        for i in range(size - 1, 0, -1):
+            max_end[i] = max(max_end[2 * i], max_end[2 * i + 1])
+        self._max_end = max_end.tolist()
+        self._merged = merge_intervals(starts, ends)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def query(self, lo, hi):
+        # ids (input order) of intervals with start < hi and end > lo
+        k = int(np.searchsorted(self.starts, hi, 'left'))
+        if k == 0: return np.empty(0, dtype=np.int64)
+        size, max_end, ends = self._size, self._max_end, self.ends
+        hits = []
+        stack = [(1, 0, size)]
+        while stack:
+            node, a, b = stack.pop()
+            if a >= k or max_end[node] <= lo: continue
+            if b - a == 1:
+                if ends[a] > lo: hits.append(a)
+                continue
+            mid = (a + b) // 2
+            stack.append((2 * node + 1, mid, b))
+            stack.append((2 * node, a, mid))
+        return self.ids[np.array(sorted(hits), dtype=np.int64)]
+
+    def any_overlap(self, lo, hi):
+        # Vectorized: does [lo[i], hi[i]] overlap any interval?
+        m_starts, m_ends = self._merged
+        lo = np.asarray(lo, dtype=np.int64)
+        hi = np.asarray(hi, dtype=np.int64)
+        if len(m_starts) == 0: return np.zeros(len(lo), dtype=bool)
+        # Only the last merged run starting before hi can reach past lo
+        idx = np.searchsorted(m_starts, hi, 'left') - 1
+        return (idx >= 0) & (m_ends[np.maximum(idx, 0)] > lo)
+
+
+def clip_tracks(centers, half_w, lo, hi, tree=None, cut_lo=None, cut_hi=None):
+    # Stripe pieces left on each track after removing blockages.
+    # tree indexes the blockages on the cross axis; cut_lo/cut_hi are their
+    # extents along the stripe. -> (centers, lo, hi) sorted by (center, lo)
+    centers = np.asarray(centers, dtype=np.int64)
+    n = len(centers)
+    if tree is None or len(tree) == 0 or n == 0:
+        return centers, np.full(n, lo, dtype=np.int64), np.full(n, hi, dtype=np.int64)
+
+    hit = tree.any_overlap(centers - half_w, centers + half_w)
+    out_c = [centers[~hit]]
+    out_lo = [np.full(int((~hit).sum()), lo, dtype=np.int64)]
+    out_hi = [np.full(int((~hit).sum()), hi, dtype=np.int64)]
+    for c in centers[hit].tolist():
+        ids = tree.query(c - half_w, c + half_w)
+        pieces = subtract_intervals(lo, hi, cut_lo[ids].tolist(), cut_hi[ids].tolist())
+        if not pieces: continue
+        out_c.append(np.full(len(pieces), c, dtype=np.int64))
+        out_lo.append(np.array([p[0] for p in pieces], dtype=np.int64))
+        out_hi.append(np.array([p[1] for p in pieces], dtype=np.int64))
+
+    c, a, b = np.concatenate(out_c), np.concatenate(out_lo), np.concatenate(out_hi)
+    order = np.lexsort((a, c))
+    return c[order], a[order], b[order]
+
+
+def sweep_cross_points(h_y, h_lo, h_hi, v_x, v_lo, v_hi):
+    # Crossings of H stripe pieces (track y, x-span) with V stripe pieces
+    # (track x, y-span). V pieces are sorted by x once; each H piece only looks
+    # at the V pieces whose track lies inside its own x-span.
+    # -> (xs, ys) sorted row-major (y, then x), duplicates removed
+    empty = np.empty(0, dtype=np.int64)
+    if len(h_y) == 0 or len(v_x) == 0: return empty, empty
+    order = np.lexsort((v_lo, v_x))
+    vx, vlo, vhi = v_x[order], v_lo[order], v_hi[order]
+    first = np.searchsorted(vx, h_lo, 'left')
+    last = np.searchsorted(vx, h_hi, 'right')
+
+    out_x, out_y = [], []
+    for y, i, j in zip(h_y.tolist(), first.tolist(), last.tolist()):
+        if j <= i: continue
+        mask = (vlo[i:j] <= y) & (vhi[i:j] >= y)
+        if mask.any():
+            xs = vx[i:j][mask]
+            out_x.append(xs)
+            out_y.append(np.full(len(xs), y, dtype=np.int64))
+    if not out_x: return empty, empty
+
+    xs, ys = np.concatenate(out_x), np.concatenate(out_y)
+    order = np.lexsort((xs, ys))
+    xs, ys = xs[order], ys[order]
+    keep = np.ones(len(xs), dtype=bool)
+    keep[1:] = (xs[1:] != xs[:-1]) | (ys[1:] != ys[:-1])
+    return xs[keep], ys[keep]
+
+
+def interval_join(a_lo, a_hi, b_lo, b_hi):
+    # Sorted sweep join -> (ia, ib) of every pair with a positive overlap.
+    # B is sorted by start once; an A interval can only meet the B window
+    # starting in (a_lo - longest B, a_hi), found with two searchsorted
+    # calls, so the cost is O((n + m) log m + candidates).
+    a_lo = np.asarray(a_lo, dtype=np.int64); a_hi = np.asarray(a_hi, dtype=np.int64)
+    b_lo = np.asarray(b_lo, dtype=np.int64); b_hi = np.asarray(b_hi, dtype=np.int64)
+    empty = np.empty(0, dtype=np.int64)
+    if len(a_lo) == 0 or len(b_lo) == 0: return empty, empty
+    order = np.argsort(b_lo, kind='stable')
+    bs, be = b_lo[order], b_hi[order]
+    max_len = int((be - bs).max())
+    first = np.searchsorted(bs, a_lo - max_len, 'right')
+    last = np.searchsorted(bs, a_hi, 'left')
+    counts = np.maximum(last - first, 0)
+    total = int(counts.sum())
+    if total == 0: return empty, empty
+    ia = np.repeat(np.arange(len(a_lo), dtype=np.int64), counts)
+    starts = np.repeat(first - (np.cumsum(counts) - counts), counts)
+    jb = np.arange(total, dtype=np.int64) + starts
+    keep = be[jb] > a_lo[ia]
+    return ia[keep], order[jb[keep]]
+
+
+def rect_overlap_join(a, b):
+    # (n, 4) / (m, 4) [x1, y1, x2, y2] rects -> (ia, ib) of overlapping pairs.
+    # Joins on the axis where B is thinnest (the cross axis of parallel
+    # stripes, the track axis of crossing ones) and filters the other axis.
+    a = np.asarray(a, dtype=np.int64).reshape(-1, 4)
+    b = np.asarray(b, dtype=np.int64).reshape(-1, 4)
+    if len(a) == 0 or len(b) == 0: return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    bw, bh = b[:, 2] - b[:, 0], b[:, 3] - b[:, 1]
+    ax = 0 if bw.max() <= bh.max() else 1
+    ox = 1 - ax
+    ia, ib = interval_join(a[:, ax], a[:, ax + 2], b[:, ax], b[:, ax + 2])
+    keep = (np.minimum(a[ia, ox + 2], b[ib, ox + 2]) > np.maximum(a[ia, ox], b[ib, ox]))
+    return ia[keep], ib[keep]
+'''
+
+files["core/net_cache.py"] = r'''
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from collections import defaultdict
+from contextlib import contextmanager
+
+# [Incremental] Content-addressed per-net artifact cache.
+# Every artifact (generated geometry, extracted RC, formatted DSPF net block)
+# is stored under the hash of exactly the inputs it depends on, so a config
+# edit only invalidates the nets it actually touches. Stale entries are
+# simply never looked up again; delete the directory to reclaim space.
+
+CACHE_VERSION = 3
+
+
+def stable_hash(*parts):
+    blob = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()[:32]
+
+
+def geometry_key(net_cfg, die_area, layer_order, units):
+    return stable_hash('geom', CACHE_VERSION, net_cfg, die_area, layer_order, units)
+
+
+def placement_key(config_data, units):
+    # Instance pins of a net depend on the rows, i.e. on the rail layer rules
+    # of every net, not only on the net itself.
+    inst_cfg = config_data.get('instance_placement')
+    rail = inst_cfg.get('rail_layer', 'M1') if inst_cfg else None
+    rails = [(n['name'], [l for l in n.get('layers', []) if l.get('name') == rail])
+             for n in config_data.get('nets', [])]
+    return stable_hash('place', CACHE_VERSION, inst_cfg, rails, config_data.get('die_area'), units)
+
+
+def rc_key(geom_key, place_key, tech_props, layers, via_names, max_seg_len):
+    layer_props = {l: tech_props.get('layers', {}).get(l) for l in sorted(layers)}
+    via_props = {v: tech_props.get('vias', {}).get(v) for v in sorted(via_names)}
+    return stable_hash('rc', CACHE_VERSION, geom_key, place_key, layer_props, via_props, max_seg_len)
+
+
+class NetCache:
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.stats = defaultdict(lambda: [0, 0])   # kind -> [hits, misses]
+
+    def _path(self, kind, key):
+        ext = 'dspf' if kind == 'block' else 'pkl'
+        return os.path.join(self.root, kind, key[:2], f"{key}.{ext}")
+
+    def _count(self, kind, hit):
+        self.stats[kind][0 if hit else 1] += 1
+
+    def load(self, kind, key):
+        path = self._path(kind, key)
+        try:
+            with open(path, 'rb') as f:
+                obj = pickle.load(f)
+        except FileNotFoundError:
+            self._count(kind, False)
+            return None
+        except Exception as e:
+            print(f"[WARN] Cache entry unreadable, recomputing: {path} ({e})")
+            self._count(kind, False)
+            return None
+        self._count(kind, True)
+        return obj
+
+    def save(self, kind, key, obj):
+        path = self._path(kind, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    def copy_block(self, key, out_f, count=True):
+        # Splice a cached DSPF net block into an open output file
+        path = self._path('block', key)
+        try:
+            with open(path, 'r') as src:
+                shutil.copyfileobj(src, out_f, 1024 * 1024)
+        except FileNotFoundError:
+            if count: self._count('block', False)
+            return False
+        if count: self._count('block', True)
+        return True
+
+    @contextmanager
+    def block_writer(self, key):
+        path = self._path('block', key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w', buffering=1024 * 1024) as f:
+            yield f
+        os.replace(tmp, path)
+
+    def report(self):
+        parts = [f"{kind} {hit}/{hit + miss} reused" for kind, (hit, miss) in sorted(self.stats.items())]
+        if parts: print(f"[CACHE] {', '.join(parts)}")
+'''
+
+files["core/artifact.py"] = r'''
+import json
+import os
+import shutil
+import time
+import numpy as np
+from .geom_store import ColumnTable, NameTable, ViaArray, ViaPoints, WIRE_DTYPE, PIN_DTYPE, ORIENTS
+from .instance_store import InstanceStore
+
+# [Artifact] Versioned on-disk Generator result.
+# A directory of raw .npy arrays plus manifest.json. Arrays are opened with
+# mmap_mode='r', so loading costs a few file opens regardless of design size;
+# pages are faulted in only when the extractor / writers touch them.
+#
+#   manifest.json      names, die area, tech params, via descriptor table
+#   wires.npy          WIRE_DTYPE records
+#   pins.npy           PIN_DTYPE records
+#   via_xs.npy         concatenated x tracks / x positions of all via descriptors
+#   via_ys.npy         concatenated y tracks / y positions
+#   inst_<array>.npy   InstanceStore arrays (row, x, master, pin_net, per-row rails)
+
+ARTIFACT_FORMAT = "pg-generator-artifact"
+ARTIFACT_VERSION = 1
+
+
+def _records_to_array(records, dtype, nets, layers, to_row):
+    arr = np.empty(len(records), dtype=dtype)
+    for i, rec in enumerate(records):
+        arr[i] = to_row(rec, nets, layers)
+    return arr
+
+
+def _wire_row(w, nets, layers):
+    x1, y1, x2, y2 = w['rect']
+    return (x1, y1, x2, y2, w['center'], w['width'], layers.intern(w['layer']),
+            nets.intern(w['net']), ORIENTS.index(w['orient']))
+
+
+def _pin_row(p, nets, layers):
+    x1, y1, x2, y2 = p['rect']
+    return (x1, y1, x2, y2, p['pos'][0], p['pos'][1], nets.intern(p['net']), layers.intern(p['layer']))
+
+
+def save_artifact(gen, path):
+    t0 = time.time()
+    tmp = f"{path.rstrip(os.sep)}.tmp"
+    if os.path.exists(tmp): shutil.rmtree(tmp)
+    os.makedirs(tmp)
+
+    if gen.store is not None:
+        nets, layers = gen.store.nets, gen.store.layers
+        wires, pins = gen.store.wires.data, gen.store.pins.data
+    else:
+        # Dict backend: convert once to the columnar layout
+        nets, layers = NameTable(), NameTable()
+        wires = _records_to_array(gen.wires, WIRE_DTYPE, nets, layers, _wire_row)
+        pins = _records_to_array(gen.pins, PIN_DTYPE, nets, layers, _pin_row)
+    np.save(os.path.join(tmp, "wires.npy"), wires)
+    np.save(os.path.join(tmp, "pins.npy"), pins)
+
+    via_table, xs_parts, ys_parts, off_x, off_y = [], [], [], 0, 0
+    for va in gen.via_arrays:
+        kind = 'points' if isinstance(va, ViaPoints) else 'grid'
+        via_table.append([kind, va.net, va.name, va.bot_layer, off_x, len(va.xs), off_y, len(va.ys)])
+        xs_parts.append(va.xs); ys_parts.append(va.ys)
+        off_x += len(va.xs); off_y += len(va.ys)
+    empty = np.empty(0, dtype=np.int64)
+    np.save(os.path.join(tmp, "via_xs.npy"), np.concatenate(xs_parts) if xs_parts else empty)
+    np.save(os.path.join(tmp, "via_ys.npy"), np.concatenate(ys_parts) if ys_parts else empty)
+
+    inst_meta = None
+    net_conn_map = gen.net_conn_map
+    st = gen.inst_store
+    if st is None and len(gen.instances):
+        rail = gen.instances[0]['physical_pins'][0]['layer']
+        st = InstanceStore.from_records(gen.instances, rail, nets)
+        # Instance connections are re-derived from the store on load
+        net_conn_map = {net: [] for net in gen.net_conn_map}
+    if st is not None:
+        for name in InstanceStore.ARRAYS:
+            np.save(os.path.join(tmp, f"inst_{name}.npy"), getattr(st, name))
+        inst_meta = {'rail_layer': st.rail_layer, 'inst_width': int(st.inst_width),
+                     'masters': list(st.masters.names)}
+
+    manifest = {
+        'format': ARTIFACT_FORMAT, 'version': ARTIFACT_VERSION,
+        'units': gen.tech.units, 'die_area': gen.die_area, 'tech_params': gen.tech_params,
+        'nets': list(nets.names), 'layers': list(layers.names),
+        'nets_used': sorted(gen.nets_used), 'layers_used': sorted(gen.layers_used),
+        'vias_used': sorted(gen.vias_used), 'net_type_map': gen.net_type_map,
+        'net_conn_map': net_conn_map, 'net_keys': gen.net_keys,
+        'placement_key': gen.placement_key, 'vias': via_table, 'instances': inst_meta,
+    }
+    with open(os.path.join(tmp, "manifest.json"), 'w') as f:
+        json.dump(manifest, f, indent=1)
+
+    if os.path.exists(path): shutil.rmtree(path)
+    os.replace(tmp, path)
+    print(f"[ARTIFACT] Saved {path} ({time.time()-t0:.3f}s)")
+
+
+def load_artifact(path, tech):
+    from .generator import Generator
+
+    t0 = time.time()
+    with open(os.path.join(path, "manifest.json")) as f:
+        manifest = json.load(f)
+    if manifest.get('format') != ARTIFACT_FORMAT:
+        raise ValueError(f"{path} is not a generator artifact")
+    if manifest.get('version') != ARTIFACT_VERSION:
+        raise ValueError(f"Artifact version {manifest.get('version')} not supported "
+                         f"(expected {ARTIFACT_VERSION}); regenerate it")
+
+    def load(name):
+        return np.load(os.path.join(path, name), mmap_mode='r')
+
+    tech.units = manifest['units']
+    gen = Generator(tech, backend="columnar")
+    store = gen.store
+    store.nets = NameTable(manifest['nets'])
+    store.layers = NameTable(manifest['layers'])
+    store.wires = ColumnTable.from_array(load("wires.npy"))
+    store.pins = ColumnTable.from_array(load("pins.npy"))
+    gen.wires = store.wire_view()
+    gen.pins = store.pin_view()
+
+    gen.die_area = manifest['die_area']
+    gen.tech_params = manifest['tech_params']
+    gen.nets_used = set(manifest['nets_used'])
+    gen.layers_used = set(manifest['layers_used'])
+    gen.vias_used = set(manifest['vias_used'])
+    gen.net_type_map = manifest['net_type_map']
+    gen.net_conn_map = manifest['net_conn_map']
+    gen.net_keys = manifest['net_keys']
+    gen.placement_key = manifest['placement_key']
+
+    via_xs, via_ys = load("via_xs.npy"), load("via_ys.npy")
+    for kind, net, name, bot, ox, nx, oy, ny in manifest['vias']:
+        cls = ViaPoints if kind == 'points' else ViaArray
+        va = cls(net, name, bot, via_xs[ox:ox + nx], via_ys[oy:oy + ny])
+        gen.via_arrays.append(va)
+        gen.index.add_via_array(va)
+
+    _rebuild_wire_index(gen)
+
+    inst_meta = manifest.get('instances')
+    if inst_meta:
+        st = InstanceStore(inst_meta['rail_layer'], inst_meta['inst_width'], store.nets)
+        st.masters = NameTable(inst_meta['masters'])
+        for name in InstanceStore.ARRAYS:
+            setattr(st, name, load(f"inst_{name}.npy"))
+        gen.inst_store = st
+        gen.instances = st.view()
+
+    print(f"[ARTIFACT] Loaded {path}: {len(gen.wires)} Wires, {len(gen.vias)} Vias, "
+          f"{len(gen.instances)} Insts ({time.time()-t0:.3f}s)")
+    return gen
+
+
+def _rebuild_wire_index(gen):
+    data = gen.store.wires.data
+    if len(data) == 0: return
+    ids = np.arange(len(data), dtype=np.int64)
+    order = np.lexsort((ids, data['orient'], data['layer'], data['net']))
+    net, layer, orient = data['net'][order], data['layer'][order], data['orient'][order]
+    brk = np.nonzero((net[1:] != net[:-1]) | (layer[1:] != layer[:-1]) | (orient[1:] != orient[:-1]))[0] + 1
+    groups = np.split(order, brk)
+    # Register groups in generation order so per-net slices come back unchanged
+    groups.sort(key=lambda g: int(g[0]))
+    centers = data['center']
+    for g in groups:
+        first = data[g[0]]
+        gen.index.add_wires(gen.store.nets[int(first['net'])], gen.store.layers[int(first['layer'])],
+                            ORIENTS[int(first['orient'])], centers[g], 0, ids=g)
+'''
+
+files["core/parallel.py"] = r'''
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# [Parallel] Process-pool fan-out for geometry generation.
+# Work is split per (net, layer rule) for stripes and per (net, layer pair)
+# for vias. Tasks and results are plain tuples of NumPy arrays / via
+# descriptors (no per-shape dicts), and results are merged in submission
+# order, so the output is identical to the serial run for any worker count.
+
+_WORKER = None
+
+
+def _init_worker(tech, die_area, tech_params):
+    global _WORKER
+    from .generator import Generator
+    _WORKER = Generator(tech)
+    _WORKER.die_area = die_area
+    _WORKER.tech_params = tech_params
+
+
+def _rule_stripes_task(layer_rule):
+    return _WORKER._rule_stripes(layer_rule)
+
+
+def _pair_vias_task(args):
+    net_name, bot, top, bot_sets, top_sets = args
+    return _WORKER._pair_vias(net_name, bot, top, bot_sets, top_sets)
+
+
+def _chunksize(n_tasks, jobs):
+    return max(1, n_tasks // (jobs * 4))
+
+
+def parallel_net_geometry(gen, nets, sorted_layers, jobs):
+    # -> [(stripes, net_vias)] per net, same as gen._net_stripes / gen._net_vias
+    jobs = min(jobs, os.cpu_count() or 1)
+    rules = [rule for net in nets for rule in net['layers']]
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(gen.tech, gen.die_area, gen.tech_params)) as pool:
+        rule_out = list(pool.map(_rule_stripes_task, rules, chunksize=_chunksize(len(rules), jobs)))
+
+        net_stripes, pos = [], 0
+        for net in nets:
+            n = len(net['layers'])
+            net_stripes.append([s for part in rule_out[pos:pos + n] for s in part])
+            pos += n
+
+        pair_tasks, owners = [], []
+        for i, (net, stripes) in enumerate(zip(nets, net_stripes)):
+            tracks = gen._net_tracks(stripes)
+            for bot, top in gen._layer_pairs(tracks, sorted_layers):
+                pair_tasks.append((net['name'], bot, top, tracks[bot], tracks[top]))
+                owners.append(i)
+        pair_out = pool.map(_pair_vias_task, pair_tasks, chunksize=_chunksize(len(pair_tasks), jobs))
+
+        net_vias = [[] for _ in nets]
+        for i, vias in zip(owners, pair_out):
+            net_vias[i].extend(vias)
+
+    print(f"[INFO] Parallel geometry: {len(nets)} nets, {len(rules)} stripe + "
+          f"{len(pair_tasks)} via tasks on {jobs} workers")
+    return list(zip(net_stripes, net_vias))
+
+
+# [Parallel] Die-level fan-out for 3D stacks.
+# Each worker generates one die and writes it as an artifact; the parent maps
+# the artifact back (core/artifact.py) instead of unpickling the geometry, so
+# a finished die costs the parent only page-cache memory.
+
+def _generate_die_task(tech, backend, cache_root, die_name, die_cfg, out_dir):
+    from .generator import Generator
+    from .net_cache import NetCache
+    print(f"[INFO] Generating Die: {die_name}")
+    cache = NetCache(cache_root) if cache_root else None
+    gen = Generator(tech, backend=backend, cache=cache, artifact_dir=out_dir)
+    gen.run(die_cfg)
+    return die_name
+
+
+def estimate_die_bytes(die_cfg, units, backend):
+    # Rough peak footprint of one die: wires + instances (+ pins / vias as slack)
+    from .geom_store import WIRE_DTYPE
+    per_wire = WIRE_DTYPE.itemsize if backend == "columnar" else 1024
+    per_inst = 32 if backend == "columnar" else 2048
+    die = die_cfg.get('die_area') or {}
+    if not die: return 0
+    w = (die['urx'] - die['llx']) * units
+    h = (die['ury'] - die['lly']) * units
+    n_wires = 0
+    for net in die_cfg.get('nets', []):
+        for rule in net.get('layers', []):
+            pitch = max(rule.get('pitch', 1.0) * units, 1)
+            is_v = str(rule.get('direction', 'H')).upper().startswith('V')
+            n_wires += int((w if is_v else h) // pitch) + 1
+    n_inst = (die_cfg.get('instance_placement') or {}).get('count', 0)
+    return int(1.5 * (n_wires * per_wire + n_inst * per_inst))
+
+
+def parallel_die_generation(tech, backend, cache_root, dies, jobs, mem_cap_bytes=None):
+    # dies: [(die_name, die_cfg, out_dir)] -> names in completion order.
+    # Largest dies start first so the stack finishes in ~ the time of the
+    # largest die; mem_cap_bytes bounds the estimated footprint in flight
+    # (a die larger than the cap still runs, alone).
+    from concurrent.futures import wait, FIRST_COMPLETED
+    est = {name: estimate_die_bytes(cfg, tech.units, backend) for name, cfg, _ in dies}
+    pending = sorted(dies, key=lambda d: -est[d[0]])
+    jobs = max(1, min(jobs, len(dies), os.cpu_count() or 1))
+    done_names, running, in_flight = [], {}, 0
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            while pending and len(running) < jobs:
+                name, cfg, out_dir = pending[0]
+                if running and mem_cap_bytes and in_flight + est[name] > mem_cap_bytes: break
+                pending.pop(0)
+                fut = pool.submit(_generate_die_task, tech, backend, cache_root, name, cfg, out_dir)
+                running[fut] = name
+                in_flight += est[name]
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                name = running.pop(fut)
+                in_flight -= est[name]
+                fut.result()
+                done_names.append(name)
+    return done_names
+
+
+# [Parallel] Extraction fan-out: one task per track band of a (net, layer,
+# orient) wire group (see RCExtractor._process_nets_parallel). Tasks carry
+# only the band's arrays and layer constants; results come back in order.
+
+def _fracture_task(args):
+    from .extractor import fracture_wires
+    return fracture_wires(*args)
+
+
+def parallel_fracture(tasks, jobs):
+    jobs = min(jobs, os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        outs = list(pool.map(_fracture_task, tasks, chunksize=_chunksize(len(tasks), jobs)))
+    print(f"[INFO] Parallel extraction: {len(tasks)} band tasks on {jobs} workers")
+    return outs
+'''
+
+files["core/node_table.py"] = r'''
+import numpy as np
+
+# [Node Table] Dense per-net RC network.
+# Nodes are numbered 0..n-1 in (layer name, x, y) order, so every layer owns a
+# contiguous id block whose packed xy keys are sorted: a node is 8 bytes and a
+# coordinate lookup is one searchsorted inside its layer block. Resistors and
+# capacitors are parallel typed arrays indexed by node id.
+
+_HALF = 1 << 31
+_MASK32 = (1 << 32) - 1
+
+
+def pack_xy(a, b):
+    # (a, b) int pairs -> one int64 that sorts by a, then b (|a|, |b| < 2**31)
+    return (np.asarray(a, dtype=np.int64) << 32) + (np.asarray(b, dtype=np.int64) + _HALF)
+
+
+def unpack_xy(keys):
+    return keys >> 32, (keys & _MASK32) - _HALF
+
+
+def sorted_unique(keys):
+    keys = np.sort(keys)
+    if len(keys) < 2: return keys
+    keep = np.empty(len(keys), dtype=bool)
+    keep[0] = True
+    np.not_equal(keys[1:], keys[:-1], out=keep[1:])
+    return keys[keep]
+
+
+class NetRC:
+    __slots__ = ('layers', 'layer_start', 'keys', 'res_n1', 'res_n2', 'res_val',
+                 'cap_node', 'cap_val')
+
+    def __init__(self):
+        self.layers = []                                    # layer names, sorted
+        self.layer_start = np.zeros(1, dtype=np.int64)      # id block bounds per layer
+        self.keys = np.empty(0, dtype=np.int64)             # packed (x, y) per node
+        self.res_n1 = np.empty(0, dtype=np.int32)
+        self.res_n2 = np.empty(0, dtype=np.int32)
+        self.res_val = np.empty(0, dtype=np.float64)
+        self.cap_node = np.empty(0, dtype=np.int32)
+        self.cap_val = np.empty(0, dtype=np.float64)
+
+    @classmethod
+    def build(cls, r_parts, c_parts):
+        # r_parts: [(layer1, keys1, layer2, keys2, R)], c_parts: [(layer, keys, C)]
+        # with packed xy keys; every endpoint becomes a node.
+        layer_keys = {}
+        for l1, k1, l2, k2, _ in r_parts:
+            layer_keys.setdefault(l1, []).append(k1)
+            layer_keys.setdefault(l2, []).append(k2)
+        for l, k, _ in c_parts:
+            layer_keys.setdefault(l, []).append(k)
+
+        rc = cls()
+        rc.layers = sorted(layer_keys)
+        blocks = [sorted_unique(np.concatenate(layer_keys[l])) for l in rc.layers]
+        rc.layer_start = np.cumsum([0] + [len(b) for b in blocks]).astype(np.int64)
+        if blocks: rc.keys = np.concatenate(blocks)
+        layer_idx = {l: i for i, l in enumerate(rc.layers)}
+
+        def ids(layer, k):
+            i = layer_idx[layer]
+            return (np.searchsorted(blocks[i], k) + rc.layer_start[i]).astype(np.int32)
+
+        if r_parts:
+            rc.res_n1 = np.concatenate([ids(l1, k1) for l1, k1, _, _, _ in r_parts])
+            rc.res_n2 = np.concatenate([ids(l2, k2) for _, _, l2, k2, _ in r_parts])
+            rc.res_val = np.concatenate([np.asarray(v, dtype=np.float64) for _, _, _, _, v in r_parts])
+        if c_parts:
+            rc.cap_node = np.concatenate([ids(l, k) for l, k, _ in c_parts])
+            rc.cap_val = np.concatenate([np.asarray(v, dtype=np.float64) for _, _, v in c_parts])
+        return rc
+
+    @property
+    def n_nodes(self):
+        return len(self.keys)
+
+    @property
+    def n_res(self):
+        return len(self.res_val)
+
+    @property
+    def n_cap(self):
+        return len(self.cap_val)
+
+    def total_cap(self):
+        return float(self.cap_val.sum())
+
+    def node_ids(self, layer, xs, ys):
+        # -> node ids of (layer, xs[i], ys[i]); -1 where there is no node
+        xs = np.asarray(xs, dtype=np.int64)
+        out = np.full(len(xs), -1, dtype=np.int64)
+        if layer not in self.layers or len(xs) == 0: return out
+        i = self.layers.index(layer)
+        lo, hi = int(self.layer_start[i]), int(self.layer_start[i + 1])
+        block = self.keys[lo:hi]
+        k = pack_xy(xs, ys)
+        pos = np.searchsorted(block, k)
+        hit = pos < len(block)
+        hit[hit] = block[pos[hit]] == k[hit]
+        out[hit] = pos[hit] + lo
+        return out
+
+    def node_id(self, layer, x, y):
+        return int(self.node_ids(layer, [x], [y])[0])
+
+    def node_layers(self, ids):
+        # -> layer index per node id
+        return np.searchsorted(self.layer_start, ids, 'right') - 1
+
+    def coords(self, nid):
+        layer = self.layers[int(self.node_layers(nid))]
+        x, y = unpack_xy(self.keys[nid])
+        return layer, int(x), int(y)
+
+    def iter_layer_blocks(self):
+        # -> (layer, first id, xs, ys) per layer, in id order
+        for i, layer in enumerate(self.layers):
+            lo, hi = int(self.layer_start[i]), int(self.layer_start[i + 1])
+            xs, ys = unpack_xy(self.keys[lo:hi])
+            yield layer, lo, xs, ys
+
+    def nbytes(self):
+        return sum(getattr(self, a).nbytes for a in ('keys', 'res_n1', 'res_n2', 'res_val',
+                                                     'cap_node', 'cap_val'))
+'''
+
+files["core/pin_table.py"] = r'''
+import numpy as np
+from .geom_store import NameTable
+
+# [Pin Table] Instance pins / ports bucketed once per extraction.
+# One flat record per pin (owner, pin name, layer, x, y), ordered by net name,
+# then layer, then original order; a net is one contiguous slice and every
+# layer inside it one contiguous run, so cut insertion and node lookup are
+# array slices instead of a scan over all instances per net. `node` is
+# preallocated and filled per net by the extractor (-1: pin not on the net's
+# RC network). Owner / pin names stay indices until a writer formats them.
+
+
+class PinTable:
+    def __init__(self, net_names, net, layer_names, layer, xs, ys, owner, pin, owner_name, pin_names):
+        net = np.asarray(net, dtype=np.int64)
+        layer = np.asarray(layer, dtype=np.int32)
+        net_rank = np.empty(len(net_names), dtype=np.int64)
+        net_rank[np.argsort(np.array(net_names, dtype=object), kind='stable')] = np.arange(len(net_names))
+        order = np.lexsort((np.arange(len(net)), layer, net_rank[net])) if len(net) else np.empty(0, dtype=np.int64)
+
+        self.layer_names = layer_names
+        self.layer = layer[order]
+        self.xs = np.asarray(xs, dtype=np.int64)[order]
+        self.ys = np.asarray(ys, dtype=np.int64)[order]
+        self.owner = np.asarray(owner, dtype=np.int64)[order]
+        self.pin = np.asarray(pin, dtype=np.int32)[order]
+        self.node = np.full(len(order), -1, dtype=np.int32)
+        self.owner_name = owner_name        # owner index -> name
+        self.pin_names = pin_names          # pin index -> name
+
+        net = net[order]
+        brk = np.concatenate([[0], np.nonzero(net[1:] != net[:-1])[0] + 1, [len(net)]]).astype(np.int64)
+        self.net_slices = {net_names[int(net[lo])]: (int(lo), int(hi)) for lo, hi in zip(brk[:-1], brk[1:]) if hi > lo}
+
+    @classmethod
+    def from_instances(cls, gen):
+        st = gen.inst_store
+        if st is not None:
+            # Columnar placement: pins are (instance, slot) of pin_net, row-major
+            n = len(st)
+            row = np.repeat(st.row, 2)
+            slot = np.tile(np.array([0, 1]), n)
+            ys = np.where(slot == 0, st.row_y[row], st.row_top[row])
+            xs = np.repeat(st.x + st.inst_width // 2, 2)
+            net = st.pin_net.reshape(-1)
+            return cls(st.nets.names, net, [st.rail_layer], np.zeros(2 * n, dtype=np.int32), xs, ys,
+                       np.repeat(np.arange(n), 2), net, st.name, st.nets.names)
+
+        nets, layers, pins, names = NameTable(), NameTable(), NameTable(), []
+        cols = ([], [], [], [], [], [])
+        for i, inst in enumerate(gen.instances):
+            names.append(inst['name'])
+            for p in inst.get('physical_pins', []):
+                px, py = p['center']
+                for c, v in zip(cols, (nets.intern(p['net']), layers.intern(p['layer']), px, py, i,
+                                       pins.intern(p['name']))):
+                    c.append(v)
+        net, layer, xs, ys, owner, pin = cols
+        return cls(nets.names, net, layers.names, layer, xs, ys, owner, pin,
+                   names.__getitem__, pins.names)
+
+    @classmethod
+    def from_ports(cls, ports):
+        # ports: [(name, net, layer, x, y)]; the owner is the port index
+        nets, layers = NameTable(), NameTable()
+        net = [nets.intern(p[1]) for p in ports]
+        layer = [layers.intern(p[2]) for p in ports]
+        names = [p[0] for p in ports]
+        return cls(nets.names, net, layers.names, layer, [p[3] for p in ports], [p[4] for p in ports],
+                   np.arange(len(ports)), np.zeros(len(ports)), names.__getitem__, [''])
+
+    def __len__(self):
+        return len(self.node)
+
+    def net_slice(self, net):
+        return self.net_slices.get(net, (0, 0))
+
+    def layer_runs(self, net):
+        # -> (layer name, lo, hi) per layer run of `net`
+        lo, hi = self.net_slice(net)
+        if hi <= lo: return
+        layer = self.layer[lo:hi]
+        brk = np.concatenate([[0], np.nonzero(layer[1:] != layer[:-1])[0] + 1, [hi - lo]])
+        for a, b in zip(brk[:-1].tolist(), brk[1:].tolist()):
+            yield self.layer_names[int(layer[a])], lo + a, lo + b
+
+    def name(self, i):
+        return self.owner_name(int(self.owner[i]))
+
+    def pin_name(self, i):
+        return self.pin_names[int(self.pin[i])]
+'''
+
+files["core/rc_reduce.py"] = r'''
+import time
+import numpy as np
+from .node_table import NetRC
+
+# [Reduction] RC network reduction between extraction and writing.
+# Nodes are eliminated in rounds: every round picks an independent set of
+# eligible nodes (no two adjacent, pseudo-random priority so chains shrink
+# geometrically) and eliminates all of them at once with the TICER rule:
+# neighbors a, b of node n get a conductance g_a * g_b / G_n and n's cap is
+# split over its neighbors by g_k / G_n. For a degree-2 node this is the exact
+# series merge R1 + R2; parallel resistors created on the way are merged
+# (conductances add). Pin / port nodes are never eliminated.
+#
+#   series stage  degree-2 nodes (exact at DC)
+#   TICER stage   nodes with degree <= max_degree and C / G <= tau (optional)
+
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _priority(n_nodes, rnd):
+    # Bijective hash of the node id: distinct, deterministic, unordered
+    x = (np.arange(n_nodes, dtype=np.uint64) + np.uint64(rnd)) * _MIX
+    return x ^ (x >> np.uint64(29))
+
+
+class RCReducer:
+    def __init__(self, tau_ps=None, max_degree=3):
+        self.tau_ps = tau_ps
+        self.max_degree = max_degree
+        self.before = [0, 0, 0]     # nodes, R, C
+        self.after = [0, 0, 0]
+        self.seconds = 0.0
+
+    def key(self):
+        return ('reduce', self.tau_ps, self.max_degree)
+
+    def reduce(self, net_rc, inst_nodes, port_nodes):
+        # -> (reduced NetRC, inst pin node ids, port node ids) remapped
+        t0 = time.time()
+        n = net_rc.n_nodes
+        keep = np.zeros(n, dtype=bool)
+        for ids in (inst_nodes, port_nodes):
+            keep[ids[ids >= 0]] = True
+
+        n1 = net_rc.res_n1.astype(np.int64)
+        n2 = net_rc.res_n2.astype(np.int64)
+        r = net_rc.res_val.copy()
+        cap = np.bincount(net_rc.cap_node, weights=net_rc.cap_val, minlength=n)
+        live_e = np.ones(len(r), dtype=bool)
+        live_n = np.ones(n, dtype=bool)
+        state = [n1, n2, r, live_e]
+
+        self._eliminate(state, cap, keep, live_n, lambda deg, g_sum: deg == 2)
+        if self.tau_ps is not None:
+            # C [fF] / G [S] = fs
+            tau_fs = self.tau_ps * 1000.0
+            self._eliminate(state, cap, keep, live_n,
+                            lambda deg, g_sum: (deg >= 1) & (deg <= self.max_degree) & (cap <= tau_fs * g_sum))
+
+        out, id_map = self._compact(net_rc, state, cap, live_n)
+        for i, v in enumerate((net_rc.n_nodes, net_rc.n_res, net_rc.n_cap)): self.before[i] += v
+        for i, v in enumerate((out.n_nodes, out.n_res, out.n_cap)): self.after[i] += v
+        self.seconds += time.time() - t0
+
+        def remap(ids):
+            return np.where(ids >= 0, id_map[np.maximum(ids, 0)], -1).astype(np.int32)
+        return out, remap(inst_nodes), remap(port_nodes)
+
+    def _eliminate(self, state, cap, keep, live_n, eligible):
+        n_nodes = len(cap)
+        rnd = 1
+        while True:
+            n1, n2, r, live_e = state
+            e = np.nonzero(live_e)[0]
+            a, b = n1[e], n2[e]
+            deg = np.bincount(a, minlength=n_nodes) + np.bincount(b, minlength=n_nodes)
+            g = 1.0 / r[e]
+            g_sum = np.bincount(a, weights=g, minlength=n_nodes) + np.bincount(b, weights=g, minlength=n_nodes)
+            cand = eligible(deg, g_sum) & live_n & ~keep
+            if not cand.any(): return
+
+            # Edge ends touching a candidate, grouped by candidate node
+            ends = np.concatenate([a, b])
+            other = np.concatenate([b, a])
+            eidx = np.concatenate([e, e])
+            sel = cand[ends]
+            ends, other, eidx = ends[sel], other[sel], eidx[sel]
+            order = np.argsort(ends, kind='stable')
+            ends, other, eidx = ends[order], other[order], eidx[order]
+
+            # Independent set: a candidate loses to any candidate neighbor of lower priority
+            prio = _priority(n_nodes, rnd)
+            lose = cand[other] & (prio[other] < prio[ends])
+            lost = np.zeros(n_nodes, dtype=bool)
+            lost[ends[lose]] = True
+            chosen = cand & ~lost
+            pick = chosen[ends]
+            ends, other, eidx = ends[pick], other[pick], eidx[pick]
+            if len(ends) == 0: return
+
+            starts = np.nonzero(np.concatenate([[True], ends[1:] != ends[:-1]]))[0]
+            d = np.diff(np.concatenate([starts, [len(ends)]]))
+            node = ends[starts]
+            g_e = 1.0 / r[eidx]
+            g_tot = np.add.reduceat(g_e, starts)
+
+            # Capacitance to the neighbors by conductance share
+            share = cap[np.repeat(node, d)] * g_e / np.repeat(g_tot, d)
+            np.add.at(cap, other, share)
+            cap[node] = 0.0
+            live_n[node] = False
+            live_e[eidx] = False
+
+            new_a, new_b, new_r = [], [], []
+            for deg_k in np.unique(d).tolist():
+                rows = starts[d == deg_k][:, None] + np.arange(deg_k)[None, :]
+                nb, ge, rr = other[rows], g_e[rows], r[eidx[rows]]
+                gt = g_tot[d == deg_k]
+                for i in range(deg_k):
+                    for j in range(i + 1, deg_k):
+                        if deg_k == 2:
+                            val = rr[:, 0] + rr[:, 1]       # exact series merge
+                        else:
+                            val = gt / (ge[:, i] * ge[:, j])
+                        new_a.append(nb[:, i]); new_b.append(nb[:, j]); new_r.append(val)
+            if new_a:
+                na, nb_, nr = np.concatenate(new_a), np.concatenate(new_b), np.concatenate(new_r)
+                loop = na == nb_
+                na, nb_, nr = na[~loop], nb_[~loop], nr[~loop]
+                state[0] = np.concatenate([n1, na])
+                state[1] = np.concatenate([n2, nb_])
+                state[2] = np.concatenate([r, nr])
+                state[3] = np.concatenate([live_e, np.ones(len(na), dtype=bool)])
+                self._merge_parallel(state, n_nodes)
+            rnd += 1
+
+    @staticmethod
+    def _merge_parallel(state, n_nodes):
+        # Resistors between the same node pair -> one (kept at the first slot)
+        n1, n2, r, live_e = state
+        e = np.nonzero(live_e)[0]
+        a, b = n1[e], n2[e]
+        pair = np.minimum(a, b) * n_nodes + np.maximum(a, b)
+        order = np.argsort(pair, kind='stable')
+        ps = pair[order]
+        starts = np.nonzero(np.concatenate([[True], ps[1:] != ps[:-1]]))[0]
+        if len(starts) == len(e): return
+        g = np.add.reduceat(1.0 / r[e[order]], starts)
+        first = e[order[starts]]
+        live_e[e] = False
+        live_e[first] = True
+        r[first] = 1.0 / g
+
+    @staticmethod
+    def _compact(net_rc, state, cap, live_n):
+        n1, n2, r, live_e = state
+        kept = np.nonzero(live_n)[0]
+        id_map = np.full(len(live_n), -1, dtype=np.int64)
+        id_map[kept] = np.arange(len(kept))
+
+        out = NetRC()
+        layer_of = net_rc.node_layers(kept)
+        counts = np.bincount(layer_of, minlength=len(net_rc.layers))
+        present = [i for i, c in enumerate(counts) if c]
+        out.layers = [net_rc.layers[i] for i in present]
+        out.layer_start = np.cumsum([0] + [int(counts[i]) for i in present]).astype(np.int64)
+        out.keys = net_rc.keys[kept]
+        e = np.nonzero(live_e)[0]
+        out.res_n1 = id_map[n1[e]].astype(np.int32)
+        out.res_n2 = id_map[n2[e]].astype(np.int32)
+        out.res_val = r[e]
+        c_ids = kept[cap[kept] != 0]
+        out.cap_node = id_map[c_ids].astype(np.int32)
+        out.cap_val = cap[c_ids]
+        return out, id_map
+
+    def report(self):
+        (n0, r0, c0), (n1, r1, c1) = self.before, self.after
+        ratio = (n0 + r0 + c0) / max(1, n1 + r1 + c1)
+        print(f"[REDUCE] Nodes {n0} -> {n1}, R {r0} -> {r1}, C {c0} -> {c1} "
+              f"({ratio:.1f}x fewer elements, {self.seconds:.2f}s)")
+'''
+
+files["core/ir_drop.py"] = r'''
+import time
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+from scipy.sparse.linalg import LinearOperator, cg
+
+# [IR] Static IR drop on the extracted RC network.
+# Per net, the conductance matrix is assembled straight from the NetRC
+# resistor arrays. Ports are ideal sources (drop 0), so their rows / columns
+# are eliminated and the remaining SPD system L d = I is solved with
+# Jacobi-preconditioned CG. Nodes without a path to a port (floating
+# islands) are left out and reported.
+
+
+class NetSystem:
+    # Grounded conductance matrix of one net: rows are the `free` nodes
+    # (connected to a port, not a port themselves)
+    def __init__(self, net_rc, fixed_nodes):
+        n = net_rc.n_nodes
+        i = net_rc.res_n1.astype(np.int64)
+        j = net_rc.res_n2.astype(np.int64)
+        g = 1.0 / net_rc.res_val
+        fixed = np.zeros(n, dtype=bool)
+        fixed[fixed_nodes] = True
+
+        adj = sp.csr_matrix((np.ones(len(g)), (i, j)), shape=(n, n))
+        _, labels = connected_components(adj, directed=False)
+        live = np.isin(labels, labels[fixed])
+        self.free = live & ~fixed
+        self.fixed = fixed
+        self.row = np.full(n, -1, dtype=np.int64)
+        self.row[self.free] = np.arange(int(self.free.sum()))
+
+        diag = np.bincount(i, weights=g, minlength=n) + np.bincount(j, weights=g, minlength=n)
+        both = self.free[i] & self.free[j]
+        ri, rj, k = self.row[i[both]], self.row[j[both]], int(self.free.sum())
+        self.diag = diag[self.free]
+        # Parallel resistors are summed by the COO -> CSR conversion
+        self.matrix = sp.coo_matrix((np.concatenate([-g[both], -g[both], self.diag]),
+                                     (np.concatenate([ri, rj, np.arange(k)]),
+                                      np.concatenate([rj, ri, np.arange(k)]))), shape=(k, k)).tocsr()
+        self.iterations = 0
+
+    @property
+    def size(self):
+        return self.matrix.shape[0]
+
+    def rhs(self, nodes, values):
+        # Node-indexed injections -> free-row vector (injections at ports / floating nodes drop out)
+        b = np.zeros(self.size)
+        rows = self.row[nodes]
+        ok = rows >= 0
+        np.add.at(b, rows[ok], np.asarray(values, dtype=np.float64)[ok])
+        return b
+
+    def solve(self, b, tol=1e-8, max_iter=20000):
+        # Jacobi-preconditioned CG; -> solution on the free rows
+        if self.size == 0: return np.zeros(0)
+        inv_diag = 1.0 / self.diag
+        precond = LinearOperator(self.matrix.shape, matvec=lambda x: inv_diag * x, dtype=np.float64)
+        count = [0]
+
+        def step(_): count[0] += 1
+        x, info = cg(self.matrix, b, rtol=tol, maxiter=max_iter, M=precond, callback=step)
+        self.iterations += count[0]
+        if info > 0:
+            print(f"[WARN] CG did not converge in {max_iter} iterations")
+        return x
+
+    def to_nodes(self, x, fill=np.nan):
+        # Free-row solution -> per-node array (ports 0, floating nodes `fill`)
+        out = np.full(len(self.row), fill)
+        out[self.fixed] = 0.0
+        out[self.free] = x
+        return out
+
+
+class IRDropAnalyzer:
+    def __init__(self, extractor, config):
+        self.ext = extractor
+        opts = config.get('ir_drop', {})
+        self.pin_current = float(opts.get('pin_current_ma', 0.01)) / 1000.0
+        self.net_current = {n: float(v) / 1000.0 for n, v in opts.get('net_current_ma', {}).items()}
+        self.supply = {n: float(v) for n, v in opts.get('supply_v', {}).items()}
+        self.tol = float(opts.get('tol', 1e-8))
+        self.max_iter = int(opts.get('max_iter', 20000))
+        self.report_top = int(opts.get('report_top', 20))
+        self.map_bins = int(opts.get('map_bins', 16))
+        self.results = {}
+
+    def run(self):
+        print("[IR] Starting static IR drop analysis...")
+        for net in sorted(self.ext.net_data):
+            res = self._analyze_net(net, self.ext.net_data[net])
+            if res is not None: self.results[net] = res
+
+    def _pin_currents(self, net):
+        # -> (pin table rows on the RC network, current per pin [A])
+        pins = self.ext.inst_pins
+        lo, hi = pins.net_slice(net)
+        rows = lo + np.nonzero(pins.node[lo:hi] >= 0)[0]
+        if net in self.net_current and len(rows):
+            return rows, np.full(len(rows), self.net_current[net] / len(rows))
+        return rows, np.full(len(rows), self.pin_current)
+
+    def _analyze_net(self, net, net_rc):
+        t0 = time.time()
+        ports = self.ext.port_pins
+        lo, hi = ports.net_slice(net)
+        port_nodes = ports.node[lo:hi]
+        port_nodes = port_nodes[port_nodes >= 0]
+        if len(port_nodes) == 0:
+            print(f"[WARN] IR: net {net} has no ports on its RC network, skipped")
+            return None
+
+        system = NetSystem(net_rc, port_nodes)
+        rows, amps = self._pin_currents(net)
+        nodes = self.ext.inst_pins.node[rows]
+        drop = system.to_nodes(system.solve(system.rhs(nodes, amps), self.tol, self.max_iter))
+        pin_drop = drop[nodes]
+        floating = int(np.isnan(pin_drop).sum())
+        if floating:
+            print(f"[WARN] IR: net {net}: {floating} pins have no path to a port (excluded)")
+
+        res = {'drop': drop, 'pin_rows': rows, 'pin_drop': pin_drop, 'floating_pins': floating,
+               'current': float(amps[~np.isnan(pin_drop)].sum()), 'iterations': system.iterations,
+               'seconds': time.time() - t0}
+        self._print_summary(net, res)
+        return res
+
+    def _print_summary(self, net, res):
+        pd = res['pin_drop']
+        valid = ~np.isnan(pd)
+        if not valid.any():
+            print(f"[IR] {net}: no connected pins")
+            return
+        k = int(np.nanargmax(pd))
+        pins = self.ext.inst_pins
+        r = int(res['pin_rows'][k])
+        worst_mv = pd[k] * 1000.0
+        supply = self.supply.get(net)
+        pct = f" ({100.0 * pd[k] / supply:.2f}% of {supply:g} V)" if supply else ""
+        print(f"[IR] {net}: {int(valid.sum())} pins, {res['current'] * 1000:.3f} mA, "
+              f"worst {worst_mv:.4f} mV at {pins.name(r)}:{pins.pin_name(r)}{pct}, "
+              f"mean {np.nanmean(pd) * 1000:.4f} mV, CG {res['iterations']} it ({res['seconds']:.2f}s)")
+
+    def worst_pins(self, net, count=None):
+        # -> [(inst, pin, drop V, x, y)] worst first
+        res = self.results[net]
+        pd = res['pin_drop']
+        order = np.argsort(-np.nan_to_num(pd, nan=-np.inf), kind='stable')[:count or self.report_top]
+        pins = self.ext.inst_pins
+        out = []
+        for k in order.tolist():
+            if np.isnan(pd[k]): break
+            r = int(res['pin_rows'][k])
+            out.append((pins.name(r), pins.pin_name(r), float(pd[k]), int(pins.xs[r]), int(pins.ys[r])))
+        return out
+
+    def layer_map(self, net, bins=None):
+        # -> {layer: (max drop grid [bins_y, bins_x] in V, NaN where empty, (x0, y0, x1, y1))}
+        bins = bins or self.map_bins
+        net_rc = self.ext.net_data[net]
+        drop = self.results[net]['drop']
+        out = {}
+        for layer, first, xs, ys in net_rc.iter_layer_blocks():
+            d = drop[first:first + len(xs)]
+            ok = ~np.isnan(d)
+            if not ok.any(): continue
+            xs, ys, d = xs[ok], ys[ok], d[ok]
+            x0, x1, y0, y1 = int(xs.min()), int(xs.max()), int(ys.min()), int(ys.max())
+            bx = np.minimum((xs - x0) * bins // max(1, x1 - x0 + 1), bins - 1)
+            by = np.minimum((ys - y0) * bins // max(1, y1 - y0 + 1), bins - 1)
+            grid = np.full(bins * bins, -np.inf)
+            np.maximum.at(grid, by * bins + bx, d)
+            grid[np.isinf(grid)] = np.nan
+            out[layer] = (grid.reshape(bins, bins), (x0, y0, x1, y1))
+        return out
+'''
+
+files["core/ir_transient.py"] = r'''
+import re
+import time
+import fnmatch
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import LinearOperator, cg, splu
+from .ir_drop import NetSystem
+
+# [IR] Transient (dynamic) IR drop on the extracted RC network.
+# Same grounded system as the static analysis (ports = ideal sources, drop d
+# on the free nodes) plus the extracted node capacitance:
+#
+#   C dd/dt + G d = I(t)
+#   backward Euler  (G + C/h) d1 = C/h d0 + I1
+#   trapezoidal     (G + 2C/h) d1 = (2C/h - G) d0 + I0 + I1
+#
+# h is fixed, so the step matrix is built once per net: factorized once
+# (SuperLU, symmetric mode) up to direct_max_nodes free nodes, otherwise
+# its Jacobi preconditioner is built once and every step is warm-started
+# from the previous solution. Pin currents come from PWL waveforms assigned
+# to instances by name pattern and are evaluated for all pins of a waveform
+# in one vectorized call per step.
+
+DEFAULT_WAVEFORM = {'peak_ma': 0.05, 'rise_ps': 20.0, 'fall_ps': 80.0, 'period_ps': 500.0}
+
+
+class Waveform:
+    # Piecewise-linear current [A] over time [ps]; held at the end values, optionally periodic
+    def __init__(self, name, spec):
+        self.name = name
+        if 'pwl' in spec:
+            pts = np.asarray(spec['pwl'], dtype=np.float64).reshape(-1, 2)
+        else:
+            t0 = float(spec.get('delay_ps', 0.0))
+            rise, fall = float(spec.get('rise_ps', 20.0)), float(spec.get('fall_ps', 80.0))
+            pts = np.array([[t0, 0.0], [t0 + rise, float(spec.get('peak_ma', 0.05))], [t0 + rise + fall, 0.0]])
+        self.t = pts[:, 0]
+        self.i = pts[:, 1] / 1000.0
+        self.period = float(spec['period_ps']) if spec.get('period_ps') else None
+
+    def at(self, t):
+        t = np.asarray(t, dtype=np.float64)
+        if self.period: t = np.mod(t, self.period)
+        return np.interp(t, self.t, self.i)
+
+
+class StepSolver:
+    # Solves the constant step matrix: one factorization, or one preconditioner + warm-started CG
+    def __init__(self, matrix, direct, tol, max_iter):
+        self.matrix = matrix
+        self.tol, self.max_iter = tol, max_iter
+        self.iterations = 0
+        self.lu = None
+        t0 = time.time()
+        if direct and matrix.shape[0]:
+            self.lu = splu(matrix.tocsc(), permc_spec='MMD_AT_PLUS_A', diag_pivot_thresh=0.0,
+                           options=dict(SymmetricMode=True))
+        else:
+            inv_diag = 1.0 / matrix.diagonal()
+            self.precond = LinearOperator(matrix.shape, matvec=lambda x: inv_diag * x, dtype=np.float64)
+        self.setup_seconds = time.time() - t0
+
+    @property
+    def kind(self):
+        return 'direct' if self.lu is not None else 'pcg'
+
+    def solve(self, b, x0):
+        if self.lu is not None: return self.lu.solve(b)
+        if not b.any(): return np.zeros_like(b)
+        count = [0]
+
+        def step(_): count[0] += 1
+        x, info = cg(self.matrix, b, x0=x0, rtol=self.tol, maxiter=self.max_iter, M=self.precond, callback=step)
+        self.iterations += count[0]
+        if info > 0:
+            print(f"[WARN] Transient CG did not converge in {self.max_iter} iterations")
+        return x
+
+
+class TransientIRAnalyzer:
+    def __init__(self, extractor, config):
+        self.ext = extractor
+        opts = config.get('ir_transient', {})
+        self.dt = float(opts.get('dt_ps', 10.0))
+        self.t_stop = float(opts.get('t_stop_ps', 1000.0))
+        self.method = opts.get('method', 'trap').lower()
+        if self.method not in ('be', 'trap'):
+            print(f"[WARN] Unknown transient method '{self.method}', using trap")
+            self.method = 'trap'
+        self.pin_decap = float(opts.get('pin_decap_ff', 0.0))
+        self.direct_max = int(opts.get('direct_max_nodes', 300000))
+        self.tol = float(opts.get('tol', 1e-8))
+        self.max_iter = int(opts.get('max_iter', 20000))
+        self.report_top = int(opts.get('report_top', 20))
+
+        specs = opts.get('waveforms') or {'default': DEFAULT_WAVEFORM}
+        self.waveforms = [Waveform(name, spec) for name, spec in specs.items()]
+        wave_id = {w.name: k for k, w in enumerate(self.waveforms)}
+        default = opts.get('default_waveform', 'default' if 'default' in wave_id else self.waveforms[0].name)
+        # (compiled pattern, waveform id, scale, skew) -- first match wins, then the default waveform
+        self.rules = []
+        for rule in opts.get('instances', []):
+            if rule.get('waveform') not in wave_id:
+                print(f"[WARN] Transient rule {rule.get('match')}: unknown waveform {rule.get('waveform')}, skipped")
+                continue
+            self.rules.append((re.compile(fnmatch.translate(rule.get('match', '*'))), wave_id[rule['waveform']],
+                               float(rule.get('scale', 1.0)), float(rule.get('skew_ps', 0.0))))
+        if default is not None and default in wave_id:
+            self.rules.append((None, wave_id[default], float(opts.get('default_scale', 1.0)),
+                               float(opts.get('default_skew_ps', 0.0))))
+        self.times = np.arange(1, int(np.ceil(self.t_stop / self.dt - 1e-9)) + 1) * self.dt
+        self.results = {}
+
+    def run(self):
+        print(f"[IR] Starting transient IR drop analysis ({self.method}, dt {self.dt:g} ps, "
+              f"{len(self.times)} steps, {len(self.waveforms)} waveforms)...")
+        for net in sorted(self.ext.net_data):
+            self._analyze_net(net, self.ext.net_data[net])
+
+    def _pin_sources(self, rows):
+        # -> (waveform id (-1: no current), scale, delay [ps]) per pin row
+        owners = self.ext.inst_pins.owner[rows]
+        wave = np.full(len(rows), -1, dtype=np.int64)
+        scale = np.zeros(len(rows))
+        delay = np.zeros(len(rows))
+        uniq, inv = np.unique(owners, return_inverse=True)
+        todo = np.ones(len(uniq), dtype=bool)
+        names = None
+        for pattern, wid, s, skew in self.rules:
+            if pattern is None:
+                hit = todo.copy()
+            else:
+                if names is None: names = [self.ext.inst_pins.owner_name(int(o)) for o in uniq.tolist()]
+                hit = todo & np.array([pattern.match(n) is not None for n in names], dtype=bool)
+            todo &= ~hit
+            m = hit[inv]
+            wave[m], scale[m] = wid, s
+            if skew:
+                # Deterministic per-instance phase in [0, skew)
+                delay[m] = np.mod(owners[m] * 0.6180339887498949, 1.0) * skew
+        return wave, scale, delay
+
+    def _currents(self, t, wave, scale, delay, groups):
+        cur = np.zeros(len(wave))
+        for wid, m in groups:
+            cur[m] = scale[m] * self.waveforms[wid].at(t - delay[m])
+        return cur
+
+    def _analyze_net(self, net, net_rc):
+        t0 = time.time()
+        ports = self.ext.port_pins
+        lo, hi = ports.net_slice(net)
+        port_nodes = ports.node[lo:hi]
+        port_nodes = port_nodes[port_nodes >= 0]
+        if len(port_nodes) == 0:
+            print(f"[WARN] IR: net {net} has no ports on its RC network, skipped")
+            return
+
+        system = NetSystem(net_rc, port_nodes)
+        pins = self.ext.inst_pins
+        plo, phi = pins.net_slice(net)
+        rows = plo + np.nonzero(pins.node[plo:phi] >= 0)[0]
+        prow = system.row[pins.node[rows]]
+        on = prow >= 0
+        wave, scale, delay = self._pin_sources(rows)
+        wave[~on] = -1
+        groups = [(wid, np.nonzero(wave == wid)[0]) for wid in np.unique(wave[wave >= 0]).tolist()]
+        src = prow[on]
+
+        def inject(cur):
+            return np.bincount(src, weights=cur[on], minlength=system.size)
+
+        # Node capacitance [fF] on the free rows (+ optional decap per pin) -> C/h [S]
+        cap = np.bincount(net_rc.cap_node, weights=net_rc.cap_val, minlength=net_rc.n_nodes)[system.free]
+        if self.pin_decap: np.add.at(cap, src, self.pin_decap)
+        c_h = cap * 1e-3 / self.dt * (2.0 if self.method == 'trap' else 1.0)
+        solver = StepSolver(system.matrix + sp.diags(c_h), system.size <= self.direct_max, self.tol, self.max_iter)
+
+        i_prev = inject(self._currents(0.0, wave, scale, delay, groups))
+        d = system.solve(i_prev, self.tol, self.max_iter) if i_prev.any() else np.zeros(system.size)
+        peak = np.where(on, 0.0, np.nan)
+        peak_t = np.zeros(len(rows))
+        trace = np.zeros(len(self.times))
+        for k, t in enumerate(self.times.tolist()):
+            i_now = inject(self._currents(t, wave, scale, delay, groups))
+            if self.method == 'trap':
+                b = c_h * d - system.matrix @ d + i_prev + i_now
+            else:
+                b = c_h * d + i_now
+            d = solver.solve(b, d)
+            i_prev = i_now
+            pd = d[src]
+            up = pd > peak[on]
+            idx = np.nonzero(on)[0][up]
+            peak[idx], peak_t[idx] = pd[up], t
+            trace[k] = pd.max() if len(pd) else 0.0
+
+        at_port = system.fixed[pins.node[rows]]
+        peak[at_port] = 0.0
+        floating = int((~on & ~at_port).sum())
+        if floating:
+            print(f"[WARN] IR: net {net}: {floating} pins have no path to a port (excluded)")
+        res = {'pin_rows': rows, 'pin_peak': peak, 'pin_peak_t': peak_t, 'trace': trace,
+               'floating_pins': floating, 'solver': solver.kind, 'setup_seconds': solver.setup_seconds,
+               'iterations': system.iterations + solver.iterations, 'seconds': time.time() - t0}
+        self.results[net] = res
+        self._print_summary(net, res)
+
+    def _print_summary(self, net, res):
+        top = self.worst_instances(net, 1)
+        if not top:
+            print(f"[IR] {net}: no connected pins")
+            return
+        inst, pin, drop, t, _, _ = top[0]
+        it = f", CG {res['iterations']} it" if res['iterations'] else ""
+        print(f"[IR] {net}: peak {drop * 1000:.4f} mV at {inst}:{pin} (t={t:g} ps), "
+              f"{res['solver']} setup {res['setup_seconds']:.2f}s{it} ({res['seconds']:.2f}s)")
+
+    def instance_peaks(self, net):
+        # -> (pin table rows, peak drop V, time ps) with one row per instance (its worst pin), worst first
+        res = self.results[net]
+        pk = res['pin_peak']
+        order = np.argsort(-np.nan_to_num(pk, nan=-np.inf), kind='stable')
+        order = order[~np.isnan(pk[order])]
+        owners = self.ext.inst_pins.owner[res['pin_rows'][order]]
+        _, first = np.unique(owners, return_index=True)
+        order = order[np.sort(first)]
+        return res['pin_rows'][order], pk[order], res['pin_peak_t'][order]
+
+    def worst_instances(self, net, count=None):
+        # -> [(inst, pin, peak drop V, time ps, x, y)] worst first
+        rows, pk, tt = self.instance_peaks(net)
+        pins = self.ext.inst_pins
+        n = count or self.report_top
+        return [(pins.name(r), pins.pin_name(r), float(p), float(t), int(pins.xs[r]), int(pins.ys[r]))
+                for r, p, t in zip(rows[:n].tolist(), pk[:n].tolist(), tt[:n].tolist())]
+'''
+
+files["core/eff_res.py"] = r'''
+import time
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+from scipy.sparse.linalg import splu
+from .node_table import unpack_xy
+
+# [EffRes] Point-to-point effective resistance on one net's resistor network.
+# Every connected component is grounded at its lowest node id, which leaves a
+# block-diagonal SPD system L x = b. For a pair (a, b) the column b = e_a - e_b
+# gives R_ab = x_a - x_b. The system is factorized once per net and kept;
+# batches of queries are solved as blocks of right-hand sides, as many
+# columns at a time as fit in mem_mb.
+#
+# The factorization uses a geometric nested-dissection order (recursive
+# median bisection of the node coordinates, the nodes on cut edges last),
+# which keeps the fill near-linear on grid-like power nets; SuperLU's own
+# minimum-degree order was 40x slower on a 276k-node net. Only above
+# direct_max_nodes (or when the factor does not fit in memory) is block CG
+# used, preconditioned by a two-grid V-cycle (damped Jacobi around an exact
+# solve on geometric aggregates of ~agg_nodes nodes), with converged columns
+# dropped as it goes.
+
+ND_LEAF = 64
+SMOOTH_OMEGA = 2.0 / 3.0
+
+
+def nested_dissection(matrix, xs, ys, leaf=ND_LEAF):
+    # -> fill-reducing permutation of a symmetric matrix with node coordinates (xs, ys)
+    n = matrix.shape[0]
+    coo = matrix.tocoo()
+    upper = coo.row < coo.col
+    ei, ej = coo.row[upper], coo.col[upper]
+    part = np.zeros(n, dtype=np.int64)      # bisection path of every node
+    depth = np.full(n, -1, dtype=np.int64)  # level a separator node was taken out at
+    active = np.ones(n, dtype=bool)
+    level = 0
+    while True:
+        idx = np.nonzero(active)[0]
+        cnt = np.bincount(part[idx])
+        idx = idx[cnt[part[idx]] > leaf]
+        if len(idx) == 0: break
+        # Split every large part at the median of its longer side
+        p = part[idx]
+        lo_x, hi_x = np.full(len(cnt), np.inf), np.full(len(cnt), -np.inf)
+        lo_y, hi_y = lo_x.copy(), hi_x.copy()
+        np.minimum.at(lo_x, p, xs[idx]); np.maximum.at(hi_x, p, xs[idx])
+        np.minimum.at(lo_y, p, ys[idx]); np.maximum.at(hi_y, p, ys[idx])
+        coord = np.where((hi_x - lo_x)[p] >= (hi_y - lo_y)[p], xs[idx], ys[idx])
+        order = np.lexsort((coord, p))
+        idx, p = idx[order], p[order]
+        rank = np.arange(len(idx)) - np.searchsorted(p, p, 'left')
+        child = part.copy()
+        child[idx] = p * 2 + (rank >= cnt[p] // 2)
+        # Separator: the child-0 end of every edge cut inside a part
+        split = np.zeros(n, dtype=bool)
+        split[idx] = True
+        cut = split[ei] & split[ej] & (part[ei] == part[ej]) & (child[ei] != child[ej])
+        sep = np.unique(np.where(child[ei[cut]] % 2 == 0, ei[cut], ej[cut]))
+        small = active & ~split
+        part[idx] = child[idx]
+        part[small] *= 2
+        depth[sep] = level
+        active[sep] = False
+        part[sep] //= 2
+        level += 1
+    # Post-order: children before their separator, deeper separators first
+    lvl = np.where(depth >= 0, depth, level)
+    key = (part << (level - lvl)) | ((1 << (level - lvl)) - 1)
+    return np.lexsort((-np.where(depth >= 0, depth, level + 1), key))
+
+
+class ResistanceSolver:
+    def __init__(self, net_rc, direct_max_nodes=1000000, tol=1e-10, max_iter=20000, agg_nodes=16):
+        n = net_rc.n_nodes
+        i = net_rc.res_n1.astype(np.int64)
+        j = net_rc.res_n2.astype(np.int64)
+        g = 1.0 / net_rc.res_val
+        self.tol, self.max_iter = tol, max_iter
+        t0 = time.time()
+
+        adj = sp.csr_matrix((np.ones(len(g)), (i, j)), shape=(n, n))
+        _, self.labels = connected_components(adj, directed=False)
+        _, ground = np.unique(self.labels, return_index=True)
+        free = np.ones(n, dtype=bool)
+        free[ground] = False
+        self.row = np.full(n, -1, dtype=np.int64)
+        self.row[free] = np.arange(int(free.sum()))
+
+        k = int(free.sum())
+        diag = (np.bincount(i, weights=g, minlength=n) + np.bincount(j, weights=g, minlength=n))[free]
+        both = free[i] & free[j]
+        ri, rj = self.row[i[both]], self.row[j[both]]
+        self.matrix = sp.coo_matrix((np.concatenate([-g[both], -g[both], diag]),
+                                     (np.concatenate([ri, rj, np.arange(k)]),
+                                      np.concatenate([rj, ri, np.arange(k)]))), shape=(k, k)).tocsr()
+        xs, ys = unpack_xy(net_rc.keys[free])
+        xs, ys = xs.astype(np.float64), ys.astype(np.float64)
+        self.lu = None
+        if 0 < k <= direct_max_nodes:
+            try:
+                self.perm = nested_dissection(self.matrix, xs, ys)
+                self.lu = self._factor(self.matrix, self.perm)
+            except MemoryError:
+                print(f"[WARN] EffRes: factorization of {k} nodes out of memory, using block CG")
+        if self.lu is None and k:
+            self._build_coarse(xs, ys, self.labels[free], agg_nodes)
+        self.setup_seconds = time.time() - t0
+        self.solves = 0
+        self.iterations = 0
+
+    @staticmethod
+    def _factor(matrix, perm):
+        return splu(matrix[perm][:, perm].tocsc(), permc_spec='NATURAL', diag_pivot_thresh=0.0,
+                    options=dict(SymmetricMode=True))
+
+    def _build_coarse(self, xs, ys, labels, agg_nodes):
+        # Coarse level: aggregates of one component's nodes in ~agg_nodes-node
+        # cells of a square grid, factorized like the direct path
+        k = self.matrix.shape[0]
+        self.inv_diag = 1.0 / self.matrix.diagonal()
+        cells = max(1, int(np.sqrt(k / max(1, agg_nodes))))
+        bx = np.minimum((xs - xs.min()) * cells // (np.ptp(xs) + 1), cells - 1).astype(np.int64)
+        by = np.minimum((ys - ys.min()) * cells // (np.ptp(ys) + 1), cells - 1).astype(np.int64)
+        _, agg = np.unique(np.stack([labels, by * cells + bx]), axis=1, return_inverse=True)
+        agg = agg.reshape(-1)
+        self.prolong = sp.csr_matrix((np.ones(k), (np.arange(k), agg)), shape=(k, int(agg.max()) + 1))
+        self.restrict = self.prolong.T.tocsr()
+        coarse = (self.restrict @ self.matrix @ self.prolong).tocsr()
+        size = np.bincount(agg)
+        cx, cy = np.bincount(agg, weights=xs) / size, np.bincount(agg, weights=ys) / size
+        self.coarse_perm = nested_dissection(coarse, cx, cy)
+        self.coarse_lu = self._factor(coarse, self.coarse_perm)
+
+    @property
+    def kind(self):
+        return 'direct' if self.lu is not None else 'pcg'
+
+    def block_size(self, mem_mb, block):
+        # Columns per solve so that the dense blocks stay within mem_mb
+        # (B and X for a direct solve, ~10 arrays of that shape for block CG)
+        arrays = 2 if self.lu is not None else 10
+        fit = int(mem_mb * 1024 * 1024) // max(1, self.matrix.shape[0] * 8 * arrays)
+        return max(1, min(block, fit))
+
+    def solve(self, B):
+        # Multi-RHS solve: B is [size, k]
+        self.solves += B.shape[1]
+        if self.lu is not None:
+            X = np.empty_like(B)
+            X[self.perm] = self.lu.solve(B[self.perm])
+            return X
+        return self._block_pcg(B)
+
+    def _coarse_solve(self, R):
+        Rc = np.asarray(self.restrict @ R)
+        Y = np.empty_like(Rc)
+        Y[self.coarse_perm] = self.coarse_lu.solve(Rc[self.coarse_perm])
+        return self.prolong @ Y
+
+    def _precondition(self, R):
+        # Symmetric two-grid V-cycle: damped Jacobi, coarse correction, damped Jacobi
+        D = SMOOTH_OMEGA * self.inv_diag[:, None]
+        Z = D * R
+        Z += self._coarse_solve(R - self.matrix @ Z)
+        Z += D * (R - self.matrix @ Z)
+        return Z
+
+    def _block_pcg(self, B):
+        # PCG on all columns at once (one sparse product per iteration, per-column
+        # step sizes); once a quarter of the running columns has converged they
+        # are written out and dropped from the iteration
+        A = self.matrix
+        X = np.zeros_like(B)
+        cols = np.arange(B.shape[1])
+        Xa = np.zeros_like(B)
+        R = B.copy()
+        Z = self._precondition(R)
+        P = Z.copy()
+        rz = np.einsum('ij,ij->j', R, Z)
+        stop = (self.tol * np.linalg.norm(B, axis=0)) ** 2
+        for it in range(1, self.max_iter + 1):
+            AP = A @ P
+            pap = np.einsum('ij,ij->j', P, AP)
+            alpha = np.divide(rz, pap, out=np.zeros_like(rz), where=pap > 0)
+            Xa += P * alpha
+            R -= AP * alpha
+            done = np.einsum('ij,ij->j', R, R) <= stop
+            if done.all(): break
+            if 4 * done.sum() >= len(cols):
+                X[:, cols[done]] = Xa[:, done]
+                keep = ~done
+                cols, Xa, R, P, rz, stop = cols[keep], Xa[:, keep], R[:, keep], P[:, keep], rz[keep], stop[keep]
+            Z = self._precondition(R)
+            rz_new = np.einsum('ij,ij->j', R, Z)
+            P = Z + P * np.divide(rz_new, rz, out=np.zeros_like(rz), where=rz > 0)
+            rz = rz_new
+        else:
+            print(f"[WARN] EffRes: block CG did not converge in {self.max_iter} iterations")
+        X[:, cols] = Xa
+        self.iterations += it
+        return X
+
+    def query(self, nodes_a, nodes_b, block=256, mem_mb=256):
+        # -> R [ohm] per pair (0 for a == b, inf across components)
+        a, b = np.broadcast_arrays(np.asarray(nodes_a, dtype=np.int64), np.asarray(nodes_b, dtype=np.int64))
+        out = np.full(len(a), np.inf)
+        out[a == b] = 0.0
+        todo = (a != b) & (self.labels[a] == self.labels[b])
+        pair = np.stack([np.minimum(a[todo], b[todo]), np.maximum(a[todo], b[todo])], axis=1)
+        uniq, inv = np.unique(pair, axis=0, return_inverse=True)
+        ra, rb = self.row[uniq[:, 0]], self.row[uniq[:, 1]]
+        vals = np.empty(len(uniq))
+        block = self.block_size(mem_mb, block)
+        for lo in range(0, len(uniq), block):
+            hi = min(lo + block, len(uniq))
+            cols = np.arange(hi - lo)
+            B = np.zeros((self.matrix.shape[0], hi - lo))
+            pa, pb = ra[lo:hi], rb[lo:hi]
+            B[pa[pa >= 0], cols[pa >= 0]] = 1.0
+            B[pb[pb >= 0], cols[pb >= 0]] = -1.0
+            X = self.solve(B)
+            xa = np.where(pa >= 0, X[np.maximum(pa, 0), cols], 0.0)
+            xb = np.where(pb >= 0, X[np.maximum(pb, 0), cols], 0.0)
+            vals[lo:hi] = xa - xb
+        out[todo] = vals[inv.reshape(-1)]
+        return out
+
+
+def pin_port_resistance(extractor, net, neighbors=8):
+    # Instance pins of `net` -> (pin rows, nearest port row (-1: none), R to it [ohm])
+    # Nearest is by distance among the ports on the same RC component: the closest
+    # `neighbors` ports first, then all ports of the component for pins still without one
+    from scipy.spatial import cKDTree
+    pins, ports = extractor.inst_pins, extractor.port_pins
+    lo, hi = pins.net_slice(net)
+    rows = lo + np.nonzero(pins.node[lo:hi] >= 0)[0]
+    plo, phi = ports.net_slice(net)
+    prow = plo + np.nonzero(ports.node[plo:phi] >= 0)[0]
+    port_of = np.full(len(rows), -1, dtype=np.int64)
+    if len(rows) == 0 or len(prow) == 0:
+        return rows, port_of, np.full(len(rows), np.inf)
+
+    solver = extractor.resistance_solver(net)
+    k = min(neighbors, len(prow))
+    _, near = cKDTree(np.stack([ports.xs[prow], ports.ys[prow]], axis=1)).query(
+        np.stack([pins.xs[rows], pins.ys[rows]], axis=1), k=k)
+    near = near.reshape(len(rows), k)
+    pin_lab = solver.labels[pins.node[rows]]
+    for c in range(k - 1, -1, -1):
+        cand = prow[near[:, c]]
+        ok = solver.labels[ports.node[cand]] == pin_lab
+        port_of[ok] = cand[ok]
+    miss = np.nonzero(port_of < 0)[0]
+    if len(miss):
+        port_lab = solver.labels[ports.node[prow]]
+        for lab in np.unique(pin_lab[miss]).tolist():
+            cand = prow[port_lab == lab]
+            if len(cand) == 0: continue
+            m = miss[pin_lab[miss] == lab]
+            _, j = cKDTree(np.stack([ports.xs[cand], ports.ys[cand]], axis=1)).query(
+                np.stack([pins.xs[rows[m]], pins.ys[rows[m]]], axis=1))
+            port_of[m] = cand[j]
+
+    r = np.full(len(rows), np.inf)
+    has = port_of >= 0
+    r[has] = extractor.effective_resistance(net, pins.node[rows[has]], ports.node[port_of[has]])
+    return rows, port_of, r
+'''
+
+files["core/tiled_extractor.py"] = r'''
+import os
+import shutil
+import tempfile
+import numpy as np
+from .extractor import RCExtractor, fracture_wires
+from .geom_store import NameTable
+from .node_table import NetRC, pack_xy, unpack_xy, sorted_unique
+
+# [Tiled] Out-of-core extraction.
+# The die is cut into tiles; the outer tiles extend to infinity, so the tile
+# cores partition the plane. A tile fractures the wires on its core tracks
+# clipped to core +- halo along the track, with every cut inside that window,
+# and keeps the pieces whose unsplit segment starts in its core: each segment
+# is produced by exactly one tile, with the same cuts and the same
+# max_seg_len split as the whole-die extraction. A segment that reaches a
+# clipped (artificial) wire end means the halo is shorter than the gap to the
+# next cut; the tile is then redone with a doubled halo.
+# Every tile spills its R / C arrays (packed node keys per layer id) and the
+# nodes of its core to one .npz. Boundary nodes need no bookkeeping: a node
+# is its (layer, x, y) key, so the tiles of a net are stitched either by
+# NetRC.build (run()) or tile by tile in the DSPF writer (stream).
+
+_FAR = 1 << 40      # "infinite" tile edge, far outside any DBU coordinate
+_PACK_MAX = (1 << 31) - 1
+_LAYER_COLS = ('r_l1', 'r_l2', 'c_l')
+_VALUE_COLS = ('r_v', 'c_v')
+
+
+def _ranges(first, last):
+    # Concatenated index ranges [first[i], last[i])
+    count = np.maximum(last - first, 0)
+    return np.repeat(first - np.cumsum(count) + count, count) + np.arange(int(count.sum()))
+
+
+class _WireWindows:
+    # Wires of one (net, layer, orient) sorted by track, then start. The running
+    # max of the packed (track, end) keys stays sorted, so the wires of a track
+    # band that can overlap an along-track window are one searchsorted range per
+    # track; only those are loaded from the generator for a tile.
+    def __init__(self, gen, net, layer, orient):
+        self.gen = gen
+        ids = gen.index.wire_ids(net, layer, orient)
+        rects, centers, _ = gen.wire_arrays(ids=ids)
+        c_lo, c_hi = (0, 2) if orient == 'H' else (1, 3)
+        self.tracks, rank = np.unique(centers, return_inverse=True)
+        rank = rank.reshape(-1)
+        order = np.lexsort((rects[:, c_lo], rank))
+        self.ids = ids[order]
+        self.lo_keys = pack_xy(rank[order], rects[order, c_lo])
+        self.hi_keys = np.maximum.accumulate(pack_xy(rank[order], rects[order, c_hi]))
+
+    def window(self, t0, t1, w0, w1):
+        # -> (rects, centers) of the wires with a track in [t0, t1) that can reach [w0, w1]
+        a, b = np.searchsorted(self.tracks, [t0, t1])
+        if b <= a: return None
+        t = np.arange(a, b)
+        w0, w1 = max(w0, -_PACK_MAX), min(w1, _PACK_MAX)
+        idx = _ranges(np.searchsorted(self.hi_keys, pack_xy(t, w0), 'left'),
+                      np.searchsorted(self.lo_keys, pack_xy(t, w1), 'right'))
+        if len(idx) == 0: return None
+        rects, centers, _ = self.gen.wire_arrays(ids=self.ids[idx])
+        return rects, centers
+
+
+class _PinWindows:
+    # One net's rows of a pin table sorted by tile column, then y: the pins of a
+    # window are one searchsorted range per tile column it covers
+    def __init__(self, table, net, layer_lut, xb):
+        lo, hi = table.net_slice(net)
+        self.table, self.layer_lut, self.xb = table, layer_lut, xb
+        col = self._column(table.xs[lo:hi])
+        order = np.argsort(pack_xy(col, table.ys[lo:hi]), kind='stable')
+        self.rows = lo + order
+        self.keys = pack_xy(col[order], table.ys[self.rows])
+
+    def _column(self, xs):
+        return np.clip(np.searchsorted(self.xb, xs, 'right') - 1, 0, len(self.xb) - 2)
+
+    def window(self, x0, x1, y0, y1):
+        # -> (rows, layer ids, xs, ys) of the pins with x0 <= x < x1, y0 <= y < y1
+        c = np.arange(self._column(max(x0, -_PACK_MAX)), self._column(min(x1, _PACK_MAX)) + 1)
+        y0, y1 = max(y0, -_PACK_MAX), min(y1, _PACK_MAX)
+        rows = self.rows[_ranges(np.searchsorted(self.keys, pack_xy(c, y0), 'left'),
+                                 np.searchsorted(self.keys, pack_xy(c, y1), 'left'))]
+        xs = self.table.xs[rows]
+        rows = rows[(xs >= x0) & (xs < x1)]
+        return rows, self.layer_lut[self.table.layer[rows]], self.table.xs[rows], self.table.ys[rows]
+
+
+class TiledNet:
+    # One net's spilled tiles
+    def __init__(self, net, paths, layer_names, n_nodes, n_res, n_cap, cap_sum):
+        self.net = net
+        self.paths = paths
+        self.layer_names = layer_names
+        self.n_nodes, self.n_res, self.n_cap = n_nodes, n_res, n_cap
+        self.cap_sum = cap_sum
+
+    def total_cap(self):
+        return self.cap_sum
+
+    def tiles(self, cols=None):
+        # -> dict of spilled arrays (all or `cols`) per tile, one tile in memory at a time
+        for path in self.paths:
+            with np.load(path) as z:
+                yield {k: z[k] for k in (cols or z.files)}
+
+    def stitch(self):
+        # Coordinate-keyed merge of all tiles -> NetRC
+        r_parts, c_parts = [], []
+        names = self.layer_names
+        for t in self.tiles():
+            pair = t['r_l1'].astype(np.int64) * len(names) + t['r_l2']
+            for p in np.unique(pair).tolist():
+                m = pair == p
+                r_parts.append((names[p // len(names)], t['r_k1'][m], names[p % len(names)], t['r_k2'][m], t['r_v'][m]))
+            for l in np.unique(t['c_l']).tolist():
+                m = t['c_l'] == l
+                c_parts.append((names[l], t['c_k'][m], t['c_v'][m]))
+        return NetRC.build(r_parts, c_parts)
+
+    def remove(self):
+        for path in self.paths:
+            try: os.remove(path)
+            except OSError: pass
+
+
+class TiledRCExtractor(RCExtractor):
+    def __init__(self, generator, config, tile_um, halo_um=50.0, spill_dir=None, jobs=1, reducer=None):
+        super().__init__(generator, config, jobs=jobs)
+        if reducer is not None: print("[WARN] Tiled extraction: RC reduction needs whole nets, ignored")
+        if self.cache is not None: print("[WARN] Tiled extraction: per-net RC cache not used")
+        self.cache = None
+        self.tile = int(round(tile_um * 1000))
+        self.halo = max(1, int(round(halo_um * 1000)))
+        self.spill_dir = spill_dir
+        self.layer_ids = NameTable()
+        self.halo_grown = 0
+        self._skip = set()
+
+    def run(self):
+        # Whole design: tiles are stitched into one NetRC per net
+        journal = self.journal
+        resumed = {}
+        if journal is not None:
+            for net in sorted(self.gen.nets_used):
+                entry = journal.load(net) if journal.done(net) else None
+                if entry is not None: resumed[net] = entry
+        self._skip = set(resumed)
+        for net, tiled in self.iter_nets():
+            net_rc = self.net_data[net] = tiled.stitch()
+            ids = []
+            for table in (self.inst_pins, self.port_pins):
+                lo, hi = table.net_slice(net)
+                table.node[lo:hi] = self._lookup_ids(net_rc, table, net)
+                ids.append(table.node[lo:hi].copy())
+            if journal is not None: journal.record(net, (net_rc, *ids))
+        self._skip = set()
+        # Pin tables are rebuilt by iter_nets, so restored nets fill theirs in afterwards
+        for net, (net_rc, inst_nodes, port_nodes) in sorted(resumed.items()):
+            self.net_data[net] = net_rc
+            for table, ids in ((self.inst_pins, inst_nodes), (self.port_pins, port_nodes)):
+                lo, hi = table.net_slice(net)
+                table.node[lo:hi] = ids
+        if journal is not None:
+            journal.flush()
+            journal.close()
+        self._extract_coupling()
+
+    def iter_nets(self, chunk=1):
+        # -> (net, TiledNet); a net's spill files are removed once the consumer moves on
+        print("[RC] Starting RC Extraction (Tiled)...")
+        self._prepare_pins()
+        xb, yb = self._tile_edges()
+        print(f"[RC] Tiles: {len(xb) - 1} x {len(yb) - 1} of {self.tile / 1000:g} um, halo {self.halo / 1000:g} um")
+        spill = tempfile.mkdtemp(prefix='rc_tiles_', dir=self.spill_dir)
+        # [Checkpoint] nets restored from the journal by run() are not re-extracted
+        nets = sorted(set(self.gen.nets_used) - self._skip)
+        total_nodes = total_res = total_cap = total_bytes = 0
+        try:
+            for i, net in enumerate(nets):
+                print(f"  > Extracting Net {i+1}/{len(nets)}: {net}...", end='\r')
+                tiled = self._extract_net(net, xb, yb, os.path.join(spill, f"net{i}"))
+                total_nodes += tiled.n_nodes; total_res += tiled.n_res; total_cap += tiled.n_cap
+                total_bytes += sum(os.path.getsize(p) for p in tiled.paths)
+                yield net, tiled
+                tiled.remove()
+        finally:
+            shutil.rmtree(spill, ignore_errors=True)
+        print("")
+        if self.halo_grown: print(f"[WARN] Tiled extraction: halo doubled {self.halo_grown} times (cut gap > --tile-halo)")
+        self._finalize_ports_connectivity()
+        print(f"[RC] Done. Nodes: {total_nodes}, R: {total_res}, C: {total_cap} "
+              f"({total_bytes / (1024 * 1024):.1f} MB spilled)")
+
+    def _tile_edges(self):
+        # Inner tile edges over the die (or the geometry extent); the outer tiles are unbounded
+        if self.gen.die_area:
+            x0, y0, x1, y1 = self.gen._rect_dbu(self.gen.die_area)
+        else:
+            rects = [self.gen.wire_arrays(net)[0] for net in self.gen.nets_used]
+            rects = np.concatenate(rects) if rects else np.zeros((1, 4), dtype=np.int64)
+            x0, y0, x1, y1 = int(rects[:, 0].min()), int(rects[:, 1].min()), int(rects[:, 2].max()), int(rects[:, 3].max())
+
+        def edges(lo, hi):
+            inner = list(range(lo + self.tile, hi, self.tile))
+            return [-_FAR] + inner + [_FAR]
+        return edges(x0, x1), edges(y0, y1)
+
+    def _extract_net(self, net, xb, yb, prefix):
+        # Per-net state is the sorted window keys; wires and pins are loaded per tile
+        groups = [(layer, orient, _WireWindows(self.gen, net, layer, orient))
+                  for _, layer, orient in self.gen.index.keys(net)]
+        vias = [(va, self._get_next_layer(va.bot_layer), self._get_via_param(va.name, "r_cut_ohm", 1.0))
+                for va in self.gen.index.via_arrays(net)]
+        pins = [_PinWindows(table, net, self._layer_lut(table), xb) for table in (self.inst_pins, self.port_pins)]
+
+        paths, n_nodes, n_res, n_cap, cap_sum = [], 0, 0, 0, 0.0
+        halo = self.halo    # a grown halo is kept for the rest of the net
+        for iy in range(len(yb) - 1):
+            for ix in range(len(xb) - 1):
+                core = (xb[ix], xb[ix + 1], yb[iy], yb[iy + 1])
+                while True:
+                    out = self._extract_tile(net, groups, vias, pins, core, halo)
+                    if out is not None: break
+                    halo *= 2
+                    self.halo_grown += 1
+                if len(out['r_v']) == 0 and len(out['n_k']) == 0: continue
+                path = f"{prefix}_{iy}_{ix}.npz"
+                np.savez(path, **out)
+                paths.append(path)
+                n_nodes += len(out['n_k']); n_res += len(out['r_v']); n_cap += len(out['c_v'])
+                cap_sum += float(out['c_v'].sum())
+        self._number_pins(net)
+        return TiledNet(net, paths, self.layer_ids.names, n_nodes, n_res, n_cap, cap_sum)
+
+    def _layer_lut(self, table):
+        # Pin table layer index -> tiled layer id
+        return np.array([self.layer_ids.intern(n) for n in table.layer_names], dtype=np.int64)
+
+    def _extract_tile(self, net, groups, vias, pins, core, halo):
+        # -> spill arrays of one tile, or None when the halo is too short
+        x0, x1, y0, y1 = core
+        wx0, wx1, wy0, wy1 = x0 - halo, x1 - 1 + halo, y0 - halo, y1 - 1 + halo
+        lid = self.layer_ids.intern
+
+        # Cuts of the window per (layer, orient) as in _net_cuts; via resistors of the core
+        cuts = {}
+
+        def add_cuts(layer, xs, ys):
+            for orient, track, pos in (('H', ys, xs), ('V', xs, ys)):
+                t, p = cuts.setdefault((layer, orient), ([], []))
+                t.append(track); p.append(pos)
+
+        r = {k: [] for k in ('r_l1', 'r_k1', 'r_l2', 'r_k2', 'r_v', 'c_l', 'c_k', 'c_v')}
+        nodes_l, nodes_k = [], []
+        for va, l_top, r_cut in vias:
+            vx, vy = va.window(wx0, wx1, wy0, wy1)
+            if len(vx) == 0: continue
+            add_cuts(va.bot_layer, vx, vy)
+            add_cuts(l_top, vx, vy)
+            own = (vx >= x0) & (vx < x1) & (vy >= y0) & (vy < y1)
+            k = pack_xy(vx[own], vy[own])
+            r['r_l1'].append(np.full(len(k), lid(va.bot_layer))); r['r_k1'].append(k)
+            r['r_l2'].append(np.full(len(k), lid(l_top))); r['r_k2'].append(k)
+            r['r_v'].append(np.full(len(k), r_cut))
+            nodes_l += [np.full(len(k), lid(va.bot_layer)), np.full(len(k), lid(l_top))]
+            nodes_k += [k, k]
+        for p in pins:
+            _, lay, xs, ys = p.window(wx0, wx1 + 1, wy0, wy1 + 1)
+            for l in np.unique(lay).tolist():
+                m = lay == l
+                add_cuts(self.layer_ids[l], xs[m], ys[m])
+
+        for layer, orient, windows in groups:
+            if orient == 'H':
+                t0, t1, c_lo, c_hi, p0, p1, w0, w1, col = y0, y1, 0, 2, x0, x1, wx0, wx1, 0
+            else:
+                t0, t1, c_lo, c_hi, p0, p1, w0, w1, col = x0, x1, 1, 3, y0, y1, wy0, wy1, 1
+            found = windows.window(t0, t1, w0, w1)
+            if found is None: continue
+            rects, centers = found
+            sel = (rects[:, c_hi] >= w0) & (rects[:, c_lo] <= w1)
+            if not sel.any(): continue
+            rc = rects[sel]
+            art_lo, art_hi = rc[:, c_lo] < w0, rc[:, c_hi] > w1
+            rc[:, c_lo] = np.maximum(rc[:, c_lo], w0)
+            rc[:, c_hi] = np.minimum(rc[:, c_hi], w1)
+            track, pos = cuts.get((layer, orient), ([], []))
+            cut_keys = sorted_unique(pack_xy(np.concatenate(track), np.concatenate(pos))) if track else np.empty(0, dtype=np.int64)
+            r_sheet, c_area = self._layer_rc(layer)
+            out = fracture_wires(orient, rc, centers[sel], cut_keys, self.max_seg_len, r_sheet, c_area, origin=True)
+            if out is None: continue
+            k1, k2, res, cap, w, oa, ob = out
+            pa, pb = unpack_xy(k1)[col], unpack_xy(k2)[col]
+            in_a, in_b = (pa >= p0) & (pa < p1), (pb >= p0) & (pb < p1)
+            bad = (art_lo[w] & (oa == w0)) | (art_hi[w] & (ob == w1))
+            if (bad & (in_a | in_b)).any(): return None
+            own = (oa >= p0) & (oa < p1)
+            l = lid(layer)
+            for key, v in (('r_l1', np.full(int(own.sum()), l)), ('r_k1', k1[own]), ('r_l2', np.full(int(own.sum()), l)),
+                           ('r_k2', k2[own]), ('r_v', res[own]), ('c_l', np.full(int(own.sum()), l)),
+                           ('c_k', k2[own]), ('c_v', cap[own])):
+                r[key].append(v)
+            nodes_l += [np.full(int(in_a.sum()), l), np.full(int(in_b.sum()), l)]
+            nodes_k += [k1[in_a], k2[in_b]]
+
+        out = {}
+        for key, parts in r.items():
+            dt = np.float64 if key in _VALUE_COLS else (np.int16 if key in _LAYER_COLS else np.int64)
+            out[key] = np.concatenate(parts).astype(dt) if parts else np.empty(0, dtype=dt)
+        out['n_l'], out['n_k'] = self._core_nodes(nodes_l, nodes_k)
+        self._mark_pins(pins, core, out['n_l'], out['n_k'])
+        return out
+
+    @staticmethod
+    def _core_nodes(nodes_l, nodes_k):
+        # -> unique (layer id, key) sorted by layer id, then key
+        if not nodes_l: return np.empty(0, dtype=np.int16), np.empty(0, dtype=np.int64)
+        l, k = np.concatenate(nodes_l).astype(np.int64), np.concatenate(nodes_k)
+        order = np.lexsort((k, l))
+        l, k = l[order], k[order]
+        keep = np.ones(len(k), dtype=bool)
+        keep[1:] = (l[1:] != l[:-1]) | (k[1:] != k[:-1])
+        return l[keep].astype(np.int16), k[keep]
+
+    def _mark_pins(self, pins, core, n_l, n_k):
+        # Pins of the core that land on a node: node = 0 until _number_pins
+        for p in pins:
+            rows, lay, xs, ys = p.window(*core)
+            if len(rows) == 0: continue
+            keys = pack_xy(xs, ys)
+            hit = np.zeros(len(rows), dtype=bool)
+            for l in np.unique(lay).tolist():
+                m = lay == l
+                block = n_k[n_l == l]
+                pos = np.minimum(np.searchsorted(block, keys[m]), max(0, len(block) - 1))
+                hit[m] = (block[pos] == keys[m]) if len(block) else False
+            p.table.node[rows[hit]] = 0
+
+    def _number_pins(self, net):
+        # Registered pins / ports of the net get one id per distinct (layer, x, y)
+        rows, codes = [], []
+        for table in (self.inst_pins, self.port_pins):
+            lo, hi = table.net_slice(net)
+            r = lo + np.nonzero(table.node[lo:hi] >= 0)[0]
+            lay = self._layer_lut(table)[table.layer[r]]
+            rows.append(r)
+            codes.append(np.stack([lay, pack_xy(table.xs[r], table.ys[r])], axis=1).reshape(-1, 2))
+        allc = np.concatenate(codes)
+        if len(allc) == 0: return
+        _, ids = np.unique(allc, axis=0, return_inverse=True)
+        ids = ids.reshape(-1).astype(np.int32)
+        self.inst_pins.node[rows[0]] = ids[:len(rows[0])]
+        self.port_pins.node[rows[1]] = ids[len(rows[0]):]
+'''
+
+files["core/coupling.py"] = r'''
+import numpy as np
+from .node_table import pack_xy, unpack_xy
+
+# [Coupling] Lateral coupling capacitance between stripes of different nets on
+# the same layer. All wires of one (layer, orient) are sorted by track center,
+# then start, and every track is paired with the next track up: only adjacent
+# tracks couple (a nearer stripe shields the ones behind it, also when it is
+# of the same net). The wires of the neighbour track that overlap a wire are a
+# contiguous run found with two searchsorted calls on packed (track, position)
+# keys, so the sweep is O(n log n) in the number of wires. Per pair
+#
+#   C = c_coupling_ff_per_um * overlap_um * c_coupling_ref_space_um / space_um
+#
+# with space the edge-to-edge distance (pairs beyond c_coupling_max_space_um
+# are dropped). The overlap is split into pieces of at most max_seg_len like
+# the wires, and each piece couples the nearest node of either net on its own
+# track. A pair is written once, in the block of the net that sorts first.
+
+
+class CouplingExtractor:
+    def __init__(self, extractor):
+        self.ext = extractor
+        self.dropped = 0
+        self._track_keys = {}
+
+    def layers(self):
+        # -> [(layer, C per um at the reference space, reference space um, max space um)]
+        out = []
+        for layer in sorted(self.ext.tech_props.get('layers', {})):
+            c = self.ext._get_layer_param(layer, 'c_coupling_ff_per_um', 0.0)
+            if c > 0:
+                out.append((layer, c, self.ext._get_layer_param(layer, 'c_coupling_ref_space_um', 1.0),
+                            self.ext._get_layer_param(layer, 'c_coupling_max_space_um', 5.0)))
+        return out
+
+    def run(self):
+        # -> ({owner net: [(other net, owner node ids, other node ids, C fF)]}, {net: coupling total fF})
+        nets = sorted(self.ext.net_data)
+        parts = []
+        for layer, c, ref, max_space in self.layers():
+            orients = sorted({k[2] for k in self.ext.gen.index.keys(layer=layer) if k[0] in self.ext.net_data})
+            for orient in orients:
+                out = self._sweep(nets, layer, orient, c, ref, max_space)
+                if out is not None: parts.append(out)
+        self._track_keys = {}
+        if not parts: return {}, {}
+
+        net_a, node_a, net_b, node_b, cap = (np.concatenate(p) for p in zip(*parts))
+        # Owner = the net that sorts first
+        swap = net_a > net_b
+        net_a, net_b = np.where(swap, net_b, net_a), np.where(swap, net_a, net_b)
+        node_a, node_b = np.where(swap, node_b, node_a), np.where(swap, node_a, node_b)
+
+        totals = np.bincount(net_a, weights=cap, minlength=len(nets)) + \
+                 np.bincount(net_b, weights=cap, minlength=len(nets))
+        # Pieces landing on the same node pair become one capacitor
+        pair = pack_xy(net_a * len(nets) + net_b, node_a)
+        uniq, inv = np.unique(np.stack([pair, node_b]), axis=1, return_inverse=True)
+        inv = inv.reshape(-1)
+        vals = np.bincount(inv, weights=cap)
+        nets_ab, u_node_a = unpack_xy(uniq[0])
+        u_node_b = uniq[1]
+        out = {}
+        brk = np.concatenate([[0], np.nonzero(nets_ab[1:] != nets_ab[:-1])[0] + 1, [len(nets_ab)]])
+        for a, b in zip(brk[:-1].tolist(), brk[1:].tolist()):
+            owner, other = divmod(int(nets_ab[a]), len(nets))
+            out.setdefault(nets[owner], []).append((nets[other], u_node_a[a:b], u_node_b[a:b], vals[a:b]))
+        if self.dropped:
+            print(f"[WARN] Coupling: {self.dropped} pieces without a node on their track (reduced away), dropped")
+        print(f"[RC] Coupling: {len(vals)} C between {len(out)} net blocks, {vals.sum() / 1000.0:.4E} PF")
+        return out, {nets[i]: float(t) for i, t in enumerate(totals.tolist()) if t > 0}
+
+    def _sweep(self, nets, layer, orient, c, ref, max_space):
+        # -> (net a, node a, net b, node b, C fF) per overlap piece of one (layer, orient)
+        rects, centers, owner = [], [], []
+        for i, net in enumerate(nets):
+            if not self.ext.gen.index.keys(net, layer, orient): continue
+            r, ctr, _ = self.ext.gen.wire_arrays(net, layer, orient)
+            rects.append(r); centers.append(ctr); owner.append(np.full(len(ctr), i, dtype=np.int64))
+        if len(rects) < 2: return None
+        rects, center, owner = np.concatenate(rects), np.concatenate(centers), np.concatenate(owner)
+        if orient == 'H':
+            start, end, thick = rects[:, 0], rects[:, 2], rects[:, 3] - rects[:, 1]
+        else:
+            start, end, thick = rects[:, 1], rects[:, 3], rects[:, 2] - rects[:, 0]
+        order = np.lexsort((start, center))
+        start, end, thick, center, owner = start[order], end[order], thick[order], center[order], owner[order]
+        tracks, track = np.unique(center, return_inverse=True)
+        if len(tracks) < 2: return None
+
+        # Wires sort by (track, start); the running max of (track, end) stays
+        # sorted, so overlap candidates on track + 1 are one contiguous run
+        lo_keys = pack_xy(track, start)
+        hi_keys = np.maximum.accumulate(pack_xy(track, end))
+        first = np.searchsorted(hi_keys, pack_xy(track + 1, start), 'right')
+        last = np.searchsorted(lo_keys, pack_xy(track + 1, end), 'left')
+        count = np.maximum(last - first, 0)
+        count[track == len(tracks) - 1] = 0
+        u = np.repeat(np.arange(len(start)), count)
+        v = first[u] + np.arange(len(u)) - np.repeat(np.cumsum(count) - count, count)
+
+        a, b = np.maximum(start[u], start[v]), np.minimum(end[u], end[v])
+        space = (center[v] - center[u]) - (thick[u] + thick[v]) / 2.0
+        keep = (owner[u] != owner[v]) & (b > a) & (space > 0) & (space <= max_space * 1000)
+        u, v, a, b, space = u[keep], v[keep], a[keep], b[keep], space[keep]
+        if len(u) == 0: return None
+
+        # Overlap -> pieces of at most max_seg_len, each with its share of C
+        length = b - a
+        cap = c * (length / 1000.0) * ref / (space / 1000.0)
+        num = np.maximum(1, np.ceil(length / self.ext.max_seg_len)).astype(np.int64)
+        rep = np.repeat(np.arange(len(u)), num)
+        k = np.arange(len(rep)) - np.repeat(np.cumsum(num) - num, num)
+        mid = (a[rep] + (k + 0.5) * length[rep] / num[rep]).astype(np.int64)
+        cap = cap[rep] / num[rep]
+        u, v = u[rep], v[rep]
+
+        node_u = self._nearest(nets, owner[u], layer, orient, center[u], mid)
+        node_v = self._nearest(nets, owner[v], layer, orient, center[v], mid)
+        ok = (node_u >= 0) & (node_v >= 0)
+        self.dropped += int((~ok).sum())
+        return owner[u][ok], node_u[ok], owner[v][ok], node_v[ok], cap[ok]
+
+    def _nearest(self, nets, owner, layer, orient, track, pos):
+        # -> node id of owner's net nearest to `pos` on `track` of `layer` (-1: no node on the track)
+        out = np.full(len(owner), -1, dtype=np.int64)
+        for i in np.unique(owner).tolist():
+            m = np.nonzero(owner == i)[0]
+            keys, ids = self._sorted_track_keys(nets[i], layer, orient)
+            if len(keys) == 0: continue
+            q = pack_xy(track[m], pos[m])
+            k = np.searchsorted(keys, q)
+            best = np.full(len(m), np.inf)
+            for c in (k - 1, k):
+                cc = np.clip(c, 0, len(keys) - 1)
+                t, p = unpack_xy(keys[cc])
+                d = np.where((c >= 0) & (c < len(keys)) & (t == track[m]), np.abs(p - pos[m]), np.inf)
+                better = d < best
+                best[better] = d[better]
+                out[m[better]] = ids[cc[better]]
+        return out
+
+    def _sorted_track_keys(self, net, layer, orient):
+        # Node keys of one layer packed as (track, position), sorted -> (keys, node ids)
+        key = (net, layer, orient)
+        if key not in self._track_keys:
+            net_rc = self.ext.net_data[net]
+            if layer not in net_rc.layers:
+                self._track_keys[key] = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+                return self._track_keys[key]
+            li = net_rc.layers.index(layer)
+            lo, hi = int(net_rc.layer_start[li]), int(net_rc.layer_start[li + 1])
+            keys, ids = net_rc.keys[lo:hi], np.arange(lo, hi, dtype=np.int64)
+            if orient == 'H':
+                xs, ys = unpack_xy(keys)
+                keys = pack_xy(ys, xs)
+                order = np.argsort(keys, kind='stable')
+                keys, ids = keys[order], ids[order]
+            self._track_keys[key] = (keys, ids)
+        return self._track_keys[key]
+'''
+
+files["core/periodic.py"] = r'''
+import numpy as np
+from .extractor import RCExtractor, fracture_wires
+from .node_table import NetRC, pack_xy, unpack_xy, sorted_unique
+
+# [Periodic] Pattern-based extraction for regular PG grids.
+# The tracks of one (net, layer) are grouped into classes: tracks whose wire
+# spans / widths and cut positions (via landings, pins, taps) are identical
+# form one unit cell. Each class is fractured once on a representative track
+# and replicated to its other tracks by shifting the track coordinate. Node
+# ids come in closed form from per-class offsets instead of sorting every
+# endpoint key:
+#
+#   V layer (ids track-major):    id = start[track] + rank of pos in the class points
+#   H layer (ids position-major): id = start[pos] + sum over classes present at
+#                                 pos of (class tracks below track)
+#
+# which is exactly the (layer, x, y) order of NetRC.build, so the NetRC (ids
+# and element order) is identical to the generic path. Irregular tracks (die
+# edges, pins, instance taps, region clipping) simply form classes of their
+# own. Nets that do not fit (both orients on one layer, vias landing off the
+# fractured points) use the generic path.
+
+
+class _LayerGrid:
+    # Node numbering of one layer from its track classes
+    def __init__(self, orient, tracks, cls, points):
+        self.orient, self.tracks, self.cls, self.points = orient, tracks, cls, points
+        self.members = [tracks[cls == c] for c in range(len(points))]
+        n_pts = np.array([len(p) for p in points], dtype=np.int64)
+        if orient == 'V':
+            counts = n_pts[cls]
+        else:
+            self.pos = sorted_unique(np.concatenate(points)) if points else np.empty(0, dtype=np.int64)
+            self.present = np.stack([np.isin(self.pos, p) for p in points]) if points else np.zeros((0, 0), dtype=bool)
+            counts = (self.present * np.array([len(m) for m in self.members], dtype=np.int64)[:, None]).sum(0)
+        self.start = np.cumsum(counts) - counts
+        self.size = int(counts.sum())
+
+    def shift(self, base):
+        self.start = self.start + base
+
+    def _rank(self, tracks, present):
+        # Tracks below each of `tracks` among the classes flagged in present [k, n]
+        out = 0
+        for c, m in enumerate(self.members):
+            out = out + present[c] * np.searchsorted(m, tracks)
+        return out
+
+    def class_ids(self, c):
+        # -> node ids [class points, class tracks]
+        P, T = self.points[c], self.members[c]
+        if self.orient == 'V':
+            return self.start[np.searchsorted(self.tracks, T)][None, :] + np.arange(len(P))[:, None]
+        xi = np.searchsorted(self.pos, P)
+        out = self.start[xi][:, None]
+        for c2, m in enumerate(self.members):
+            out = out + self.present[c2, xi][:, None] * np.searchsorted(m, T)[None, :]
+        return out
+
+    def keys(self):
+        # -> packed (x, y) per node in id order
+        keys = np.empty(self.size, dtype=np.int64)
+        base = int(self.start[0]) if len(self.start) else 0
+        for c, (P, T) in enumerate(zip(self.points, self.members)):
+            if len(P) == 0 or len(T) == 0: continue
+            k = pack_xy(P[:, None], T[None, :]) if self.orient == 'H' else pack_xy(T[None, :], P[:, None])
+            keys[self.class_ids(c) - base] = k
+        return keys
+
+    def ids(self, t, p):
+        # -> node id of (track, position) pairs; -1 where there is no node
+        out = np.full(len(t), -1, dtype=np.int64)
+        if len(t) == 0 or len(self.tracks) == 0: return out
+        ti = np.minimum(np.searchsorted(self.tracks, t), len(self.tracks) - 1)
+        ok = self.tracks[ti] == t
+        c = self.cls[ti]
+        if self.orient == 'V':
+            for c0 in np.unique(c[ok]).tolist():
+                m = np.nonzero(ok & (c == c0))[0]
+                P = self.points[c0]
+                if len(P) == 0: continue
+                pi = np.minimum(np.searchsorted(P, p[m]), len(P) - 1)
+                hit = P[pi] == p[m]
+                out[m[hit]] = self.start[ti[m[hit]]] + pi[hit]
+            return out
+        if len(self.pos) == 0: return out
+        xi = np.minimum(np.searchsorted(self.pos, p), len(self.pos) - 1)
+        ok &= self.pos[xi] == p
+        ok &= self.present[c, xi]
+        m = np.nonzero(ok)[0]
+        out[m] = self.start[xi[m]] + self._rank(t[m], self.present[:, xi[m]])
+        return out
+
+
+    def grid_ids(self, t, p):
+        # -> node ids [len(t), len(p)] of the full grid tracks t x positions p; -1 where absent
+        out = np.full((len(t), len(p)), -1, dtype=np.int64)
+        if len(t) == 0 or len(p) == 0 or len(self.tracks) == 0: return out
+        ti = np.minimum(np.searchsorted(self.tracks, t), len(self.tracks) - 1)
+        ok_t = self.tracks[ti] == t
+        c = self.cls[ti]
+        if self.orient == 'V':
+            for c0 in np.unique(c[ok_t]).tolist():
+                m = np.nonzero(ok_t & (c == c0))[0]
+                P = self.points[c0]
+                if len(P) == 0: continue
+                pi = np.minimum(np.searchsorted(P, p), len(P) - 1)
+                hit = P[pi] == p
+                out[np.ix_(m, np.nonzero(hit)[0])] = self.start[ti[m]][:, None] + pi[hit][None, :]
+            return out
+        if len(self.pos) == 0: return out
+        xi = np.minimum(np.searchsorted(self.pos, p), len(self.pos) - 1)
+        ok = ok_t[:, None] & (self.pos[xi] == p)[None, :] & self.present[c][:, xi]
+        ids = self.start[xi][None, :]
+        for c2, m in enumerate(self.members):
+            ids = ids + np.searchsorted(m, t)[:, None] * self.present[c2, xi][None, :]
+        out[ok] = ids[ok]
+        return out
+
+
+class PeriodicRCExtractor(RCExtractor):
+    def __init__(self, generator, config, jobs=1, reducer=None):
+        if jobs > 1:
+            print("[WARN] Periodic extraction runs serially; --jobs ignored")
+        super().__init__(generator, config, jobs=1, reducer=reducer)
+        self.stats = {'nets': 0, 'fallback': 0, 'tracks': 0, 'classes': 0}
+
+    def iter_nets(self, chunk=1):
+        self.stats = {'nets': 0, 'fallback': 0, 'tracks': 0, 'classes': 0}
+        yield from super().iter_nets(chunk)
+        s = self.stats
+        print(f"[RC] Periodic: {s['nets']} nets from {s['classes']} unit cells over {s['tracks']} tracks, "
+              f"{s['fallback']} nets generic")
+
+    def _process_net(self, net_name):
+        r_parts, cuts = self._net_cuts(net_name)
+        groups = self._net_groups(net_name, cuts)
+        out = self._periodic_net(net_name, r_parts, groups)
+        if out is not None:
+            self.stats['nets'] += 1
+            return out
+        # Generic fracture on the same cuts
+        self.stats['fallback'] += 1
+        c_parts = []
+        for layer, orient, rects, centers, cut_keys in groups:
+            res = self._fracture_group(layer, orient, rects, centers, cut_keys)
+            if res is not None: self._add_group(r_parts, c_parts, layer, res)
+        return self._finish_net(net_name, r_parts, c_parts)
+
+    def _periodic_net(self, net_name, via_parts, groups):
+        # -> (NetRC, inst ids, port ids), or None when the net does not fit
+        layers = [g[0] for g in groups]
+        if len(set(layers)) != len(layers): return None
+        plans = {}
+        for layer, orient, rects, centers, cut_keys in groups:
+            plan = self._plan_group(layer, orient, rects, centers, cut_keys)
+            if plan is not None: plans[layer] = plan
+        for l1, _, l2, _, _ in via_parts:
+            if l1 not in plans or l2 not in plans: return None
+
+        # Layer id blocks in name order (as NetRC.build)
+        rc = NetRC()
+        rc.layers = sorted(plans)
+        base = 0
+        for layer in rc.layers:
+            plans[layer]['grid'].shift(base)
+            base += plans[layer]['grid'].size
+        rc.layer_start = np.cumsum([0] + [plans[l]['grid'].size for l in rc.layers]).astype(np.int64)
+        rc.keys = np.concatenate([plans[l]['grid'].keys() for l in rc.layers]) if rc.layers else np.empty(0, dtype=np.int64)
+
+        def ids(layer, k):
+            x, y = unpack_xy(k)
+            g = plans[layer]['grid']
+            return g.ids(y, x) if g.orient == 'H' else g.ids(x, y)
+
+        def via_ids(layer, k):
+            # Blocks of a via grid (row-major, x fastest) are numbered per axis
+            if len(k) == 0: return ids(layer, k)
+            x, y = unpack_xy(k)
+            ncol = int(np.argmax(y != y[0])) or len(k)
+            if len(k) % ncol == 0:
+                X, Y = x.reshape(-1, ncol), y.reshape(-1, ncol)
+                if (X == X[0]).all() and (Y == Y[:, :1]).all():
+                    g = plans[layer]['grid']
+                    if g.orient == 'H': return g.grid_ids(Y[:, 0], X[0]).ravel()
+                    return g.grid_ids(X[0], Y[:, 0]).T.ravel()
+            return ids(layer, k)
+
+        n1, n2, rv, cn, cv = [], [], [], [], []
+        for l1, k1, l2, k2, r in via_parts:
+            a = via_ids(l1, k1)
+            b = via_ids(l2, k2)
+            if (a < 0).any() or (b < 0).any(): return None
+            n1.append(a); n2.append(b); rv.append(np.asarray(r, dtype=np.float64))
+        for layer in layers:
+            if layer not in plans: continue
+            a, b, r, c = self._replicate(plans[layer])
+            n1.append(a); n2.append(b); rv.append(r)
+            cn.append(b); cv.append(c)
+        if n1:
+            rc.res_n1 = np.concatenate(n1).astype(np.int32)
+            rc.res_n2 = np.concatenate(n2).astype(np.int32)
+            rc.res_val = np.concatenate(rv)
+        if cn:
+            rc.cap_node = np.concatenate(cn).astype(np.int32)
+            rc.cap_val = np.concatenate(cv)
+        for layer in plans:
+            self.stats['tracks'] += len(plans[layer]['grid'].tracks)
+            self.stats['classes'] += len(plans[layer]['grid'].points)
+        return self._with_pins(net_name, rc)
+
+    def _plan_group(self, layer, orient, rects, centers, cut_keys):
+        # Track classes of one (layer, orient) group, each fractured once on its representative
+        if orient == 'H':
+            start, end, thick = rects[:, 0], rects[:, 2], rects[:, 3] - rects[:, 1]
+        else:
+            start, end, thick = rects[:, 1], rects[:, 3], rects[:, 2] - rects[:, 0]
+        wo = np.lexsort((start, centers))
+        tracks, w_first, w_count = np.unique(centers[wo], return_index=True, return_counts=True)
+        c_lo = np.searchsorted(cut_keys, pack_xy(tracks, -(1 << 31)))
+        c_hi = np.searchsorted(cut_keys, pack_xy(tracks + 1, -(1 << 31)))
+        _, cut_pos = unpack_xy(cut_keys)
+        span = np.stack([start, end, thick], axis=1)[wo]
+
+        # Unit cells: tracks with the same wire spans and cuts
+        classes, reps = {}, []
+        cls = np.empty(len(tracks), dtype=np.int64)
+        for i, (a, n, ca, cb) in enumerate(zip(w_first.tolist(), w_count.tolist(), c_lo.tolist(), c_hi.tolist())):
+            key = (span[a:a + n].tobytes(), cut_pos[ca:cb].tobytes())
+            c = classes.setdefault(key, len(classes))
+            if c == len(reps): reps.append(i)
+            cls[i] = c
+
+        r_sheet, c_area = self._layer_rc(layer)
+        segs, points = [], []
+        for i in reps:
+            ws = wo[w_first[i]:w_first[i] + w_count[i]]
+            out = fracture_wires(orient, rects[ws], centers[ws], cut_keys[c_lo[i]:c_hi[i]],
+                                 self.max_seg_len, r_sheet, c_area, origin=True)
+            if out is None:
+                segs.append(None)
+                points.append(np.empty(0, dtype=np.int64))
+                continue
+            k1, k2, res, cap, w = out[:5]
+            pa = unpack_xy(k1)[0 if orient == 'H' else 1]
+            pb = unpack_xy(k2)[0 if orient == 'H' else 1]
+            pts = sorted_unique(np.concatenate([pa, pb]))
+            # Piece index inside its wire (fracture_wires keeps wire order)
+            first = np.searchsorted(w, w)
+            segs.append((w, np.arange(len(w)) - first, np.searchsorted(pts, pa), np.searchsorted(pts, pb), res, cap))
+            points.append(pts)
+        if not any(len(p) for p in points): return None
+
+        # Output slot of every wire, in group (index) order as the generic path
+        track_of = np.empty(len(wo), dtype=np.int64)
+        track_of[wo] = np.repeat(np.arange(len(tracks)), w_count)
+        rank = np.empty(len(wo), dtype=np.int64)
+        rank[wo] = np.arange(len(wo)) - np.repeat(w_first, w_count)
+        width = int(w_count.max())
+        per_rank = np.stack([np.bincount(s[0], minlength=width) if s is not None
+                             else np.zeros(width, dtype=np.int64) for s in segs])
+        n_seg = per_rank[cls[track_of], rank]
+        offs = np.cumsum(n_seg) - n_seg
+        return {'grid': _LayerGrid(orient, tracks, cls, points), 'segs': segs, 'offs': offs,
+                'wo': wo, 'w_first': w_first, 'total': int(n_seg.sum())}
+
+    @staticmethod
+    def _replicate(plan):
+        # -> (n1, n2, R, C) of the whole group from its classes
+        grid, total = plan['grid'], plan['total']
+        n1 = np.empty(total, dtype=np.int64)
+        n2 = np.empty(total, dtype=np.int64)
+        rv = np.empty(total)
+        cv = np.empty(total)
+        for c, seg in enumerate(plan['segs']):
+            if seg is None: continue
+            members = np.nonzero(grid.cls == c)[0]
+            w, q, ia, ib, res, cap = seg
+            ids = grid.class_ids(c)
+            wire = plan['wo'][plan['w_first'][members][None, :] + w[:, None]]
+            slot = plan['offs'][wire] + q[:, None]
+            n1[slot] = ids[ia]
+            n2[slot] = ids[ib]
+            rv[slot] = res[:, None]
+            cv[slot] = cap[:, None]
+        return n1, n2, rv, cv
+'''
+
+files["core/corners.py"] = r'''
+import numpy as np
+
+# [Corners] Named RC corners on one extracted topology.
+#
+#   "tech_properties": {"corners": [
+#       {"name": "rcmax", "r_scale": 1.1, "c_scale": 1.05, "temperature_c": 125, "tc1": 0.003,
+#        "layers": {"M1": {"r_sheet_ohm_per_sq": 0.6, "c_scale": 1.1, "tc1": 0.004}},
+#        "vias": {"VIA12": {"r_cut_ohm": 9.0}}}]}
+#
+# The nodes and elements are extracted once at the nominal tech_properties;
+# a corner only rescales the value arrays. A resistor is a wire piece when
+# both ends are on one layer, else the via between the two layers:
+#
+#   R = R_nom * f_r(kind) * (1 + tc1 * (T - t_ref_c)),   C = C_nom * f_c(layer)
+#
+# A table value (r_sheet_ohm_per_sq, c_area_ff_per_um2, c_coupling_ff_per_um,
+# r_cut_ohm) gives f = table / nominal; otherwise the layer / via r_scale /
+# c_scale, then the corner's. tc1 comes from the corner layer / via entry,
+# the corner, then the nominal layer / via entry. Without temperature_c there
+# is no temperature term. Wire pieces keep the extractor's R_MIN floor, so a
+# piece clamped at nominal stays exact for f <= 1.
+
+R_MIN = 0.001
+
+
+def load_corners(tech_props):
+    # -> [Corner] from tech_properties["corners"]
+    corners, seen = [], set()
+    for spec in tech_props.get('corners', []) or []:
+        name = spec.get('name')
+        if not name or name in seen:
+            print(f"[WARN] Corner without a unique name skipped: {spec}")
+            continue
+        seen.add(name)
+        corners.append(Corner(spec, tech_props))
+    return corners
+
+
+def corner_filename(filename, corner):
+    # "output_top.dspf" -> "output_top_<corner>.dspf"
+    stem, ext = filename.rsplit('.', 1) if '.' in filename else (filename, 'dspf')
+    return f"{stem}_{corner.name}.{ext}"
+
+
+class Corner:
+    def __init__(self, spec, tech_props):
+        self.name = spec['name']
+        self.spec = spec
+        self.tech = tech_props
+        self.temperature = spec.get('temperature_c')
+        self.t_ref = float(spec.get('t_ref_c', 25.0))
+
+    def _entry(self, section, name):
+        return self.spec.get(section, {}).get(name, {})
+
+    def _factor(self, section, name, table_key, scale_key, nominal_default):
+        entry = self._entry(section, name)
+        if table_key in entry:
+            nominal = float(self.tech.get(section, {}).get(name, {}).get(table_key, nominal_default))
+            if nominal > 0: return float(entry[table_key]) / nominal
+            print(f"[WARN] Corner {self.name}: nominal {table_key} of {name} is 0, table value ignored")
+        return float(entry.get(scale_key, self.spec.get(scale_key, 1.0)))
+
+    def _temp(self, section, name):
+        if self.temperature is None: return 1.0
+        nominal = self.tech.get(section, {}).get(name, {}).get('tc1', 0.0)
+        tc1 = float(self._entry(section, name).get('tc1', self.spec.get('tc1', nominal)))
+        return 1.0 + tc1 * (float(self.temperature) - self.t_ref)
+
+    def r_layer(self, layer):
+        return self._factor('layers', layer, 'r_sheet_ohm_per_sq', 'r_scale', 0.1) * self._temp('layers', layer)
+
+    def c_layer(self, layer):
+        return self._factor('layers', layer, 'c_area_ff_per_um2', 'c_scale', 0.0)
+
+    def c_coupling(self, layer):
+        return self._factor('layers', layer, 'c_coupling_ff_per_um', 'c_scale', 0.0)
+
+    def r_via(self, via_name):
+        return self._factor('vias', via_name, 'r_cut_ohm', 'r_scale', 1.0) * self._temp('vias', via_name)
+
+
+class CornerValues:
+    # R / C of an extracted design at one corner (per net on demand, coupling up front)
+    def __init__(self, corner, extractor):
+        self.corner = corner
+        self.ext = extractor
+        # (bottom layer, top layer) -> via name, as the vias were extracted
+        self.via_names = {}
+        for va in extractor.gen.via_arrays:
+            self.via_names.setdefault((va.bot_layer, extractor._get_next_layer(va.bot_layer)), va.name)
+        self.coupling, self.coupling_total = self._scale_coupling()
+
+    def _r_table(self, layers):
+        # [layer i, layer j] -> R factor (diagonal: wire, else via)
+        c = self.corner
+        F = np.empty((len(layers), len(layers)))
+        for i, a in enumerate(layers):
+            for j, b in enumerate(layers):
+                F[i, j] = c.r_layer(a) if i == j else \
+                    c.r_via(self.via_names.get((a, b), self.via_names.get((b, a))))
+        return F
+
+    def net_values(self, net, net_rc):
+        # -> (R, C) arrays of net_rc at this corner
+        l1, l2 = net_rc.node_layers(net_rc.res_n1), net_rc.node_layers(net_rc.res_n2)
+        res = net_rc.res_val * self._r_table(net_rc.layers)[l1, l2]
+        wire = l1 == l2
+        res[wire] = np.maximum(R_MIN, res[wire])
+        c_fac = np.array([self.corner.c_layer(l) for l in net_rc.layers])
+        cap = net_rc.cap_val * c_fac[net_rc.node_layers(net_rc.cap_node)] if len(c_fac) else net_rc.cap_val
+        return res, cap
+
+    def _scale_coupling(self):
+        out, totals = {}, {}
+        for owner, entries in self.ext.coupling.items():
+            net_rc = self.ext.net_data[owner]
+            c_fac = np.array([self.corner.c_coupling(l) for l in net_rc.layers])
+            for other, nodes, other_nodes, vals in entries:
+                v = vals * c_fac[net_rc.node_layers(nodes)]
+                out.setdefault(owner, []).append((other, nodes, other_nodes, v))
+                s = float(v.sum())
+                totals[owner] = totals.get(owner, 0.0) + s
+                totals[other] = totals.get(other, 0.0) + s
+        return out, totals
+'''
+
+files["core/checkpoint.py"] = r'''
+import hashlib
+import json
+import os
+import pickle
+import queue
+import threading
+import time
+import numpy as np
+from .net_cache import stable_hash, CACHE_VERSION
+from .pin_table import PinTable
+
+# [Checkpoint] Append-only journal of finished nets for long extraction runs.
+# Every net's final RC (after reduction) and its pin / port node ids go to
+# one pickle file, then a line naming it is appended to journal.log; the first
+# line holds the hash of the extraction inputs. A net counts as done only
+# once its line is on disk, so a kill at any point loses at most the nets in
+# flight. Files and lines are written by a background thread so extraction
+# never waits on the disk (the queue is bounded to cap the RC held for it).
+
+JOURNAL_VERSION = 1
+ANALYSIS_SECTIONS = ('ir_drop', 'ir_transient', 'eff_res')
+
+
+def geometry_digest(gen):
+    # Content of the extracted layout: the per-net content keys when the generator has them
+    # (NetCache runs and artifacts saved from them), else the wire / via / pin arrays themselves
+    nets = sorted(gen.nets_used)
+    keys = [gen.net_keys.get(net, {}).get('geom') for net in nets]
+    if all(keys) and gen.placement_key is not None:
+        return stable_hash('keys', keys, gen.placement_key)
+    h = hashlib.sha256()
+    for net in nets:
+        h.update(f"net {net}\n".encode())
+        for key in sorted(gen.index.keys(net)):
+            rects, centers, _ = gen.wire_arrays(*key)
+            h.update(f"wires {key[1]} {key[2]} {len(rects)}\n".encode())
+            h.update(rects.tobytes()); h.update(centers.tobytes())
+        for va in gen.index.via_arrays(net):
+            h.update(f"vias {type(va).__name__} {va.name} {va.bot_layer} {len(va.xs)}\n".encode())
+            h.update(va.xs.tobytes()); h.update(va.ys.tobytes())
+    pins = PinTable.from_instances(gen)
+    h.update(stable_hash(pins.layer_names, list(pins.pin_names), sorted(pins.net_slices.items())).encode())
+    for col in (pins.layer, pins.xs, pins.ys, pins.owner, pins.pin):
+        h.update(np.ascontiguousarray(col).tobytes())
+    h.update(stable_hash([(p['name'], p['net'], p['layer'], p['rect']) for p in gen.pins]).encode())
+    return h.hexdigest()[:32]
+
+
+def input_key(extractor):
+    # Hash of everything the extracted RC depends on (analysis-only sections excluded)
+    gen = extractor.gen
+    config = {k: v for k, v in extractor.config.items() if k not in ANALYSIS_SECTIONS}
+    geometry = (sorted(gen.nets_used), geometry_digest(gen), sorted(map(list, gen.tsv_ports)), gen.die_area)
+    reducer = extractor.reducer.key() if extractor.reducer is not None else None
+    return stable_hash('journal', JOURNAL_VERSION, CACHE_VERSION, type(extractor).__name__, config,
+                       gen.tech.units, geometry, extractor.max_seg_len, reducer)
+
+
+class RCJournal:
+    def __init__(self, root, key, resume=False, depth=4):
+        self.root = root
+        self.key = key
+        self.entries = {}
+        self.written = 0
+        self.bytes = 0
+        self.busy = 0.0
+        self.error = None
+        os.makedirs(root, exist_ok=True)
+        self.log_path = os.path.join(root, 'journal.log')
+        if resume:
+            self._read()
+        if not self.entries:
+            self._reset()
+        # Rewritten from the valid entries, so appends never follow a cut-off line
+        self._write_log()
+        self._queue = queue.Queue(maxsize=depth)
+        self._log = open(self.log_path, 'a')
+        self._thread = threading.Thread(target=self._worker, name='rc-journal', daemon=True)
+        self._thread.start()
+
+    def _read(self):
+        try:
+            with open(self.log_path) as f:
+                lines = f.read().split('\n')
+        except FileNotFoundError:
+            print(f"[CKPT] No journal in {self.root}, starting from scratch")
+            return
+        try:
+            head = json.loads(lines[0])
+        except ValueError:
+            head = {}
+        if head.get('key') != self.key:
+            print(f"[WARN] Journal in {self.root} was written for other inputs; starting from scratch")
+            return
+        # The last line may be cut short by a kill: only complete lines count
+        for line in lines[1:-1]:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                break
+            if os.path.exists(os.path.join(self.root, rec['file'])):
+                self.entries[rec['net']] = rec['file']
+        print(f"[CKPT] Resuming: {len(self.entries)} nets already extracted ({self.root})")
+
+    def _reset(self):
+        for name in os.listdir(self.root):
+            if name.endswith('.pkl') or name.endswith('.tmp'):
+                os.remove(os.path.join(self.root, name))
+
+    def _write_log(self):
+        head = {'key': self.key, 'version': JOURNAL_VERSION, 'started': time.time()}
+        with open(f"{self.log_path}.tmp", 'w') as f:
+            f.write(json.dumps(head) + '\n')
+            for net, name in self.entries.items():
+                f.write(json.dumps({'net': net, 'file': name}) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f"{self.log_path}.tmp", self.log_path)
+
+    def done(self, net):
+        return net in self.entries
+
+    def load(self, net):
+        # -> (NetRC, inst node ids, port node ids) of a journaled net, None if unreadable
+        path = os.path.join(self.root, self.entries[net])
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            print(f"[WARN] Journal entry unreadable, re-extracting {net}: {path} ({e})")
+            del self.entries[net]
+            return None
+
+    def record(self, net, entry):
+        # Queue a finished net; blocks only while `depth` nets are still waiting for the disk
+        if self.error is None and self._thread.is_alive():
+            self._queue.put((net, entry))
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                # close(): every net queued before the sentinel is already on disk
+                self._queue.task_done()
+                break
+            net, entry = item
+            t0 = time.time()
+            try:
+                name = f"net_{stable_hash(net)[:16]}.pkl"
+                path = os.path.join(self.root, name)
+                with open(f"{path}.tmp", 'wb') as f:
+                    pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(f"{path}.tmp", path)
+                self._log.write(json.dumps({'net': net, 'file': name}) + '\n')
+                self._log.flush()
+                os.fsync(self._log.fileno())
+                self.entries[net] = name
+                self.written += 1
+                self.bytes += os.path.getsize(path)
+            except Exception as e:
+                self.error = e
+                print(f"[WARN] Checkpoint write failed, journaling stopped: {e}")
+            self.busy += time.time() - t0
+            self._queue.task_done()
+
+    def flush(self):
+        # Wait until every queued net is on disk
+        self._queue.join()
+        print(f"[CKPT] Journal: {self.written} nets written ({self.bytes / (1024 * 1024):.1f} MB, "
+              f"{self.busy:.2f}s in background), {len(self.entries)} total")
+
+    def close(self):
+        # Stop the writer thread and release journal.log; load() still works afterwards
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        if not self._log.closed:
+            self._log.close()
 '''
 
 # ==========================================
@@ -818,6 +4723,7 @@ def load_config(path):
 
 files["io_utils/def_writer.py"] = r'''
 import os
+import shutil
 
 class DEFWriter:
     def __init__(self, generator):
@@ -833,23 +4739,25 @@ class DEFWriter:
             
             # Components
             f.write(f"COMPONENTS {len(self.gen.instances)} ;\n")
-            for inst in self.gen.instances:
-                x = int(inst['pos'][0])
-                y = int(inst['pos'][1])
-                f.write(f"- {inst['name']} {inst['master']} + PLACED ( {x} {y} ) N ;\n")
+            for name, master, x, y in self.gen.iter_placements():
+                f.write(f"- {name} {master} + PLACED ( {x} {y} ) N ;\n")
             f.write("END COMPONENTS\n")
 
             # Nets
             f.write(f"NETS {len(self.gen.nets_used)} ;\n")
-            for net in self.gen.nets_used:
+            for net in sorted(self.gen.nets_used):
                 f.write(f"- {net}\n")
                 # Pins
-                conns = self.gen.net_conn_map.get(net, [])
-                if conns:
-                    f.write(f"  ( " + " ) ( ".join(conns) + " )")
+                # Connection strings are formatted lazily, one at a time
+                sep = "  ( "
+                for conn in self.gen.net_connections(net):
+                    f.write(sep + conn)
+                    sep = " ) ( "
+                if sep != "  ( ":
+                    f.write(" )")
                 
                 # Wires
-                wires = [w for w in self.gen.wires if w['net'] == net]
+                wires = self.gen.wires_for(net)
                 if wires:
                     f.write(f"\n  + ROUTED")
                     for w in wires:
@@ -863,6 +4771,19 @@ class DEFWriter:
                 f.write(" ;\n")
             f.write("END NETS\n")
             f.write("END DESIGN\n")
+
+    @staticmethod
+    def copy_as(src_path, filename, design_name="TOP", output_dir="."):
+        # [Dedup] Identical die: copy an already written DEF, renaming DESIGN
+        full_path = os.path.join(output_dir, filename)
+        with open(src_path, 'r') as src, open(full_path, 'w') as f:
+            for line in src:
+                if line.startswith("DESIGN "):
+                    f.write(f"DESIGN {design_name} ;\n")
+                    break
+                f.write(line)
+            shutil.copyfileobj(src, f, 1024 * 1024)
+        print(f"[INFO] DEF Written: {filename} (copy of {os.path.basename(src_path)})")
 '''
 
 files["io_utils/spice_writer.py"] = r'''
@@ -878,16 +4799,46 @@ class SpiceWriter:
         with open(full_path, 'w') as f:
             f.write("* 3D Stack SPICE Netlist\n")
             f.write(".PARAM\n")
-            
+
             for die_name, gen in self.stack.generators.items():
                 f.write(f".INCLUDE output_{die_name}.dspf\n")
-                
+
+            if self.stack.tsv_pairs:
+                self._write_stack(f)
+
             f.write(".END\n")
+
+    def _write_stack(self, f):
+        # [3D] One instance per die subckt (pins: nets, then TSV ports, as in the
+        # DSPF header); die-local nodes are prefixed with the die name and the
+        # TSVs are resistors between the two landings.
+        dies_cfg = self.stack.full_config.get('dies', {})
+        f.write("* Die Instances\n")
+        for die_name, gen in self.stack.generators.items():
+            design = dies_cfg.get(die_name, {}).get('display_name', die_name)
+            pins = sorted(gen.nets_used) + [p[0] for p in gen.tsv_ports]
+            f.write(f"X{die_name} {' '.join(f'{die_name}_{p}' for p in pins)} {design}\n")
+
+        f.write("* TSV / Hybrid Bond Resistors\n")
+        for tsv in self.stack.tsv_pairs:
+            d1, d2, r = tsv['die1'], tsv['die2'], tsv['r_ohm']
+            for name in tsv['names']:
+                f.write(f"R{name} {d1}_{name} {d2}_{name} {r:.4E}\n")
 '''
 
 files["io_utils/dspf_writer.py"] = r''' 
 import os
 import sys
+import shutil
+import numpy as np
+from core.net_cache import stable_hash
+from core.node_table import pack_xy, unpack_xy
+from core.tiled_extractor import TiledNet
+from core.corners import CornerValues, corner_filename
+
+# [Streaming] R / C / node lines are formatted from NumPy arrays in slices of
+# this many elements, so a net never needs Python int lists of its full size
+WRITE_CHUNK = 1 << 16
 
 class DSPFWriter: 
     def __init__(self, extractor): 
@@ -895,93 +4846,462 @@ class DSPFWriter:
         self.design_name = "TOP" 
         self.ground_net = "VSS" 
 
-    def write(self, filename="out.dspf", output_dir=".", design_name="TOP"): 
+    def write(self, filename="out.dspf", output_dir=".", design_name="TOP", stream=False, corners=None): 
+        # stream=True: extract while writing (RCExtractor.iter_nets); each net's
+        # RC is released once its block is written
+        # corners: [Corner] -> "<name>_<corner>.dspf" per corner in the same pass
         self.design_name = design_name
         full_path = os.path.join(output_dir, filename) 
         print(f"[DSPF] Writing {full_path} (Turbo)...") 
+        if corners and stream: 
+            print("[WARN] Corner DSPFs need the whole RC network; not written with --stream") 
+            corners = None
+        if corners and getattr(self.ext, 'reducer', None) is not None: 
+            print("[WARN] Corners scale reduced resistors by the layers of their end nodes") 
         
+        extra = []
         try:
             with open(full_path, 'w', buffering=1024*1024) as f: 
-                self._write_header(f, list(self.ext.net_data.keys())) 
+                for corner in corners or []: 
+                    path = os.path.join(output_dir, corner_filename(filename, corner))
+                    print(f"[DSPF] Writing {path} (corner {corner.name})...") 
+                    extra.append((open(path, 'w', buffering=1024*1024), CornerValues(corner, self.ext)))
+                files = [f] + [cf for cf, _ in extra]
+                if stream: 
+                    if self.ext.has_coupling(): 
+                        print("[WARN] Coupling capacitance needs the whole design; not extracted with --stream") 
+                    self._write_header(f, self.ext.gen.nets_used) 
+                    items = self.ext.iter_nets() 
+                else: 
+                    for fo in files: 
+                        self._write_header(fo, list(self.ext.net_data.keys())) 
+                    items = ((net, self.ext.net_data[net]) for net in sorted(self.ext.net_data.keys())) 
                 
-                sorted_nets = sorted(self.ext.net_data.keys())
-                for net in sorted_nets: 
-                    self._write_net(f, net, self.ext.net_data[net]) 
+                cache = getattr(self.ext, 'cache', None)
+                self._pin_label = None
+                for net, data in items: 
+                    self._resolve_pin_labels(net) 
+                    if isinstance(data, TiledNet): 
+                        self._write_tiled_net(f, net, data) 
+                        continue
+                    # [Coupling] blocks with coupling depend on other nets: not cached
+                    key = self._block_key(net) if cache is not None and net not in self.ext.coupling_total else None
+                    if key is None or extra: 
+                        self._write_net(f, net, data, extra) 
+                        continue
+                    # [Incremental] unchanged nets are spliced from the cache
+                    if not cache.copy_block(key, f): 
+                        with cache.block_writer(key) as bf: 
+                            self._write_net(bf, net, data) 
+                        cache.copy_block(key, f, count=False) 
+                if cache is not None: cache.report()
                 
-                self._write_instances(f) 
-                f.write(".ENDS\n") 
+                for fo in files: 
+                    self._write_instances(fo) 
+                    fo.write(".ENDS\n") 
         except Exception as e:
             print(f"[ERROR] DSPF Write failed: {e}")
+        finally: 
+            for cf, _ in extra: cf.close()
             
         print("[DSPF] Done.") 
 
-    def _write_header(self, f, nets): 
-        f.write(f".SUBCKT {self.design_name} {' '.join(sorted(nets))}\n* DSPF Gen V3 Turbo\n*|GROUND_NET {self.ground_net}\n*\n") 
+    @staticmethod
+    def copy_as(src_path, filename, design_name="TOP", output_dir="."): 
+        # [Dedup] Identical die: copy an already written DSPF, renaming the subckt
+        full_path = os.path.join(output_dir, filename) 
+        with open(src_path, 'r') as src, open(full_path, 'w', buffering=1024*1024) as f: 
+            header = src.readline().split(' ', 2)
+            header[1] = design_name
+            f.write(' '.join(header)) 
+            shutil.copyfileobj(src, f, 1024 * 1024) 
+        print(f"[DSPF] Written {full_path} (copy of {os.path.basename(src_path)})") 
+
+    def _block_key(self, net): 
+        key = self.ext.rc_keys.get(net)
+        if not key: return None
+        reducer = getattr(self.ext, 'reducer', None)
+        if reducer is not None: return stable_hash('block', key, self.ground_net, reducer.key())
+        return stable_hash('block', key, self.ground_net)
 
-    def _write_net(self, f, net, data): 
-        tot_cap = sum(val for _, val in data['capacitors']) / 1000.0
-        f.write(f"*|NET {net} {tot_cap:.4E}PF\n") 
-        
-        name_cache = {}
+    def _write_header(self, f, nets): 
+        # [3D] TSV landing ports are exposed so the stack netlist can bond dies
+        pins = sorted(nets) + [p[0] for p in getattr(self.ext.gen, 'tsv_ports', [])]
+        f.write(f".SUBCKT {self.design_name} {' '.join(pins)}\n* DSPF Gen V3 Turbo\n*|GROUND_NET {self.ground_net}\n*\n") 
+
+    def _node_names(self, net, data): 
+        # Default "n_<net>_<layer>_<x>_<y>" per node id
+        names = []
+        for layer, _, xs, ys in data.iter_layer_blocks(): 
+            prefix = f"n_{net}_{layer}_"
+            names.extend([f"{prefix}{x}_{y}" for x, y in zip(xs.tolist(), ys.tolist())])
+        return names
+
+    def _write_net(self, f, net, data, corners=()): 
+        # corners: [(file, CornerValues)] receive the same block with their own
+        # R / C values; names and element prefixes are formatted once for all
+        outs = [(f, data.res_val, data.cap_val, self.ext.coupling.get(net, []), 
+                 data.total_cap() + self.ext.coupling_total.get(net, 0.0))]
+        for cf, cv in corners: 
+            res, cap = cv.net_values(net, data)
+            outs.append((cf, res, cap, cv.coupling.get(net, []), float(cap.sum()) + cv.coupling_total.get(net, 0.0)))
+        files = [o[0] for o in outs]
+        for fo, _, _, _, tot_cap in outs: 
+            fo.write(f"*|NET {net} {tot_cap / 1000.0:.4E}PF\n") 
         
-        def get_name(nid):
-            if nid in name_cache: return name_cache[nid]
-            if nid in data['renamed']:
-                s = data['renamed'][nid]
-            else:
-                l, x, y = data['id_coords'][nid]
-                s = f"n_{net}_{l}_{x}_{y}"
-            name_cache[nid] = s
-            return s
-
-        ports_in_net = [p for p in self.ext.ports if p[1] == net]
-        for pname, _, nid, x, y in ports_in_net:
-            name_cache[nid] = pname 
-            f.write(f"*|P ({pname} B 0.0 {x/1000:.3f} {y/1000:.3f})\n") 
-
-        insts_in_net = [ic for ic in self.ext.inst_conns if ic[2] == net]
-        for inst, pin, _, nid, x, y in insts_in_net:
-            node_name = f"{inst}:{pin}"
-            name_cache[nid] = node_name
-            f.write(f"*|I ({node_name} {inst} {pin} I 0.0 {x/1000:.3f} {y/1000:.3f})\n") 
-
+        names = self._node_names(net, data)
         special_ids = set()
-        for _, _, nid, _, _ in ports_in_net: special_ids.add(nid)
-        for _, _, _, nid, _, _ in insts_in_net: special_ids.add(nid)
+        lines = []
+
+        ports = self.ext.port_pins
+        lo, hi = ports.net_slice(net)
+        for i, nid, x, y in zip(range(lo, hi), ports.node[lo:hi].tolist(), ports.xs[lo:hi].tolist(), ports.ys[lo:hi].tolist()):
+            if nid < 0: continue
+            pname = ports.name(i)
+            names[nid] = pname 
+            special_ids.add(nid)
+            lines.append(f"*|P ({pname} B 0.0 {x/1000:.3f} {y/1000:.3f})\n") 
+
+        pins = self.ext.inst_pins
+        lo, hi = pins.net_slice(net)
+        for i, nid, x, y in zip(range(lo, hi), pins.node[lo:hi].tolist(), pins.xs[lo:hi].tolist(), pins.ys[lo:hi].tolist()):
+            if nid < 0: continue
+            inst, pin = pins.name(i), pins.pin_name(i)
+            node_name = f"{inst}:{pin}"
+            names[nid] = node_name
+            special_ids.add(nid)
+            lines.append(f"*|I ({node_name} {inst} {pin} I 0.0 {x/1000:.3f} {y/1000:.3f})\n") 
+        _emit(files, lines)
         
-        sorted_ids = sorted(data['id_coords'].keys())
-        for nid in sorted_ids:
-            if nid not in special_ids:
-                l, x, y = data['id_coords'][nid]
-                name = get_name(nid)
-                f.write(f"*|S ({name} {x/1000:.3f} {y/1000:.3f})\n") 
+        for layer, first, xs, ys in data.iter_layer_blocks(): 
+            for a, b in _chunks(len(xs)): 
+                _emit(files, [f"*|S ({names[nid]} {x/1000:.3f} {y/1000:.3f})\n" 
+                              for nid, x, y in zip(range(first + a, first + b), xs[a:b].tolist(), ys[a:b].tolist()) 
+                              if nid not in special_ids])
         
-        for i, (n1, n2, val) in enumerate(data['resistors']):
-            name = f"R{net}_{i}"
-            f.write(f"{name} {get_name(n1)} {get_name(n2)} {val:.4E}\n") 
-
-        for i, (n, val) in enumerate(data['capacitors']):
-            name = f"C{net}_{i}"
-            f.write(f"{name} {get_name(n)} {self.ground_net} {val/1000:.4E}PF\n") 
+        for a, b in _chunks(data.n_res): 
+            prefix = [f"R{net}_{i} {names[n1]} {names[n2]} " 
+                      for i, n1, n2 in zip(range(a, b), data.res_n1[a:b].tolist(), data.res_n2[a:b].tolist())]
+            for fo, res, _, _, _ in outs: 
+                fo.write("".join([f"{p}{val:.4E}\n" for p, val in zip(prefix, res[a:b].tolist())])) 
+
+        gnd = self.ground_net
+        for a, b in _chunks(data.n_cap): 
+            prefix = [f"C{net}_{i} {names[n]} {gnd} " for i, n in zip(range(a, b), data.cap_node[a:b].tolist())]
+            for fo, _, cap, _, _ in outs: 
+                fo.write("".join([f"{p}{val/1000:.4E}PF\n" for p, val in zip(prefix, cap[a:b].tolist())])) 
+
+        # [Coupling] Cross-net C to nodes of the other net (same pairs at every corner)
+        i = data.n_cap
+        for k, (other, nodes, other_nodes, _) in enumerate(outs[0][3]): 
+            other_names = self._foreign_names(other, other_nodes)
+            for a, b in _chunks(len(nodes)): 
+                prefix = [f"C{net}_{j} {names[n]} {other_names[m]} " 
+                          for j, n, m in zip(range(i + a, i + b), nodes[a:b].tolist(), range(a, b))]
+                for fo, _, _, coupling, _ in outs: 
+                    fo.write("".join([f"{p}{val/1000:.4E}PF\n" for p, val in zip(prefix, coupling[k][3][a:b].tolist())])) 
+            i += len(nodes)
         
+        _emit(files, ["\n"])
+
+    def _write_tiled_net(self, f, net, data): 
+        # [Tiled] Same sections as _write_net, read back one spilled tile at a
+        # time; nodes are named by (layer, x, y), so tiles need no shared ids
+        f.write(f"*|NET {net} {data.total_cap() / 1000.0:.4E}PF\n") 
+        layers = data.layer_names
+        ports, pins = self.ext.port_pins, self.ext.inst_pins
+        for i in self._registered(ports, net).tolist(): 
+            f.write(f"*|P ({ports.name(i)} B 0.0 {ports.xs[i]/1000:.3f} {ports.ys[i]/1000:.3f})\n") 
+        for i in self._registered(pins, net).tolist(): 
+            inst, pin = pins.name(i), pins.pin_name(i)
+            f.write(f"*|I ({inst}:{pin} {inst} {pin} I 0.0 {pins.xs[i]/1000:.3f} {pins.ys[i]/1000:.3f})\n") 
+
+        # Pin / port label per node as codes (port row: -2 - row, else the
+        # instance pin row); the last one written wins, as in _write_net
+        lab_lay, lab_key, lab_code = [], [], []
+        for table in (ports, pins): 
+            rows = self._registered(table, net)
+            lut = np.array([layers.index(l) if l in layers else -1 for l in table.layer_names], dtype=np.int64)
+            lab_lay.append(lut[table.layer[rows]] if len(lut) else np.empty(0, dtype=np.int64))
+            lab_key.append(pack_xy(table.xs[rows], table.ys[rows]))
+            lab_code.append(rows if table is pins else -2 - rows)
+        lab_lay, lab_key, lab_code = np.concatenate(lab_lay), np.concatenate(lab_key), np.concatenate(lab_code)
+        u_lay, u_key, _, first = _unique_nodes(lab_lay[::-1], lab_key[::-1])
+        u_code = lab_code[::-1][first]
+
+        def label(code): 
+            return ports.name(-2 - code) if code < -1 else f"{pins.name(code)}:{pins.pin_name(code)}"
+
+        def node_names(lay, keys): 
+            # -> (name per distinct node, index of each input node, labeled mask per distinct node)
+            n_lay, n_key, inv, _ = _unique_nodes(lay.astype(np.int64), keys)
+            xs, ys = unpack_xy(n_key)
+            names = [f"n_{net}_{layers[l]}_{x}_{y}" for l, x, y in zip(n_lay.tolist(), xs.tolist(), ys.tolist())]
+            hit = np.zeros(len(n_key), dtype=bool)
+            if len(u_key): 
+                pos = _find_nodes(u_lay, u_key, n_lay, n_key)
+                hit = pos >= 0
+                for k, code in zip(np.nonzero(hit)[0].tolist(), u_code[pos[hit]].tolist()): 
+                    names[k] = label(code)
+            return names, inv, hit
+
+        for t in data.tiles(('n_l', 'n_k')): 
+            for a, b in _chunks(len(t['n_k'])): 
+                names, _, hit = node_names(t['n_l'][a:b], t['n_k'][a:b])
+                xs, ys = unpack_xy(t['n_k'][a:b])
+                for name, special, x, y in zip(names, hit.tolist(), xs.tolist(), ys.tolist()): 
+                    if not special: 
+                        f.write(f"*|S ({name} {x/1000:.3f} {y/1000:.3f})\n") 
+        i = 0
+        for t in data.tiles(('r_l1', 'r_k1', 'r_l2', 'r_k2', 'r_v')): 
+            for a, b in _chunks(len(t['r_v'])): 
+                names, inv, _ = node_names(np.concatenate([t['r_l1'][a:b], t['r_l2'][a:b]]), 
+                                           np.concatenate([t['r_k1'][a:b], t['r_k2'][a:b]]))
+                inv = inv.tolist()
+                m = b - a
+                for k, val in enumerate(t['r_v'][a:b].tolist()): 
+                    f.write(f"R{net}_{i} {names[inv[k]]} {names[inv[m + k]]} {val:.4E}\n") 
+                    i += 1
+        gnd = self.ground_net
+        i = 0
+        for t in data.tiles(('c_l', 'c_k', 'c_v')): 
+            for a, b in _chunks(len(t['c_v'])): 
+                names, inv, _ = node_names(t['c_l'][a:b], t['c_k'][a:b])
+                for k, val in zip(inv.tolist(), t['c_v'][a:b].tolist()): 
+                    f.write(f"C{net}_{i} {names[k]} {gnd} {val/1000:.4E}PF\n") 
+                    i += 1
         f.write("\n") 
 
+    def _foreign_names(self, net, nids): 
+        # Names of nodes `nids` of another net, as its own block writes them
+        # (instance pin label over port name over "n_<net>_<layer>_<x>_<y>")
+        data = self.ext.net_data[net]
+        lay = data.node_layers(nids)
+        xs, ys = unpack_xy(data.keys[nids])
+        names = [f"n_{net}_{data.layers[l]}_{x}_{y}" for l, x, y in zip(lay.tolist(), xs.tolist(), ys.tolist())]
+        ports, pins = self.ext.port_pins, self.ext.inst_pins
+        for table in (ports, pins): 
+            rows = self._registered(table, net)
+            last = _last_on_node(table.node[rows].astype(np.int64), rows, nids)
+            for k in np.nonzero(last >= 0)[0].tolist(): 
+                r = int(last[k])
+                names[k] = ports.name(r) if table is ports else f"{pins.name(r)}:{pins.pin_name(r)}"
+        return names
+
+    @staticmethod
+    def _registered(table, net): 
+        lo, hi = table.net_slice(net)
+        return lo + np.nonzero(table.node[lo:hi] >= 0)[0]
+
+    def _resolve_pin_labels(self, net): 
+        # Node label source per registered pin of `net`: a port on the node
+        # wins (-2 - port row), else the last instance pin on it (its row)
+        pins, ports = self.ext.inst_pins, self.ext.port_pins
+        if self._pin_label is None: 
+            self._pin_label = np.full(len(pins), -1, dtype=np.int64)
+        lo, hi = pins.net_slice(net)
+        rows = lo + np.nonzero(pins.node[lo:hi] >= 0)[0]
+        if len(rows) == 0: return
+        nodes = pins.node[rows]
+        p_lo, p_hi = ports.net_slice(net)
+        p_rows = p_lo + np.nonzero(ports.node[p_lo:p_hi] >= 0)[0]
+        port = _last_on_node(ports.node[p_rows], p_rows, nodes)
+        self._pin_label[rows] = np.where(port >= 0, -2 - port, _last_on_node(nodes, rows, nodes))
+
     def _write_instances(self, f): 
         f.write("* Instance Section\n") 
-        inst_map = {}
-        
-        for inst, pin, net, nid, x, y in self.ext.inst_conns:
-            if inst not in inst_map: inst_map[inst] = {}
-            if nid in self.ext.net_data[net]['renamed']:
-                inst_map[inst][pin] = self.ext.net_data[net]['renamed'][nid]
-            else:
-                l, nx, ny = self.ext.net_data[net]['id_coords'][nid]
-                inst_map[inst][pin] = f"n_{net}_{l}_{nx}_{ny}"
+        pins, ports = self.ext.inst_pins, self.ext.port_pins
+        if self._pin_label is None: return
+        rows = np.nonzero(self._pin_label != -1)[0]
+        if len(rows) == 0: return
+
+        # Instances in name order, pins in registration order
+        owners = pins.owner[rows]
+        uniq = np.unique(owners)
+        inst_names = [pins.owner_name(int(o)) for o in uniq]
+        rank = np.empty(len(uniq), dtype=np.int64)
+        rank[sorted(range(len(uniq)), key=inst_names.__getitem__)] = np.arange(len(uniq))
+        owner_rank = rank[np.searchsorted(uniq, owners)]
+        order = np.lexsort((rows, owner_rank))
+        rows, owner_rank = rows[order], owner_rank[order]
+        labels = self._pin_label[rows].tolist()
+        brk = np.concatenate([[0], np.nonzero(owner_rank[1:] != owner_rank[:-1])[0] + 1, [len(rows)]])
+        rows = rows.tolist()
+        for a, b in zip(brk[:-1].tolist(), brk[1:].tolist()): 
+            inst = pins.name(rows[a])
+            pin_map = {}
+            for r, src in zip(rows[a:b], labels[a:b]): 
+                pin_map[pins.pin_name(r)] = ports.name(-2 - src) if src < -1 else f"{pins.name(src)}:{pins.pin_name(src)}"
+            pin_str = " ".join([f"{p}={n}" for p, n in pin_map.items()])
+            f.write(f"X{inst} {pin_str} STD_CELL\n")
+
+
+def _emit(files, lines): 
+    text = "".join(lines)
+    for fo in files: fo.write(text)
+
+
+def _chunks(n): 
+    for a in range(0, n, WRITE_CHUNK): 
+        yield a, min(a + WRITE_CHUNK, n)
+
+
+def _unique_nodes(lay, keys): 
+    # (layer id, packed key) pairs -> (distinct layers, keys sorted, inverse, first index)
+    order = np.lexsort((keys, lay))
+    l, k = lay[order], keys[order]
+    new = np.ones(len(k), dtype=bool)
+    new[1:] = (l[1:] != l[:-1]) | (k[1:] != k[:-1])
+    inv = np.empty(len(k), dtype=np.int64)
+    inv[order] = np.cumsum(new) - 1
+    return l[new], k[new], inv, order[new]
+
+
+def _find_nodes(u_lay, u_key, lay, keys): 
+    # -> index of each (lay, key) among the sorted distinct pairs (-1: absent)
+    out = np.full(len(keys), -1, dtype=np.int64)
+    for l in np.unique(lay).tolist(): 
+        a, b = np.searchsorted(u_lay, [l, l + 1])
+        if a == b: continue
+        m = np.nonzero(lay == l)[0]
+        pos = np.minimum(np.searchsorted(u_key[a:b], keys[m]), b - a - 1)
+        hit = u_key[a:b][pos] == keys[m]
+        out[m[hit]] = a + pos[hit]
+    return out
+
+
+def _last_on_node(nodes, rows, query): 
+    # -> per query node, the last of `rows` whose node equals it (-1: none)
+    out = np.full(len(query), -1, dtype=np.int64)
+    if len(nodes) == 0: return out
+    uniq, first_rev = np.unique(nodes[::-1], return_index=True)
+    last = rows[::-1][first_rev]
+    pos = np.minimum(np.searchsorted(uniq, query), len(uniq) - 1)
+    hit = uniq[pos] == query
+    out[hit] = last[pos[hit]]
+    return out
+'''
+
+files["io_utils/ir_report_writer.py"] = r'''
+import os
+import numpy as np
+
+class IRReportWriter:
+    def __init__(self, analyzer):
+        self.ir = analyzer
 
-        for inst in sorted(inst_map.keys()): 
-            pins = inst_map[inst] 
-            pin_str = " ".join([f"{p}={n}" for p, n in pins.items()])
-            f.write(f"X{inst} {pin_str} STD_CELL\n") 
+    def write(self, filename="ir_drop.rpt", output_dir="."):
+        full_path = os.path.join(output_dir, filename)
+        try:
+            with open(full_path, 'w') as f:
+                f.write("* Static IR Drop Report\n")
+                f.write(f"* Pin current {self.ir.pin_current * 1000:g} mA (per-net totals: "
+                        f"{', '.join(f'{n}={v * 1000:g}mA' for n, v in sorted(self.ir.net_current.items())) or 'none'})\n\n")
+                for net in sorted(self.ir.results):
+                    self._write_net(f, net)
+        except Exception as e:
+            print(f"[ERROR] IR report write failed: {e}")
+            return
+        print(f"[INFO] IR Report Written: {filename}")
+
+    def _write_net(self, f, net):
+        res = self.ir.results[net]
+        pd = res['pin_drop']
+        f.write(f"*|NET {net}\n")
+        if not (~np.isnan(pd)).any():
+            f.write("  no pins connected to a port\n\n")
+            return
+        f.write(f"  Current {res['current'] * 1000:.4f} mA, worst {np.nanmax(pd) * 1000:.4f} mV, "
+                f"mean {np.nanmean(pd) * 1000:.4f} mV, floating pins {res['floating_pins']}, "
+                f"CG iterations {res['iterations']}\n")
+
+        f.write(f"\n  Worst {self.ir.report_top} instance pins\n")
+        f.write(f"  {'#':>4} {'Instance':<20} {'Pin':<12} {'Drop(mV)':>10} {'X(um)':>10} {'Y(um)':>10}\n")
+        for rank, (inst, pin, drop, x, y) in enumerate(self.ir.worst_pins(net), 1):
+            f.write(f"  {rank:>4} {inst:<20} {pin:<12} {drop * 1000:>10.4f} {x / 1000:>10.3f} {y / 1000:>10.3f}\n")
+
+        f.write("\n  Per-layer drop map (max mV per bin, rows from top; '.' = no node)\n")
+        for layer, (grid, (x0, y0, x1, y1)) in self.ir.layer_map(net).items():
+            f.write(f"  Layer {layer}: max {np.nanmax(grid) * 1000:.4f} mV, "
+                    f"bbox ({x0 / 1000:.3f}, {y0 / 1000:.3f}) - ({x1 / 1000:.3f}, {y1 / 1000:.3f}) um\n")
+            for row in grid[::-1]:
+                f.write("    " + " ".join(f"{v * 1000:8.4f}" if not np.isnan(v) else f"{'.':>8}" for v in row) + "\n")
+        f.write("\n")
+
+
+class TransientIRReportWriter:
+    def __init__(self, analyzer):
+        self.ir = analyzer
+
+    def write(self, filename="ir_dynamic.rpt", output_dir="."):
+        full_path = os.path.join(output_dir, filename)
+        try:
+            with open(full_path, 'w') as f:
+                f.write("* Dynamic IR Drop Report\n")
+                f.write(f"* Method {self.ir.method}, dt {self.ir.dt:g} ps, stop {self.ir.times[-1] if len(self.ir.times) else 0:g} ps, "
+                        f"pin decap {self.ir.pin_decap:g} fF\n")
+                for w in self.ir.waveforms:
+                    pts = " ".join(f"({t:g},{i * 1000:g})" for t, i in zip(w.t.tolist(), w.i.tolist()))
+                    f.write(f"* Waveform {w.name}: PWL ps,mA {pts}{f' period {w.period:g} ps' if w.period else ''}\n")
+                f.write("\n")
+                for net in sorted(self.ir.results):
+                    self._write_net(f, net)
+        except Exception as e:
+            print(f"[ERROR] IR report write failed: {e}")
+            return
+        print(f"[INFO] IR Report Written: {filename}")
+
+    def _write_net(self, f, net):
+        res = self.ir.results[net]
+        top = self.ir.worst_instances(net)
+        f.write(f"*|NET {net}\n")
+        if not top:
+            f.write("  no pins connected to a port\n\n")
+            return
+        f.write(f"  Peak {top[0][2] * 1000:.4f} mV, floating pins {res['floating_pins']}, solver {res['solver']} "
+                f"(setup {res['setup_seconds']:.2f}s, CG iterations {res['iterations']}), {res['seconds']:.2f}s\n")
+
+        f.write(f"\n  Worst {self.ir.report_top} instances (peak dynamic drop)\n")
+        f.write(f"  {'#':>4} {'Instance':<20} {'Pin':<12} {'Peak(mV)':>10} {'Time(ps)':>10} {'X(um)':>10} {'Y(um)':>10}\n")
+        for rank, (inst, pin, drop, t, x, y) in enumerate(top, 1):
+            f.write(f"  {rank:>4} {inst:<20} {pin:<12} {drop * 1000:>10.4f} {t:>10g} {x / 1000:>10.3f} {y / 1000:>10.3f}\n")
+
+        f.write("\n  Worst pin drop over time (ps: mV)\n")
+        pairs = [f"{t:g}: {v * 1000:.4f}" for t, v in zip(self.ir.times.tolist(), res['trace'].tolist())]
+        for k in range(0, len(pairs), 8):
+            f.write("    " + ", ".join(pairs[k:k + 8]) + "\n")
+        f.write("\n")
+'''
+
+files["io_utils/eff_res_writer.py"] = r'''import os
+import numpy as np
+from core.eff_res import pin_port_resistance
+
+class EffResWriter:
+    def __init__(self, extractor):
+        self.ext = extractor
+
+    def write(self, filename="eff_res.csv", output_dir="."):
+        # One line per connected instance pin: resistance to the nearest top port of its net
+        full_path = os.path.join(output_dir, filename)
+        pins, ports = self.ext.inst_pins, self.ext.port_pins
+        try:
+            with open(full_path, 'w') as f:
+                f.write("instance,pin,net,x_um,y_um,port,r_ohm\n")
+                for net in sorted(self.ext.net_data):
+                    rows, port_of, r = pin_port_resistance(self.ext, net)
+                    for i, p, v in zip(rows.tolist(), port_of.tolist(), r.tolist()):
+                        port = ports.name(p) if p >= 0 else ""
+                        f.write(f"{pins.name(i)},{pins.pin_name(i)},{net},{pins.xs[i] / 1000:.3f},"
+                                f"{pins.ys[i] / 1000:.3f},{port},{v:.6E}\n")
+                    if len(rows):
+                        fin = r[np.isfinite(r)]
+                        worst = f", max {fin.max():.4f} ohm" if len(fin) else ""
+                        print(f"[RES] {net}: {len(rows)} pins, {len(rows) - len(fin)} without a port{worst}")
+        except Exception as e:
+            print(f"[ERROR] Effective resistance write failed: {e}")
+            return
+        print(f"[INFO] Effective Resistance CSV Written: {filename}")
 '''
 
 # ==========================================
@@ -1035,13 +5355,13 @@ class Viewer2D(tk.Frame):
             )
             
         # Draw Vias
-        for v in gen.vias:
-            x, y = v['pos']
-            self.canvas.create_oval(
-                offset_x + (x-200)/1000*scale, offset_y + (y-200)/1000*scale,
-                offset_x + (x+200)/1000*scale, offset_y + (y+200)/1000*scale,
-                fill="white"
-            )
+        for va in gen.via_arrays:
+            for x, y in va.iter_positions():
+                self.canvas.create_oval(
+                    offset_x + (x-200)/1000*scale, offset_y + (y-200)/1000*scale,
+                    offset_x + (x+200)/1000*scale, offset_y + (y+200)/1000*scale,
+                    fill="white"
+                )
 
     def _get_color(self, layer):
         colors = {
@@ -1098,6 +5418,7 @@ class Viewer3D(tk.Frame):
 files["main.py"] = r''' 
 import sys
 import os
+import shutil
 import argparse
 import tkinter as tk
 from tkinter import ttk
@@ -1106,21 +5427,140 @@ import time
 from core.tech_lef import TechLEF
 from core.stack_manager import StackManager
 from core.extractor import RCExtractor
+from core.tiled_extractor import TiledRCExtractor
+from core.periodic import PeriodicRCExtractor
+from core.corners import load_corners, corner_filename
+from core.checkpoint import RCJournal, input_key
 from core.dspf_checker import DSPFChecker 
+from core.net_cache import NetCache
+from core.rc_reduce import RCReducer
 
 from io_utils.config_loader import load_config
 from io_utils.def_writer import DEFWriter
 from io_utils.spice_writer import SpiceWriter
 from io_utils.dspf_writer import DSPFWriter
+from io_utils.ir_report_writer import IRReportWriter, TransientIRReportWriter
 
 from gui.viewer_2d import Viewer2D 
 from gui.viewer_3d import Viewer3D
 
+def make_reducer(args): 
+    # [Reduction] None unless --reduce / --ticer-tau is given
+    if not (args.reduce or args.ticer_tau is not None): return None
+    return RCReducer(tau_ps=args.ticer_tau)
+
+def make_extractor(gen, cfg, args): 
+    # [Tiled] --tile-size switches to out-of-core tiled extraction
+    if args.tile_size: 
+        return TiledRCExtractor(gen, cfg, args.tile_size, halo_um=args.tile_halo, spill_dir=args.spill_dir, 
+                                jobs=args.jobs, reducer=make_reducer(args)) 
+    # [Periodic] --periodic fractures one track per unit cell and replicates it
+    if args.periodic: 
+        return PeriodicRCExtractor(gen, cfg, jobs=args.jobs, reducer=make_reducer(args)) 
+    return RCExtractor(gen, cfg, jobs=args.jobs, reducer=make_reducer(args)) 
+
+def make_corners(extractor, args): 
+    # [Corners] one extra DSPF per named corner, written in the nominal DSPF pass
+    corners = load_corners(extractor.tech_props) 
+    if corners and args.stream: 
+        print("[WARN] Corner DSPFs need the whole RC network; not written with --stream") 
+        return []
+    return corners
+
+def attach_journal(extractor, args, output_dir, die_name): 
+    # [Checkpoint] --checkpoint journals finished nets; --resume skips the ones already on disk
+    if not (args.checkpoint or args.resume): return
+    if args.stream and isinstance(extractor, TiledRCExtractor): 
+        print("[WARN] Checkpointing needs stitched nets; not used with --tile-size --stream") 
+        return
+    root = os.path.join(args.checkpoint_dir or os.path.join(output_dir, "rc_journal"), die_name) 
+    extractor.journal = RCJournal(root, input_key(extractor), resume=args.resume) 
+
+def run_ir_drop(extractor, cfg, design_name, output_dir): 
+    # [IR] Static IR drop on the extracted network + text report
+    from core.ir_drop import IRDropAnalyzer   # scipy only with --ir-drop
+    t_ir = time.time()
+    ir = IRDropAnalyzer(extractor, cfg) 
+    ir.run() 
+    IRReportWriter(ir).write(f"ir_drop_{design_name}.rpt", output_dir=output_dir) 
+    print(f"[ITIME] IR Drop Analysis: {time.time()-t_ir:.4f}s")
+    return os.path.join(output_dir, f"ir_drop_{design_name}.rpt")
+
+def run_ir_transient(extractor, cfg, design_name, output_dir): 
+    # [IR] Dynamic IR drop under the config waveforms + text report
+    from core.ir_transient import TransientIRAnalyzer   # scipy only with --ir-transient
+    t_ir = time.time()
+    ir = TransientIRAnalyzer(extractor, cfg) 
+    ir.run() 
+    TransientIRReportWriter(ir).write(f"ir_dynamic_{design_name}.rpt", output_dir=output_dir) 
+    print(f"[ITIME] Dynamic IR Analysis: {time.time()-t_ir:.4f}s")
+    return os.path.join(output_dir, f"ir_dynamic_{design_name}.rpt")
+
+def run_eff_res(extractor, design_name, output_dir): 
+    # [EffRes] Per-instance-pin resistance to the nearest top port -> CSV
+    from io_utils.eff_res_writer import EffResWriter   # scipy only with --eff-res
+    t_er = time.time()
+    EffResWriter(extractor).write(f"eff_res_{design_name}.csv", output_dir=output_dir) 
+    print(f"[ITIME] Effective Resistance: {time.time()-t_er:.4f}s")
+    return os.path.join(output_dir, f"eff_res_{design_name}.csv")
+
+def copy_reports(reports, src_name, design_name, output_dir): 
+    # [Dedup] Identical die: its analysis reports are the first die's, under its own name
+    for src in reports: 
+        if not os.path.exists(src): continue   # the writer already reported the failure
+        stem, ext = os.path.splitext(os.path.basename(src))
+        fname = f"{stem[:len(stem) - len(src_name)]}{design_name}{ext}"
+        shutil.copyfile(src, os.path.join(output_dir, fname)) 
+        print(f"[INFO] Report Written: {fname} (copy of {os.path.basename(src)})")
+
 def main(): 
     parser = argparse.ArgumentParser(description="PG Generator V3 Phase 5 - Turbo") 
     parser.add_argument("config_file", help="Path to the JSON configuration file") 
     parser.add_argument("-reportdir", default="output_phase5", help="Directory to save output files") 
+    parser.add_argument("--backend", choices=["dict", "columnar"], default="dict", 
+                        help="Geometry storage: per-shape dicts or columnar NumPy arrays") 
+    parser.add_argument("--cache-dir", default=None, 
+                        help="Per-net artifact cache; only nets whose inputs changed are recomputed") 
+    parser.add_argument("--save-artifact", default=None, 
+                        help="Write the generator result as a memory-mappable artifact directory") 
+    parser.add_argument("--from-artifact", default=None, 
+                        help="Load a saved generator artifact instead of regenerating") 
+    parser.add_argument("--jobs", type=int, default=1, 
+                        help="Worker processes for stripe / via generation and RC extraction (per die for 3D stacks)") 
+    parser.add_argument("--die-mem-cap", type=float, default=None, 
+                        help="Estimated memory budget (MB) for 3D dies generated concurrently") 
+    parser.add_argument("--stream", action="store_true", 
+                        help="Extract and write the DSPF net by net instead of holding the whole RC network") 
+    parser.add_argument("--reduce", action="store_true", 
+                        help="Merge series resistors through degree-2 nodes before writing the DSPF") 
+    parser.add_argument("--ticer-tau", type=float, default=None, 
+                        help="Also eliminate nodes with C/G below this time constant in ps (TICER; implies --reduce)") 
+    parser.add_argument("--ir-drop", action="store_true", 
+                        help="Run static IR drop analysis on the extracted network (config section 'ir_drop')") 
+    parser.add_argument("--ir-transient", action="store_true", 
+                        help="Run transient (dynamic) IR drop analysis (config section 'ir_transient')") 
+    parser.add_argument("--eff-res", action="store_true", 
+                        help="Write the effective resistance of every instance pin to its nearest top port (CSV)") 
+    parser.add_argument("--tile-size", type=float, default=None, 
+                        help="Extract in tiles of this size (um), spilling each tile's RC to disk") 
+    parser.add_argument("--tile-halo", type=float, default=50.0, 
+                        help="Geometry margin (um) read around each tile; grown automatically when too short") 
+    parser.add_argument("--spill-dir", default=None, 
+                        help="Directory for tiled extraction spill files (default: system temp)") 
+    parser.add_argument("--periodic", action="store_true", 
+                        help="Extract regular grids once per repeating track pattern and replicate (same result)") 
+    parser.add_argument("--checkpoint", action="store_true", 
+                        help="Journal every extracted net to disk so an interrupted run can be resumed") 
+    parser.add_argument("--checkpoint-dir", default=None, 
+                        help="Directory for the extraction journal (default: <reportdir>/rc_journal)") 
+    parser.add_argument("--resume", action="store_true", 
+                        help="Reuse nets journaled by an earlier run with the same inputs (implies --checkpoint)") 
     args = parser.parse_args() 
+    if args.periodic and args.tile_size: 
+        print("[WARN] --periodic does not apply to tiled extraction; ignored") 
+    if (args.ir_drop or args.ir_transient or args.eff_res) and args.stream: 
+        print("[WARN] IR analysis needs the whole RC network; --stream ignored") 
+        args.stream = False
 
     t_start = time.time()
     config_path = args.config_file
@@ -1149,8 +5589,13 @@ def main():
 
     # 3. Run Generator
     t1 = time.time()
-    stack = StackManager(tech) 
-    stack.load_and_run(cfg) 
+    cache = NetCache(args.cache_dir) if args.cache_dir else None
+    stack = StackManager(tech, backend=args.backend, cache=cache, artifact_dir=args.save_artifact, 
+                         jobs=args.jobs, die_mem_cap_mb=args.die_mem_cap) 
+    if args.from_artifact: 
+        stack.load_artifacts(args.from_artifact, cfg) 
+    else: 
+        stack.load_and_run(cfg) 
     print(f"[ITIME] Core Generation: {time.time()-t1:.4f}s")
 
     # 4. Export Logic
@@ -1160,17 +5605,41 @@ def main():
         sw.write("output_stack_rc.sp", output_dir=output_dir) 
         
         dies_dict = stack.full_config.get("dies", {}) 
+        # [Dedup] dies with the same floorplan and TSVs are extracted once; the
+        # copies are written by renaming the first die's files
+        written = {} 
         for die_name, gen in stack.generators.items(): 
             die_cfg = dies_dict.get(die_name, {}) 
             def_name = die_cfg.get("display_name", die_name) 
+            def_fname = f"output_{die_name}.def" 
+            dspf_fname = f"output_{die_name}.dspf" 
             
-            DEFWriter(gen).write(f"output_{die_name}.def", design_name=def_name, output_dir=output_dir) 
+            key = stack.extraction_key(die_name) 
+            if key in written: 
+                src_def, src_dspf, corners, src_die, reports = written[key] 
+                DEFWriter.copy_as(src_def, def_fname, design_name=def_name, output_dir=output_dir) 
+                DSPFWriter.copy_as(src_dspf, dspf_fname, design_name=def_name, output_dir=output_dir) 
+                for corner in corners: 
+                    DSPFWriter.copy_as(corner_filename(src_dspf, corner), corner_filename(dspf_fname, corner), 
+                                       design_name=def_name, output_dir=output_dir) 
+                copy_reports(reports, src_die, die_name, output_dir) 
+                continue
             
-            extractor = RCExtractor(gen, cfg) 
-            extractor.run() 
+            DEFWriter(gen).write(def_fname, design_name=def_name, output_dir=output_dir) 
             
-            dspf_fname = f"output_{die_name}.dspf" 
-            DSPFWriter(extractor).write(dspf_fname, design_name=def_name, output_dir=output_dir) 
+            extractor = make_extractor(gen, cfg, args) 
+            attach_journal(extractor, args, output_dir, die_name) 
+            if not args.stream: extractor.run() 
+            
+            corners = make_corners(extractor, args) 
+            DSPFWriter(extractor).write(dspf_fname, design_name=def_name, output_dir=output_dir, stream=args.stream, 
+                                        corners=corners) 
+            reports = []
+            if args.ir_drop: reports.append(run_ir_drop(extractor, cfg, die_name, output_dir)) 
+            if args.ir_transient: reports.append(run_ir_transient(extractor, cfg, die_name, output_dir)) 
+            if args.eff_res: reports.append(run_eff_res(extractor, die_name, output_dir)) 
+            written[key] = (os.path.join(output_dir, def_fname), os.path.join(output_dir, dspf_fname), corners, 
+                            die_name, reports) 
             
     else: 
         print("[INFO] Running 2D Export Flow...") 
@@ -1185,16 +5654,24 @@ def main():
             # RC Extraction
             t_rc = time.time()
             die_cfg = stack.full_config.get("dies", {}).get(die_name, stack.full_config) 
-            extractor = RCExtractor(gen, die_cfg) 
-            extractor.run() 
-            print(f"[ITIME] RC Extraction: {time.time()-t_rc:.4f}s")
+            extractor = make_extractor(gen, die_cfg, args) 
+            attach_journal(extractor, args, output_dir, die_name) 
+            if not args.stream: 
+                extractor.run() 
+                print(f"[ITIME] RC Extraction: {time.time()-t_rc:.4f}s")
             
-            # DSPF Write
+            # DSPF Write ([Streaming] extraction runs inside the writer)
             t_dw = time.time()
             dspf_fname = f"output_{def_name}.dspf" 
             full_dspf_path = os.path.join(output_dir, dspf_fname)
-            DSPFWriter(extractor).write(dspf_fname, design_name=def_name, output_dir=output_dir) 
-            print(f"[ITIME] DSPF Write: {time.time()-t_dw:.4f}s")
+            corners = make_corners(extractor, args) 
+            DSPFWriter(extractor).write(dspf_fname, design_name=def_name, output_dir=output_dir, stream=args.stream, 
+                                        corners=corners) 
+            print(f"[ITIME] {'RC Extraction + ' if args.stream else ''}DSPF Write{f' ({len(corners)} corners)' if corners else ''}: {time.time()-t_dw:.4f}s")
+            
+            if args.ir_drop: run_ir_drop(extractor, die_cfg, def_name, output_dir) 
+            if args.ir_transient: run_ir_transient(extractor, die_cfg, def_name, output_dir) 
+            if args.eff_res: run_eff_res(extractor, def_name, output_dir) 
             
             # [CHECK] Run Checker (Skip if too huge)
             file_size_mb = os.path.getsize(full_dspf_path) / (1024*1024)
@@ -1432,6 +5909,8 @@ def install():
         print(f"  [OK] {file_path}")
         
     print("\nInstallation Complete!")
+    print("Requires NumPy:  pip install numpy")
+    print("--ir-drop, --ir-transient and --eff-res also need SciPy:  pip install scipy")
     print("To run the 10M node performance test:")
     print("  python main.py performance_test_10m.json")
 